@@ -0,0 +1,245 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Autosave Module
+
+Saves characters in the background while they play, so a crash or a
+dropped connection loses at most a few actions.
+
+After every action game_loop calls action_done(character). If anything
+changed, a checkpoint copy of the character is taken on the player's thread
+(cheap: a dictionary copy) and queued; the original is marked clean. A
+single worker thread writes a queued checkpoint once the character has
+done `every_actions` actions or the oldest unsaved change is `interval`
+seconds old, so the player-facing loop never waits for the disk.
+
+flush(character) writes that character's checkpoint right away and waits
+for it (used when a player leaves); stop() flushes everything and ends the
+worker. One scheduler is shared by every session in the process.
+"""
+
+import atexit
+import threading
+import time
+import character_manager
+
+DEFAULT_INTERVAL = 30.0
+DEFAULT_EVERY_ACTIONS = 10
+DEFAULT_SAVE_DIRECTORY = "data/save_games"
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class PendingSave:
+    """The newest unsaved checkpoint of one character"""
+
+    def __init__(self, live, checkpoint, now):
+        self.live = live
+        self.checkpoint = checkpoint
+        self.since = now
+        self.actions = 0
+        self.forced = False
+
+
+class AutosaveScheduler:
+    """
+    Background worker that saves characters every T seconds or K actions
+
+    stats counts 'checkpoints' taken, 'saves' written and 'failures'.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, every_actions=DEFAULT_EVERY_ACTIONS,
+                 save_directory=DEFAULT_SAVE_DIRECTORY):
+        self.interval = interval
+        self.every_actions = every_actions
+        self.save_directory = save_directory
+        # {character name: PendingSave}
+        self.pending = {}
+        # Names the worker is writing right now
+        self.saving = set()
+        # Names whose last write failed (cleared by flush and by a good save)
+        self.failed = set()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stopping = False
+        self.stats = {'checkpoints': 0, 'saves': 0, 'failures': 0}
+
+    # ------------------------------------------------------------------
+    # Player-thread side
+    # ------------------------------------------------------------------
+
+    def action_done(self, character):
+        """Note one finished action; checkpoint the character if it changed"""
+        if character is None:
+            return
+        name = character['name']
+        checkpoint = character_manager.checkpoint_character(character, self.save_directory)
+        with self.condition:
+            entry = self.pending.get(name)
+            if checkpoint is not None:
+                self.stats['checkpoints'] += 1
+                if entry is None:
+                    entry = self.pending[name] = PendingSave(character, checkpoint, time.monotonic())
+                else:
+                    # Keep every field changed since the last real save
+                    checkpoint.dirty |= entry.checkpoint.dirty
+                    checkpoint.saved_to = entry.checkpoint.saved_to
+                    entry.checkpoint = checkpoint
+            if entry is None:
+                return
+            entry.actions += 1
+            if entry.actions >= self.every_actions:
+                self.condition.notify()
+        self.start()
+
+    def flush(self, character=None):
+        """
+        Save now and wait: one character (checkpointed first), or everything
+
+        Returns: True if every requested save succeeded
+        """
+        if character is not None:
+            checkpoint = character_manager.checkpoint_character(character, self.save_directory)
+            name = character['name']
+            with self.condition:
+                self.failed.discard(name)
+                entry = self.pending.get(name)
+                if checkpoint is not None:
+                    if entry is None:
+                        entry = self.pending[name] = PendingSave(character, checkpoint, time.monotonic())
+                    else:
+                        checkpoint.dirty |= entry.checkpoint.dirty
+                        checkpoint.saved_to = entry.checkpoint.saved_to
+                        entry.checkpoint = checkpoint
+            names = {name}
+        else:
+            with self.condition:
+                names = set(self.pending) | set(self.saving)
+                self.failed -= names
+
+        with self.condition:
+            for name in names:
+                if name in self.pending:
+                    self.pending[name].forced = True
+            if self.thread is None or not self.thread.is_alive():
+                # No worker (or stopped): write on this thread instead
+                due = self.take_due(names)
+            else:
+                due = []
+                self.condition.notify()
+        for name, entry in due:
+            self.write(name, entry)
+
+        with self.condition:
+            while any(name in self.pending or name in self.saving for name in names):
+                self.condition.wait()
+            # Only this call's characters count, not failures of other sessions
+            return not names & self.failed
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the worker thread if it is not running"""
+        with self.condition:
+            if self.stopping or (self.thread is not None and self.thread.is_alive()):
+                return
+            self.thread = threading.Thread(target=self.run, name="autosave", daemon=True)
+            self.thread.start()
+
+    def take_due(self, names=None):
+        """Remove and return the (name, entry) pairs that should be written now"""
+        now = time.monotonic()
+        due = []
+        for name, entry in list(self.pending.items()):
+            if name in self.saving:
+                continue
+            if (entry.forced or (names is not None and name in names)
+                    or entry.actions >= self.every_actions or now - entry.since >= self.interval):
+                del self.pending[name]
+                self.saving.add(name)
+                due.append((name, entry))
+        return due
+
+    def write(self, name, entry):
+        """Save one checkpoint; on failure put its changes back on the live character"""
+        saved = False
+        try:
+            saved = character_manager.save_character(entry.checkpoint, self.save_directory)
+        finally:
+            with self.condition:
+                self.saving.discard(name)
+                if saved:
+                    self.stats['saves'] += 1
+                    self.failed.discard(name)
+                else:
+                    self.stats['failures'] += 1
+                    self.failed.add(name)
+                    character_manager.mark_dirty(entry.live, *entry.checkpoint.dirty)
+                    entry.live.saved_to = entry.checkpoint.saved_to
+                self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                due = self.take_due()
+                while not due and not (self.stopping and not self.pending):
+                    self.condition.wait(self.next_wait())
+                    due = self.take_due()
+                if not due:
+                    return
+            for name, entry in due:
+                self.write(name, entry)
+
+    def next_wait(self):
+        """Seconds until the oldest pending checkpoint reaches the interval"""
+        if not self.pending:
+            return self.interval
+        oldest = min(entry.since for entry in self.pending.values())
+        return max(self.interval - (time.monotonic() - oldest), 0.01)
+
+    def stop(self):
+        """Write every pending checkpoint, then end the worker"""
+        with self.condition:
+            self.stopping = True
+            for entry in self.pending.values():
+                entry.forced = True
+            thread = self.thread
+            self.condition.notify_all()
+        if thread is not None and thread.is_alive():
+            thread.join()
+        with self.condition:
+            due = self.take_due()
+        for name, entry in due:
+            self.write(name, entry)
+
+# ============================================================================
+# SHARED SCHEDULER
+# ============================================================================
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Return the process-wide scheduler, creating it on first use"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = AutosaveScheduler()
+            atexit.register(_scheduler.stop)
+        return _scheduler
+
+
+def configure(interval=DEFAULT_INTERVAL, every_actions=DEFAULT_EVERY_ACTIONS,
+              save_directory=DEFAULT_SAVE_DIRECTORY):
+    """Replace the shared scheduler (stopping the old one) with new settings"""
+    global _scheduler
+    with _scheduler_lock:
+        previous = _scheduler
+        _scheduler = AutosaveScheduler(interval, every_actions, save_directory)
+        atexit.register(_scheduler.stop)
+    if previous is not None:
+        previous.stop()
+        atexit.unregister(previous.stop)
+    return _scheduler
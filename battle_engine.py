@@ -0,0 +1,320 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Engine Module
+
+Headless combat for party-vs-horde encounters and offline auto-resolve.
+Nothing here prints or asks for input, so battles can be run in bulk on a
+server.
+
+Turn order comes from an initiative heap: each combatant's next action
+time is pushed back onto the heap after it acts, so picking who moves next
+is O(log n). Each side also keeps a heap of (health, index) entries used to
+pick the weakest living target; stale entries are dropped lazily when they
+reach the top.
+"""
+
+import heapq
+import character_manager
+from custom_exceptions import InvalidTargetError, CombatNotActiveError, CharacterDeadError
+from combat_system import calculate_damage, predict_outcome, get_random_enemy_for_level
+from battle_log import ACTION_ATTACK
+
+# ============================================================================
+# INITIATIVE SETTINGS
+# ============================================================================
+
+# Ticks between actions are BASE_ACTION_DELAY // speed
+BASE_ACTION_DELAY = 1000
+DEFAULT_SPEED = 10
+
+PARTY_SIDE = 0
+HORDE_SIDE = 1
+
+def get_action_delay(combatant):
+    """Return how many ticks a combatant waits between actions"""
+    speed = combatant.get('speed', DEFAULT_SPEED)
+    return BASE_ACTION_DELAY // max(speed, 1)
+
+# ============================================================================
+# PARTY BATTLE
+# ============================================================================
+
+class PartyBattle:
+    """
+    Battle between a party of characters and a horde of enemies
+
+    Combatants are the same dictionaries used everywhere else (they need
+    'name', 'health' and 'strength'; 'speed' is optional). Every action is
+    a basic attack using combat_system.calculate_damage against the living
+    opponent with the lowest health.
+    """
+
+    def __init__(self, party, horde, event_log=None):
+        """
+        Initialize battle with a list of characters and a list of enemies
+
+        event_log: optional battle_log.BattleEventLog; in party battles the
+                   actor field holds the attacker's combatant index
+        Raises: InvalidTargetError if either side has nobody able to fight
+        """
+        self.combatants = list(party) + list(horde)
+        self.sides = [PARTY_SIDE] * len(party) + [HORDE_SIDE] * len(horde)
+        self.event_log = event_log
+        self.combat_active = True
+        self.turn_counter = 0
+        self.tick = 0
+
+        self.alive_count = [0, 0]
+        self.initiative = []
+        self.targets = ([], [])
+
+        for index, combatant in enumerate(self.combatants):
+            if combatant['health'] <= 0:
+                continue
+            side = self.sides[index]
+            self.alive_count[side] += 1
+            self.initiative.append((get_action_delay(combatant), index))
+            self.targets[side].append((combatant['health'], index))
+
+        if not self.alive_count[PARTY_SIDE] or not self.alive_count[HORDE_SIDE]:
+            raise InvalidTargetError("Both sides need at least one living combatant.")
+
+        heapq.heapify(self.initiative)
+        heapq.heapify(self.targets[PARTY_SIDE])
+        heapq.heapify(self.targets[HORDE_SIDE])
+
+    def select_target(self, side):
+        """
+        Return the index of the living combatant on `side` with the lowest health
+
+        Returns: Combatant index, or None if nobody on that side is alive
+        """
+        heap = self.targets[side]
+        combatants = self.combatants
+        while heap:
+            health, index = heap[0]
+            current = combatants[index]['health']
+            # Drop entries for dead combatants or outdated health values
+            if current <= 0 or current != health:
+                heapq.heappop(heap)
+                continue
+            return index
+        return None
+
+    def step(self):
+        """
+        Let the next combatant in initiative order act
+
+        Returns: Index of the combatant that acted
+        Raises: CombatNotActiveError if the battle is already over
+        """
+        if not self.combat_active:
+            raise CombatNotActiveError("Cannot take turn, combat is not active.")
+
+        combatants = self.combatants
+        # Skip initiative entries left behind by combatants that died
+        while True:
+            self.tick, index = heapq.heappop(self.initiative)
+            attacker = combatants[index]
+            if attacker['health'] > 0:
+                break
+
+        opposing_side = 1 - self.sides[index]
+        target_index = self.select_target(opposing_side)
+        target = combatants[target_index]
+
+        damage = calculate_damage(attacker, target)
+        target['health'] = max(target['health'] - damage, 0)
+        self.turn_counter += 1
+
+        if self.event_log is not None:
+            self.event_log.record(self.turn_counter, index, ACTION_ATTACK, damage, target['health'])
+
+        if target['health'] > 0:
+            heapq.heappush(self.targets[opposing_side], (target['health'], target_index))
+        else:
+            self.alive_count[opposing_side] -= 1
+            if self.alive_count[opposing_side] == 0:
+                self.combat_active = False
+
+        heapq.heappush(self.initiative, (self.tick + get_action_delay(attacker), index))
+        return index
+
+    def check_battle_end(self):
+        """
+        Check if battle is over
+
+        Returns: 'player' if the horde is dead, 'enemy' if the party is dead,
+                 None if ongoing
+        """
+        if self.alive_count[HORDE_SIDE] == 0:
+            return 'player'
+        elif self.alive_count[PARTY_SIDE] == 0:
+            return 'enemy'
+        return None
+
+    def run(self, max_turns=None):
+        """
+        Run the battle until one side is wiped out (or max_turns is reached)
+
+        Returns: Dictionary with battle results:
+                {'winner': 'player'|'enemy'|None, 'turns': int,
+                 'party_alive': int, 'horde_alive': int,
+                 'xp_gained': int, 'gold_gained': int}
+        """
+        while self.combat_active:
+            if max_turns is not None and self.turn_counter >= max_turns:
+                break
+            self.step()
+
+        winner = self.check_battle_end()
+        xp = gold = 0
+        if winner == 'player':
+            for index, combatant in enumerate(self.combatants):
+                if self.sides[index] == HORDE_SIDE:
+                    xp += combatant.get('xp_reward', 0)
+                    gold += combatant.get('gold_reward', 0)
+
+        return {
+            'winner': winner,
+            'turns': self.turn_counter,
+            'party_alive': self.alive_count[PARTY_SIDE],
+            'horde_alive': self.alive_count[HORDE_SIDE],
+            'xp_gained': xp,
+            'gold_gained': gold
+        }
+
+# ============================================================================
+# AUTO-RESOLVE
+# ============================================================================
+
+def resolve_duel(character, enemy):
+    """
+    Resolve a one-on-one basic-attack fight instantly
+
+    A 1v1 PartyBattle with default speeds is exactly the fight that
+    combat_system.predict_outcome solves in closed form, so this applies the
+    prediction instead of stepping through turns.
+
+    Returns: The predict_outcome dictionary
+    """
+    outcome = predict_outcome(character, enemy)
+    character['health'] = outcome['character_health']
+    enemy['health'] = outcome['enemy_health']
+    return outcome
+
+
+def auto_resolve_encounters(character, count):
+    """
+    Resolve `count` explore encounters for a character in one call
+
+    Enemies come from get_random_enemy_for_level. Health carries over from
+    fight to fight and resolution stops at the first defeat. XP is held back
+    and passed to character_manager.gain_experience only when it is enough
+    to level up (so enemy selection sees the new level) or at the end; gold
+    is added once.
+
+    Returns: Dictionary summary:
+            {'battles': int, 'wins': int, 'losses': int, 'turns': int,
+             'xp_gained': int, 'gold_gained': int, 'levels_gained': int}
+    Raises: CharacterDeadError if character is already dead
+    """
+    if character['health'] <= 0:
+        raise CharacterDeadError("Character is dead and cannot fight.")
+
+    start_level = character['level']
+    summary = {'battles': 0, 'wins': 0, 'losses': 0, 'turns': 0,
+               'xp_gained': 0, 'gold_gained': 0, 'levels_gained': 0}
+    pending_xp = 0
+
+    for _ in range(count):
+        enemy = get_random_enemy_for_level(character['level'])
+        outcome = resolve_duel(character, enemy)
+        summary['battles'] += 1
+        summary['turns'] += outcome['turns']
+
+        if outcome['winner'] != 'player':
+            # XP from earlier wins was earned alive and is below the next
+            # level-up (else it would have been banked), so credit it directly
+            character['experience'] += pending_xp
+            pending_xp = 0
+            summary['losses'] += 1
+            break
+
+        summary['wins'] += 1
+        summary['xp_gained'] += enemy['xp_reward']
+        summary['gold_gained'] += enemy['gold_reward']
+        pending_xp += enemy['xp_reward']
+
+        if character['experience'] + pending_xp >= character['level'] * 100:
+            character_manager.gain_experience(character, pending_xp)
+            pending_xp = 0
+
+    if pending_xp:
+        character_manager.gain_experience(character, pending_xp)
+    if summary['gold_gained']:
+        character_manager.add_gold(character, summary['gold_gained'])
+
+    summary['levels_gained'] = character['level'] - start_level
+    return summary
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def run_simulation(horde_size=200, encounters=50):
+    """
+    Run a 4-hero party against a goblin horde, then auto-resolve encounters
+
+    Returns: (party battle result, auto-resolve summary)
+    """
+    import combat_system
+
+    party = [
+        character_manager.create_character(f"Hero{i}", cls)
+        for i, cls in enumerate(["Warrior", "Mage", "Rogue", "Cleric"])
+    ]
+    for hero in party:
+        hero['level'] = 10
+        hero['strength'] += 40
+        hero['max_health'] = hero['health'] = 5000
+
+    horde = [combat_system.create_enemy("goblin") for _ in range(horde_size)]
+    battle_result = PartyBattle(party, horde).run()
+
+    idler = character_manager.create_character("Idler", "Warrior")
+    return battle_result, auto_resolve_encounters(idler, encounters)
+
+
+def cli(argv=None):
+    """Command line entry point for the headless simulation (optionally profiled)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quest Chronicles battle engine simulation")
+    parser.add_argument("--horde", type=int, default=200, help="number of goblins the party fights")
+    parser.add_argument("--encounters", type=int, default=50, help="number of encounters to auto-resolve")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="profile the simulation and write PREFIX.pstats and PREFIX.collapsed (flamegraph stacks)")
+    parser.add_argument("--top", type=int, default=15, help="how many functions to list in the profile report")
+    args = parser.parse_args(argv)
+
+    print("=== BATTLE ENGINE TEST ===")
+
+    if args.profile:
+        import profiling
+        (battle_result, summary), rows = profiling.profile_call(
+            run_simulation, args.horde, args.encounters,
+            output_prefix=args.profile, top=args.top
+        )
+    else:
+        battle_result, summary = run_simulation(args.horde, args.encounters)
+
+    print(f"Battle result: {battle_result}")
+    print(f"Auto-resolve: {summary}")
+
+    if args.profile:
+        profiling.display_profile_summary(rows, args.profile)
+
+
+if __name__ == "__main__":
+    cli()
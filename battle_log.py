@@ -0,0 +1,144 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Log Module
+
+Records battle turns as fixed-size integer events and saves them as a
+compact binary replay file that can be streamed back later.
+
+Each event is five integers: (turn, actor, action, damage, hp_after)
+hp_after is the health of whoever the action landed on.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from custom_exceptions import CorruptedDataError, MissingDataFileError
+
+# ============================================================================
+# EVENT CODES
+# ============================================================================
+
+ACTOR_PLAYER = 0
+ACTOR_ENEMY = 1
+
+ACTION_ATTACK = 0
+ACTION_ABILITY = 1
+ACTION_ESCAPE = 2
+ACTION_ESCAPE_FAILED = 3
+
+FIELDS_PER_EVENT = 5
+
+# Replay file layout: header then little-endian int32 event records
+REPLAY_MAGIC = b"QCRP"
+REPLAY_VERSION = 1
+HEADER_FORMAT = "<4sHI"     # magic, version, event count
+RECORD_FORMAT = "<5i"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# ============================================================================
+# EVENT BUFFER
+# ============================================================================
+
+class BattleEventLog:
+    """
+    Array-backed buffer of battle events
+
+    Storage is one flat array of C ints preallocated for `capacity` events
+    and doubled when full, so recording never allocates per event.
+    """
+
+    def __init__(self, capacity=64):
+        self.events = array('i', bytes(4 * FIELDS_PER_EVENT * max(capacity, 1)))
+        self.count = 0
+
+    def record(self, turn, actor, action, damage, hp_after):
+        """Append one event to the log"""
+        i = self.count * FIELDS_PER_EVENT
+        events = self.events
+        if i + FIELDS_PER_EVENT > len(events):
+            # Double the buffer instead of growing one event at a time
+            events.extend(array('i', bytes(events.itemsize * len(events))))
+        events[i] = turn
+        events[i + 1] = actor
+        events[i + 2] = action
+        events[i + 3] = damage
+        events[i + 4] = hp_after
+        self.count += 1
+
+    def get(self, index):
+        """Return event number `index` as a tuple"""
+        if not 0 <= index < self.count:
+            raise IndexError("Battle event index out of range")
+        i = index * FIELDS_PER_EVENT
+        return tuple(self.events[i:i + FIELDS_PER_EVENT])
+
+    def clear(self):
+        """Forget all events but keep the allocated buffer"""
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        events = self.events
+        for i in range(0, self.count * FIELDS_PER_EVENT, FIELDS_PER_EVENT):
+            yield tuple(events[i:i + FIELDS_PER_EVENT])
+
+    def to_bytes(self):
+        """Serialize the log into the binary replay format"""
+        body = self.events[:self.count * FIELDS_PER_EVENT]
+        if sys.byteorder != "little":
+            body.byteswap()
+        return struct.pack(HEADER_FORMAT, REPLAY_MAGIC, REPLAY_VERSION, self.count) + body.tobytes()
+
+    def write_replay(self, filename):
+        """Write the log to a replay file"""
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, "wb") as f:
+            f.write(self.to_bytes())
+        return True
+
+# ============================================================================
+# REPLAY READING
+# ============================================================================
+
+def iter_replay(filename, chunk_events=1024):
+    """
+    Stream events from a replay file without loading it all at once
+
+    Yields: (turn, actor, action, damage, hp_after) tuples
+    Raises: MissingDataFileError if the file does not exist
+            CorruptedDataError if the header is wrong or the file is truncated
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Replay file '{filename}' not found.")
+
+    with open(filename, "rb") as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise CorruptedDataError(f"Replay file '{filename}' is truncated.")
+
+        magic, version, count = struct.unpack(HEADER_FORMAT, header)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise CorruptedDataError(f"'{filename}' is not a battle replay file.")
+
+        remaining = count
+        while remaining > 0:
+            n = min(remaining, chunk_events)
+            chunk = f.read(n * RECORD_SIZE)
+            if len(chunk) < n * RECORD_SIZE:
+                raise CorruptedDataError(f"Replay file '{filename}' is truncated.")
+            yield from struct.iter_unpack(RECORD_FORMAT, chunk)
+            remaining -= n
+
+
+def read_replay(filename):
+    """Load a whole replay file back into a BattleEventLog"""
+    log = BattleEventLog()
+    for event in iter_replay(filename):
+        log.record(*event)
+    return log
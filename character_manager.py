@@ -1,11 +1,78 @@
-import os
+import atexit
 from custom_exceptions import (
     InvalidCharacterClassError,
-    CharacterNotFoundError,
-    SaveFileCorruptedError,
     InvalidSaveDataError,
     CharacterDeadError
 )
+from character_storage import StorageBackend, DirectoryBackend, CachedBackend, copy_character
+
+# ============================================================================
+# CHANGE TRACKING
+# ============================================================================
+
+class TrackedCharacter(dict):
+    """
+    Character dictionary that remembers which fields changed since it was
+    last saved or loaded
+
+    Assigning a field (character['gold'] += 5) marks it automatically;
+    code that changes a list in place (inventory, quests) calls
+    mark_dirty(character, field). saved_to records where the last save or
+    load went and the stored version it left there (backend generation,
+    save_directory, version), so save_character can tell when a save would
+    rewrite exactly what is still stored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty = set(self)
+        self.saved_to = None
+
+    def __setitem__(self, key, value):
+        # Hot path (every stat change): avoid super() lookups
+        dict.__setitem__(self, key, value)
+        self.dirty.add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dirty.add(key)
+
+    def update(self, *args, **kwargs):
+        changes = dict(*args, **kwargs)
+        super().update(changes)
+        self.dirty.update(changes)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key in self:
+            self.dirty.add(key)
+        return super().pop(key, *default)
+
+    def mark_dirty(self, *fields):
+        self.dirty.update(fields)
+
+    def mark_clean(self, saved_to=None):
+        self.dirty.clear()
+        self.saved_to = saved_to
+
+
+def mark_dirty(character, *fields):
+    """Record that fields of a character were changed in place"""
+    dirty = getattr(character, 'dirty', None)
+    if dirty is not None:
+        dirty.update(fields)
+
+
+def dirty_fields(character):
+    """Return the fields changed since the last save (all of them for plain dicts)"""
+    if isinstance(character, TrackedCharacter):
+        return set(character.dirty)
+    return set(character)
+
 
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
@@ -29,8 +96,8 @@ def create_character(name, character_class):
     else:  # Cleric
         health, strength, magic = 100, 10, 15
 
-    # Return structured character data as a dictionary
-    return {
+    # Return structured character data as a (change-tracking) dictionary
+    return TrackedCharacter({
         "name": name,
         "class": character_class,
         "level": 1,
@@ -43,104 +110,277 @@ def create_character(name, character_class):
         "inventory": [],
         "active_quests": [],
         "completed_quests": []
-    }
+    })
 
 
-def save_character(character, save_directory="data/save_games"):
-    import os
+# ============================================================================
+# STORAGE BACKEND
+# ============================================================================
 
-    # Create save directory if it doesn’t exist
-    os.makedirs(save_directory, exist_ok=True)
+# Where the save/load functions below keep characters (see character_storage)
+_storage_backend = DirectoryBackend()
 
-    # Build the file path for the specific character
-    file_path = os.path.join(save_directory, f"{character['name']}_save.txt")
+# Bumped whenever the backend changes, so no character's saved_to matches
+# a previous backend (even one that a new backend object reuses the id() of)
+_backend_generation = 0
 
-    try:
-        # Write each key-value pair into the save file
-        with open(file_path, "w") as f:
-            for key, value in character.items():
-                f.write(f"{key}: {value}\n")
-        return True
 
-    except Exception as e:
-        # Return False for any unexpected issue
-        return False
+def set_storage_backend(backend):
+    """Send all saves, loads, listings and deletes to `backend`; returns the old one"""
+    global _storage_backend, _backend_generation
+    previous = _storage_backend
+    _storage_backend = backend
+    _backend_generation += 1
+    return previous
 
 
-def load_character(character_name, save_directory="data/save_games"):
-    import os
+def get_storage_backend():
+    return _storage_backend
 
-    # Find the save file for this character
-    file_path = os.path.join(save_directory, f"{character_name}_save.txt")
 
-    # If missing, raise custom "not found" error
-    if not os.path.exists(file_path):
-        raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+def enable_character_cache(capacity=256, write_back=True):
+    """Put an LRU cache (with write-back) in front of the current backend"""
+    if not isinstance(_storage_backend, CachedBackend):
+        set_storage_backend(CachedBackend(_storage_backend, capacity, write_back))
+    return _storage_backend
 
-    character = {}
 
-    try:
-        # Read all lines from the file
-        with open(file_path, "r") as f:
-            lines = f.readlines()
+def flush_saves():
+    """Write any saves a caching backend is still holding back"""
+    return _storage_backend.flush()
 
-        # Process each line individually
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue  # Skip blank lines
 
-            # Ensure the line has a key/value structure
-            if ": " not in line:
-                raise SaveFileCorruptedError(f"Malformed line in save file: {line}")
+# Held-back saves must reach the real store before the process exits
+atexit.register(flush_saves)
 
-            key, value = line.split(": ", 1)
 
-            # Convert numeric strings back into integers
-            if value.isdigit():
-                value = int(value)
+def save_character(character, save_directory="data/save_games", force=False):
+    try:
+        return write_character(character, save_directory, force)
 
-            # Convert list strings back into Python lists
-            elif value.startswith("[") and value.endswith("]"):
-                value = eval(value)
+    except Exception as e:
+        # Return False for any unexpected issue
+        return False
 
-            character[key] = value
 
-        return character
+def write_character(character, save_directory="data/save_games", force=False):
+    """save_character, but errors are raised instead of returning False"""
+    backend = _storage_backend
+    destination = (_backend_generation, save_directory)
+    tracked = isinstance(character, TrackedCharacter)
+    # Our stored copy is still there, untouched by anyone else
+    ours = (tracked and not force and _saved_at(character, destination)
+            and _still_stored(character, backend, save_directory))
 
-    except Exception as e:
-        # Wrap any error into a "corrupted save file" exception
-        raise SaveFileCorruptedError(
-            f"Could not read save file for '{character_name}'"
-        ) from e
+    # Nothing changed since: skip the write
+    if ours and not character.dirty:
+        return True
 
+    # The backend writes every key-value pair of the character, or only
+    # the changed ones if it supports partial updates (only over our own
+    # copy: a replaced save would keep the other writer's fields)
+    if ours:
+        saved = backend.save_fields(character, character.dirty, save_directory)
+    else:
+        saved = backend.save(character, save_directory)
+    if tracked:
+        character.mark_clean(destination + (_stored_version(backend, character['name'], save_directory),))
+    return saved
 
-def list_saved_characters(save_directory="data/save_games"):
-    # If directory doesn't exist, no characters are saved
-    if not os.path.exists(save_directory):
-        return []
 
-    result = []
+def _saved_at(character, destination):
+    """True if the character was last saved or loaded at destination (generation, save_directory)"""
+    saved_to = character.saved_to
+    return saved_to is not None and saved_to[:2] == destination
+
+
+def _stored_version(backend, character_name, save_directory):
+    """The backend's version of a stored character, or None if it is gone or cannot tell"""
+    try:
+        return backend.version(character_name, save_directory)
+    except Exception:
+        return None
+
+
+def _still_stored(character, backend, save_directory):
+    """True if the stored copy is unchanged since this character last saved or loaded it"""
+    version = character.saved_to[2]
+    return version is not None and _stored_version(backend, character['name'], save_directory) == version
+
+
+def load_character(character_name, save_directory="data/save_games", trust_checksum=False):
+    # Raises CharacterNotFoundError if missing, SaveFileCorruptedError if unreadable
+    # or damaged, InvalidSaveDataError if fields are missing or of the wrong type.
+    # With trust_checksum, saves whose checksum matched skip validate_character_data.
+    # Version first, so a save racing with this read looks like a change
+    version = _stored_version(_storage_backend, character_name, save_directory)
+    loaded, checked = _storage_backend.load_checked(character_name, save_directory)
+    if not (trust_checksum and checked):
+        validate_character_data(loaded)
+    character = TrackedCharacter(loaded)
+    character.mark_clean((_backend_generation, save_directory, version))
+    return character
+
+
+def checkpoint_character(character, save_directory="data/save_games"):
+    """
+    Copy a character so it can be saved later from another thread
+
+    The copy carries the fields changed since the last save (and where that
+    save went), so save_character(copy, save_directory) writes only those.
+    The original is marked clean as if it had been saved.
+
+    Returns: The copy, or None if nothing changed since the last save here
+    """
+    destination = (_backend_generation, save_directory)
+    tracked = isinstance(character, TrackedCharacter)
+    if tracked and not character.dirty and _saved_at(character, destination):
+        return None
+
+    checkpoint = TrackedCharacter(copy_character(character))
+    checkpoint.dirty = dirty_fields(character)
+    if tracked:
+        checkpoint.saved_to = character.saved_to
+        # No stored version yet: a later save_character of the original
+        # writes again rather than trusting a checkpoint that may not land
+        character.mark_clean(destination + (None,))
+    return checkpoint
 
-    # Loop over all files and extract character names
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            result.append(filename[:-9])  # remove "_save.txt"
 
-    return result
+def list_saved_characters(save_directory="data/save_games"):
+    # No saved characters gives an empty list
+    return _storage_backend.list_names(save_directory)
 
 
 def delete_character(character_name, save_directory="data/save_games"):
-    # Build file path
-    file_path = os.path.join(save_directory, f"{character_name}_save.txt")
+    # Raises CharacterNotFoundError if the character doesn't exist
+    return _storage_backend.delete(character_name, save_directory)
 
-    # If file doesn't exist, raise an error
-    if not os.path.exists(file_path):
-        raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
 
-    # Delete the file and confirm success
-    os.remove(file_path)
-    return True
+# ============================================================================
+# BULK SAVE / LOAD
+# ============================================================================
+
+DEFAULT_BULK_WORKERS = 8
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_CHUNK_SIZE = 32
+
+def _run_chunk(task, chunk):
+    outcomes = []
+    for item in chunk:
+        try:
+            outcomes.append((item, task(item), None))
+        except Exception as e:
+            outcomes.append((item, None, e))
+    return outcomes
+
+
+def _run_bounded(task, items, max_workers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (item, result, error) for task(item) over a thread pool
+
+    Items are handed to the pool in chunks (one future per chunk, not per
+    character) and at most 2 * max_workers chunks are queued at once, so
+    huge iterables never become one giant list of futures.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from itertools import islice
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-io") as executor:
+        items = iter(items)
+        running = set()
+        exhausted = False
+        while running or not exhausted:
+            while not exhausted and len(running) < 2 * max_workers:
+                chunk = list(islice(items, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                running.add(executor.submit(_run_chunk, task, chunk))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def _supports_batches(backend):
+    return type(backend).save_many is not StorageBackend.save_many
+
+
+def save_characters(characters, save_directory="data/save_games", max_workers=DEFAULT_BULK_WORKERS,
+                    force=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Save many characters at once, never stopping at the first failure
+
+    Backends that batch writes (SQLite) get one transaction per batch_size
+    characters, retried one by one if a batch fails; others are saved by
+    up to max_workers threads. Unchanged characters are skipped as in
+    save_character.
+
+    Returns: {character name: {'ok': bool, 'error': exception or None}}
+    """
+    results = {}
+    backend = _storage_backend
+
+    if _supports_batches(backend):
+        destination = (_backend_generation, save_directory)
+        batch = []
+
+        def write_batch():
+            try:
+                backend.save_many(batch, save_directory)
+            except Exception:
+                # Find out which ones are bad
+                for character in batch:
+                    try:
+                        write_character(character, save_directory, force=True)
+                        results[character['name']] = {'ok': True, 'error': None}
+                    except Exception as e:
+                        results[character['name']] = {'ok': False, 'error': e}
+                return
+            for character in batch:
+                if isinstance(character, TrackedCharacter):
+                    character.mark_clean(destination + (_stored_version(backend, character['name'], save_directory),))
+                results[character['name']] = {'ok': True, 'error': None}
+
+        for character in characters:
+            if (isinstance(character, TrackedCharacter) and not force and not character.dirty
+                    and _saved_at(character, destination) and _still_stored(character, backend, save_directory)):
+                results[character['name']] = {'ok': True, 'error': None}
+                continue
+            batch.append(character)
+            if len(batch) >= batch_size:
+                write_batch()
+                batch = []
+        if batch:
+            write_batch()
+        return results
+
+    def task(character):
+        return write_character(character, save_directory, force)
+
+    for character, _, error in _run_bounded(task, characters, max_workers):
+        results[character['name']] = {'ok': error is None, 'error': error}
+    return results
+
+
+def load_characters(character_names, save_directory="data/save_games", max_workers=DEFAULT_BULK_WORKERS,
+                    trust_checksum=False):
+    """
+    Load many characters at once over a thread pool
+
+    Returns: {character name: {'ok': bool, 'character': dict or None,
+                               'error': exception or None}}
+             (missing, corrupted or invalid saves give ok=False and the exception)
+    """
+    def task(name):
+        return load_character(name, save_directory, trust_checksum)
+
+    results = {}
+    for name, character, error in _run_bounded(task, character_names, max_workers):
+        results[name] = {'ok': error is None, 'character': character, 'error': error}
+    return results
 
 
 # ============================================================================
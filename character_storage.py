@@ -0,0 +1,803 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Storage Module
+
+Storage backends behind character_manager's save_character, load_character,
+list_saved_characters and delete_character.
+
+Every backend implements the four StorageBackend methods. The
+save_directory argument the public functions already take is passed
+through as a namespace: the directory backend uses it as a folder, the
+others use it to keep separate rosters apart, so callers (and tests) that
+pass their own directory stay isolated whichever backend is active.
+
+All backends store the same "key: value" text a save file contains, so a
+character loads identically from any of them. The directory and SQLite
+backends put a one-line header in front of it holding the codec, length
+and CRC32 of what follows, so damaged or truncated saves are rejected
+before parsing starts. They can also store the text compressed (zlib or
+lzma); loading reads the codec from the header, so plain, compressed and
+older header-less saves can sit side by side.
+
+    DirectoryBackend - one <name>_save.txt file per character (the default)
+    MemoryBackend    - a dictionary in this process (tests, simulations)
+    SqliteBackend    - one row per character in a SQLite database, with
+                       indexed roster columns and batched upserts
+    CachedBackend    - LRU cache with write-back wrapped around any of these
+"""
+
+import os
+import random
+import threading
+import zlib
+from collections import OrderedDict
+from custom_exceptions import CharacterNotFoundError, SaveFileCorruptedError
+
+SAVE_SUFFIX = "_save.txt"
+
+# First line of every save: b"QCSAVE <codec> <length> <crc32>\n", where codec
+# is "plain", "zlib" or "lzma" and length/crc32 describe the bytes after the
+# header. Saves written before checksums have no header (plain text) or
+# just b"QCSAVE <codec>\n"; a plain save can never start with the magic,
+# because every plain line holds a "key: value" pair.
+SAVE_MAGIC = b"QCSAVE "
+COMPRESSION_CODECS = ("zlib", "lzma")
+# Saves shorter than this stay plain text; compressing them saves nothing
+DEFAULT_COMPRESS_MIN_BYTES = 512
+# Own generator, so revision tokens neither use nor disturb the game's seeded random
+_revision_tokens = random.Random()
+
+# Connections a file-backed SqliteBackend keeps open at most
+DEFAULT_MAX_CONNECTIONS = 8
+
+# ============================================================================
+# SAVE FORMAT
+# ============================================================================
+
+def serialize_character(character):
+    """Return the save text for a character: one 'key: value' line per field"""
+    return "".join(f"{key}: {value}\n" for key, value in character.items())
+
+
+def parse_character(text, character_name):
+    """
+    Turn save text back into a character dictionary
+
+    Raises: SaveFileCorruptedError if any line cannot be read
+    """
+    character = {}
+
+    try:
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue  # Skip blank lines
+
+            # Ensure the line has a key/value structure
+            if ": " not in line:
+                raise SaveFileCorruptedError(f"Malformed line in save file: {line}")
+
+            key, value = line.split(": ", 1)
+
+            # Convert numeric strings back into integers
+            if value.isdigit():
+                value = int(value)
+
+            # Convert list strings back into Python lists
+            elif value.startswith("[") and value.endswith("]"):
+                value = eval(value)
+
+            character[key] = value
+
+        return character
+
+    except Exception as e:
+        # Wrap any error into a "corrupted save file" exception
+        raise SaveFileCorruptedError(
+            f"Could not read save file for '{character_name}'"
+        ) from e
+
+
+def check_compression(compression):
+    """Raise ValueError unless compression is None or a known codec"""
+    if compression is not None and compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown save compression: {compression}")
+    return compression
+
+
+def encode_save(text, compression=None, min_bytes=DEFAULT_COMPRESS_MIN_BYTES):
+    """
+    Return the bytes to store for a save text: a checksummed header, then
+    the text as UTF-8 or (for saves of at least min_bytes, when a
+    compression codec is given) compressed
+    """
+    payload = text.encode("utf-8")
+    codec = "plain"
+    if compression is not None and len(payload) >= min_bytes:
+        codec = compression
+        if compression == "zlib":
+            payload = zlib.compress(payload, 6)
+        else:
+            import lzma
+            payload = lzma.compress(payload, preset=6)
+    header = f"{codec} {len(payload)} {zlib.crc32(payload):08x}\n".encode("ascii")
+    return SAVE_MAGIC + header + payload
+
+
+def decode_save(data, character_name):
+    """
+    Check and unpack stored save data (bytes or str)
+
+    The length and checksum in the header are compared before anything is
+    decompressed or parsed, so truncated or damaged saves fail fast.
+
+    Returns: (save text, True if a checksum was present and matched)
+    Raises: SaveFileCorruptedError if the data is damaged or unreadable
+    """
+    if isinstance(data, str):
+        return data, False
+    if not data.startswith(SAVE_MAGIC):
+        header, payload = None, data
+    else:
+        header, _, payload = data.partition(b"\n")
+        header = header[len(SAVE_MAGIC):].split()
+
+    try:
+        checked = False
+        codec = "plain"
+        if header is not None:
+            codec = header[0].decode("ascii")
+            if len(header) == 3:
+                if int(header[1]) != len(payload):
+                    raise ValueError(f"expected {int(header[1])} bytes, found {len(payload)}")
+                if int(header[2], 16) != zlib.crc32(payload):
+                    raise ValueError("checksum mismatch")
+                checked = True
+            elif len(header) != 1:
+                raise ValueError("malformed header")
+
+        if codec == "zlib":
+            payload = zlib.decompress(payload)
+        elif codec == "lzma":
+            import lzma
+            payload = lzma.decompress(payload)
+        elif codec != "plain":
+            raise ValueError(f"unknown codec {codec!r}")
+        return payload.decode("utf-8"), checked
+    except Exception as e:
+        raise SaveFileCorruptedError(
+            f"Could not read save file for '{character_name}': {e}"
+        ) from e
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class StorageBackend:
+    """
+    Base class for places characters can be saved
+
+    save(character, save_directory) -> True
+    load(character_name, save_directory) -> character dictionary
+        Raises CharacterNotFoundError or SaveFileCorruptedError
+    load_checked(character_name, save_directory) -> (character, checked)
+        As load(); checked is True if the save's checksum was verified
+    list_names(save_directory) -> list of saved character names
+    delete(character_name, save_directory) -> True
+        Raises CharacterNotFoundError
+    save_many(characters, save_directory) -> number saved
+        (one save() per character unless a backend can batch them)
+    save_fields(character, fields, save_directory) -> True
+        Store a character already saved here of which only `fields`
+        changed (a full save() unless a backend can do better)
+    version(character_name, save_directory) -> token that changes whenever
+        the stored character changes, or None if the backend cannot tell
+        Raises CharacterNotFoundError
+    flush() -> writes anything held back (only caching backends hold any)
+    """
+
+    def save(self, character, save_directory):
+        raise NotImplementedError
+
+    def load(self, character_name, save_directory):
+        raise NotImplementedError
+
+    def load_checked(self, character_name, save_directory):
+        return self.load(character_name, save_directory), False
+
+    def list_names(self, save_directory):
+        raise NotImplementedError
+
+    def delete(self, character_name, save_directory):
+        raise NotImplementedError
+
+    def save_many(self, characters, save_directory):
+        """Save several characters; returns how many were saved"""
+        count = 0
+        for character in characters:
+            self.save(character, save_directory)
+            count += 1
+        return count
+
+    def save_fields(self, character, fields, save_directory):
+        return self.save(character, save_directory)
+
+    def version(self, character_name, save_directory):
+        return None
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class DirectoryBackend(StorageBackend):
+    """
+    One checksummed save file per character inside save_directory
+
+    compression ("zlib" or "lzma") writes saves of at least min_bytes
+    compressed; files are read back correctly whatever they were written with.
+    """
+
+    def __init__(self, compression=None, min_bytes=DEFAULT_COMPRESS_MIN_BYTES):
+        self.compression = check_compression(compression)
+        self.min_bytes = min_bytes
+
+    def path_for(self, character_name, save_directory):
+        return os.path.join(save_directory, f"{character_name}{SAVE_SUFFIX}")
+
+    def save(self, character, save_directory):
+        # Create save directory if it doesn't exist
+        os.makedirs(save_directory, exist_ok=True)
+        data = encode_save(serialize_character(character), self.compression, self.min_bytes)
+        with open(self.path_for(character['name'], save_directory), "wb") as f:
+            f.write(data)
+        return True
+
+    def load(self, character_name, save_directory):
+        return self.load_checked(character_name, save_directory)[0]
+
+    def load_checked(self, character_name, save_directory):
+        file_path = self.path_for(character_name, save_directory)
+
+        # If missing, raise custom "not found" error
+        if not os.path.exists(file_path):
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except Exception as e:
+            raise SaveFileCorruptedError(
+                f"Could not read save file for '{character_name}'"
+            ) from e
+        text, checked = decode_save(data, character_name)
+        return parse_character(text, character_name), checked
+
+    def list_names(self, save_directory):
+        # If directory doesn't exist, no characters are saved
+        if not os.path.exists(save_directory):
+            return []
+        return [
+            filename[:-len(SAVE_SUFFIX)]
+            for filename in os.listdir(save_directory)
+            if filename.endswith(SAVE_SUFFIX)
+        ]
+
+    def delete(self, character_name, save_directory):
+        file_path = self.path_for(character_name, save_directory)
+        if not os.path.exists(file_path):
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+        os.remove(file_path)
+        return True
+
+    def version(self, character_name, save_directory):
+        # A stat is far cheaper than reading and parsing the file
+        try:
+            info = os.stat(self.path_for(character_name, save_directory))
+        except FileNotFoundError:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+        return (info.st_mtime_ns, info.st_size)
+
+
+class MemoryBackend(StorageBackend):
+    """Save texts kept in a dictionary; nothing touches the disk"""
+
+    def __init__(self):
+        # {save_directory: {character_name: (version, save text)}}
+        self.rosters = {}
+        self.saves = 0
+        self.lock = threading.Lock()
+
+    def save(self, character, save_directory):
+        text = serialize_character(character)
+        with self.lock:
+            self.saves += 1
+            self.rosters.setdefault(save_directory, {})[character['name']] = (self.saves, text)
+        return True
+
+    def stored(self, character_name, save_directory):
+        with self.lock:
+            stored = self.rosters.get(save_directory, {}).get(character_name)
+        if stored is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+        return stored
+
+    def load(self, character_name, save_directory):
+        return parse_character(self.stored(character_name, save_directory)[1], character_name)
+
+    def list_names(self, save_directory):
+        with self.lock:
+            return list(self.rosters.get(save_directory, {}))
+
+    def delete(self, character_name, save_directory):
+        with self.lock:
+            roster = self.rosters.get(save_directory, {})
+            if character_name not in roster:
+                raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+            del roster[character_name]
+        return True
+
+    def version(self, character_name, save_directory):
+        return self.stored(character_name, save_directory)[0]
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Characters stored as rows of a SQLite database
+
+    Besides the save text, each row keeps name, class, level and gold in
+    indexed columns, so listings and roster queries never parse saves.
+    File databases run in WAL mode and hand out connections from a pool of
+    at most max_connections, so readers do not wait for writers (a thread
+    waits only when every connection is busy); an in-memory database has a
+    single connection shared under a lock.
+
+    save_many() upserts any number of characters in one transaction. Every
+    write gives the row a new revision token, which version() reports, so a
+    CachedBackend in front of it notices writes made by other processes.
+    The data column holds checksummed save blobs, compressed for saves of
+    at least min_bytes when a compression codec is given.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS characters ("
+        " namespace TEXT NOT NULL,"
+        " name TEXT NOT NULL,"
+        " class TEXT,"
+        " level INTEGER,"
+        " gold INTEGER,"
+        " data TEXT NOT NULL,"
+        " revision INTEGER NOT NULL DEFAULT 0,"
+        " PRIMARY KEY (namespace, name))",
+        "CREATE INDEX IF NOT EXISTS characters_class ON characters (namespace, class)",
+        "CREATE INDEX IF NOT EXISTS characters_level ON characters (namespace, level)",
+        "CREATE INDEX IF NOT EXISTS characters_gold ON characters (namespace, gold)",
+    )
+
+    UPSERT = (
+        "INSERT INTO characters (namespace, name, class, level, gold, data, revision)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT (namespace, name) DO UPDATE SET"
+        " class = excluded.class, level = excluded.level,"
+        " gold = excluded.gold, data = excluded.data, revision = excluded.revision"
+    )
+
+    def __init__(self, database="data/characters.db", compression=None,
+                 min_bytes=DEFAULT_COMPRESS_MIN_BYTES, max_connections=DEFAULT_MAX_CONNECTIONS):
+        self.compression = check_compression(compression)
+        self.min_bytes = min_bytes
+
+        # Only pay for sqlite3 when this backend is actually used
+        import sqlite3
+        self.sqlite3 = sqlite3
+
+        self.database = database
+        self.shared = database == ":memory:"
+        directory = os.path.dirname(database)
+        if directory and not self.shared:
+            os.makedirs(directory, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.connections = []
+        self.idle = []
+        # One permit per connection that may be checked out at once
+        self.available = threading.BoundedSemaphore(max_connections)
+        self.shared_connection = self.open_connection() if self.shared else None
+
+        with self.transaction() as connection:
+            for statement in self.SCHEMA[:1]:
+                connection.execute(statement)
+            self.migrate(connection)
+            for statement in self.SCHEMA[1:]:
+                connection.execute(statement)
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def open_connection(self):
+        connection = self.sqlite3.connect(self.database, timeout=30, check_same_thread=False)
+        if not self.shared:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        with self.lock:
+            self.connections.append(connection)
+        return connection
+
+    def transaction(self):
+        """Context manager lending a connection for one transaction"""
+        return _SqliteTransaction(self)
+
+    def migrate(self, connection):
+        """Add the revision and indexed columns to databases created before they existed"""
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(characters)")}
+        if "revision" not in columns:
+            connection.execute("ALTER TABLE characters ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        missing = [column for column in ("class", "level", "gold") if column not in columns]
+        if not missing:
+            return
+        for column in missing:
+            kind = "TEXT" if column == "class" else "INTEGER"
+            connection.execute(f"ALTER TABLE characters ADD COLUMN {column} {kind}")
+        rows = connection.execute("SELECT namespace, name, data FROM characters").fetchall()
+        for namespace, name, data in rows:
+            character = parse_character(decode_save(data, name)[0], name)
+            connection.execute(
+                "UPDATE characters SET class = ?, level = ?, gold = ? WHERE namespace = ? AND name = ?",
+                (character.get('class'), character.get('level'), character.get('gold'), namespace, name)
+            )
+
+    def encode(self, character):
+        """The blob stored in the data column"""
+        return encode_save(serialize_character(character), self.compression, self.min_bytes)
+
+    @staticmethod
+    def new_revision():
+        """A fresh random token per write, so a deleted and re-created row never repeats one"""
+        return _revision_tokens.getrandbits(62)
+
+    def row_for(self, character, save_directory):
+        return (save_directory, character['name'], character.get('class'),
+                character.get('level'), character.get('gold'), self.encode(character),
+                self.new_revision())
+
+    # ------------------------------------------------------------------
+    # StorageBackend methods
+    # ------------------------------------------------------------------
+
+    def save(self, character, save_directory):
+        with self.transaction() as connection:
+            connection.execute(self.UPSERT, self.row_for(character, save_directory))
+        return True
+
+    def save_fields(self, character, fields, save_directory):
+        """
+        Rewrite the row in place with one UPDATE
+
+        The indexed columns are always written with the save text, whatever
+        changed, so they can never disagree with it after another writer.
+        """
+        with self.transaction() as connection:
+            updated = connection.execute(
+                "UPDATE characters SET data = ?, revision = ?, class = ?, level = ?, gold = ?"
+                " WHERE namespace = ? AND name = ?",
+                (self.encode(character), self.new_revision(), character.get('class'),
+                 character.get('level'), character.get('gold'), save_directory, character['name'])
+            ).rowcount
+            if not updated:
+                connection.execute(self.UPSERT, self.row_for(character, save_directory))
+        return True
+
+    def save_many(self, characters, save_directory):
+        """Upsert every character in one transaction; returns how many were saved"""
+        rows = [self.row_for(character, save_directory) for character in characters]
+        with self.transaction() as connection:
+            connection.executemany(self.UPSERT, rows)
+        return len(rows)
+
+    def load(self, character_name, save_directory):
+        return self.load_checked(character_name, save_directory)[0]
+
+    def load_checked(self, character_name, save_directory):
+        with self.transaction() as connection:
+            row = connection.execute(
+                "SELECT data FROM characters WHERE namespace = ? AND name = ?",
+                (save_directory, character_name)
+            ).fetchone()
+        if row is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+        text, checked = decode_save(row[0], character_name)
+        return parse_character(text, character_name), checked
+
+    def version(self, character_name, save_directory):
+        """The row's revision token, which every write replaces"""
+        with self.transaction() as connection:
+            row = connection.execute(
+                "SELECT revision FROM characters WHERE namespace = ? AND name = ?",
+                (save_directory, character_name)
+            ).fetchone()
+        if row is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+        return row[0]
+
+    def list_names(self, save_directory):
+        with self.transaction() as connection:
+            rows = connection.execute(
+                "SELECT name FROM characters WHERE namespace = ? ORDER BY name", (save_directory,)
+            ).fetchall()
+        return [name for (name,) in rows]
+
+    def delete(self, character_name, save_directory):
+        with self.transaction() as connection:
+            deleted = connection.execute(
+                "DELETE FROM characters WHERE namespace = ? AND name = ?",
+                (save_directory, character_name)
+            ).rowcount
+        if not deleted:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+        return True
+
+    # ------------------------------------------------------------------
+    # Roster queries
+    # ------------------------------------------------------------------
+
+    def query(self, where, parameters, save_directory, order_by="level DESC, name"):
+        """Return the characters matching an SQL condition on the indexed columns"""
+        with self.transaction() as connection:
+            rows = connection.execute(
+                f"SELECT name, data FROM characters WHERE namespace = ? AND {where} ORDER BY {order_by}",
+                (save_directory, *parameters)
+            ).fetchall()
+        return [parse_character(decode_save(data, name)[0], name) for name, data in rows]
+
+    def characters_above_level(self, level, save_directory="data/save_games"):
+        """All characters whose level is greater than `level`, highest first"""
+        return self.query("level > ?", (level,), save_directory)
+
+    def characters_by_class(self, character_class, save_directory="data/save_games"):
+        """All characters of one class, highest level first"""
+        return self.query("class = ?", (character_class,), save_directory)
+
+    def characters_with_gold(self, minimum_gold, save_directory="data/save_games"):
+        """All characters holding at least `minimum_gold`, richest first"""
+        return self.query("gold >= ?", (minimum_gold,), save_directory, order_by="gold DESC, name")
+
+    def import_from(self, backend, save_directory="data/save_games"):
+        """Copy every character another backend has in save_directory; returns the count"""
+        characters = [backend.load(name, save_directory) for name in backend.list_names(save_directory)]
+        return self.save_many(characters, save_directory)
+
+    def close(self):
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections.clear()
+            self.idle.clear()
+        self.shared_connection = None
+
+
+class _SqliteTransaction:
+    """Borrows a connection, commits or rolls back, then returns it"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def __enter__(self):
+        backend = self.backend
+        if backend.shared:
+            backend.lock.acquire()
+            self.connection = backend.shared_connection
+        else:
+            backend.available.acquire()
+            try:
+                with backend.lock:
+                    self.connection = backend.idle.pop() if backend.idle else None
+                if self.connection is None:
+                    self.connection = backend.open_connection()
+            except BaseException:
+                backend.available.release()
+                raise
+        return self.connection.__enter__()
+
+    def __exit__(self, *exc_info):
+        backend = self.backend
+        try:
+            return self.connection.__exit__(*exc_info)
+        finally:
+            if backend.shared:
+                backend.lock.release()
+            else:
+                with backend.lock:
+                    backend.idle.append(self.connection)
+                backend.available.release()
+
+
+class CachedBackend(StorageBackend):
+    """
+    Bounded LRU cache with write-back in front of another backend
+
+    Loaded and saved characters are kept in memory (least recently used
+    first out once `capacity` is reached), so repeat loads skip the disk.
+    A cached entry is only trusted while the inner backend's version()
+    still matches the one recorded when it was cached; backends that cannot
+    report a version are trusted until this process changes them.
+
+    With write_back, save() only updates the cache and marks the entry
+    dirty. Dirty characters are written to the inner backend when they are
+    evicted or when flush() is called; saving a character identical to its
+    clean, still current cached copy writes nothing at all. A dirty entry's
+    version is a fresh token per cache write.
+    """
+
+    def __init__(self, inner, capacity=256, write_back=True):
+        self.inner = inner
+        self.capacity = capacity
+        self.write_back = write_back
+        # {(save_directory, name): [character, version, dirty]}, oldest first
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'skipped_writes': 0, 'evictions': 0}
+
+    def save(self, character, save_directory):
+        key = (save_directory, character['name'])
+        with self.lock:
+            entry = self.entries.get(key)
+            if (entry is not None and not entry[2] and entry[0] == character
+                    and self.is_current(key, entry)):
+                self.entries.move_to_end(key)
+                self.stats['skipped_writes'] += 1
+                return True
+            entry = [copy_character(character), self.unsaved_version(), True]
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            if not self.write_back:
+                self.write_entry(key, entry)
+            self.evict()
+        return True
+
+    def save_fields(self, character, fields, save_directory):
+        """Copy just the changed fields into the cached entry"""
+        key = (save_directory, character['name'])
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or not (entry[2] or self.is_current(key, entry)):
+                return self.save(character, save_directory)
+            cached = entry[0]
+            for field in fields:
+                if field in character:
+                    value = character[field]
+                    cached[field] = value[:] if isinstance(value, list) else value
+                else:
+                    cached.pop(field, None)
+            entry[1] = self.unsaved_version()
+            entry[2] = True
+            self.entries.move_to_end(key)
+            if not self.write_back:
+                self.write_entry(key, entry)
+        return True
+
+    def load(self, character_name, save_directory):
+        return self.load_checked(character_name, save_directory)[0]
+
+    def load_checked(self, character_name, save_directory):
+        """Cache hits count as unchecked; misses report the inner backend's check"""
+        key = (save_directory, character_name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and (entry[2] or self.is_current(key, entry)):
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return copy_character(entry[0]), False
+            self.stats['misses'] += 1
+
+        # Record the version first so a save racing with this read looks stale
+        version = self.inner.version(character_name, save_directory)
+        character, checked = self.inner.load_checked(character_name, save_directory)
+        with self.lock:
+            current = self.entries.get(key)
+            if current is None or not current[2]:
+                self.entries[key] = [copy_character(character), version, False]
+                self.entries.move_to_end(key)
+                self.evict()
+        return character, checked
+
+    def list_names(self, save_directory):
+        names = self.inner.list_names(save_directory)
+        with self.lock:
+            pending = [name for (directory, name), entry in self.entries.items()
+                       if directory == save_directory and entry[2] and name not in names]
+        return names + pending
+
+    def delete(self, character_name, save_directory):
+        with self.lock:
+            entry = self.entries.pop((save_directory, character_name), None)
+        try:
+            return self.inner.delete(character_name, save_directory)
+        except CharacterNotFoundError:
+            # Never written yet: dropping it from the cache deleted it
+            if entry is not None and entry[2]:
+                return True
+            raise
+
+    def version(self, character_name, save_directory):
+        with self.lock:
+            entry = self.entries.get((save_directory, character_name))
+            if entry is not None and entry[2]:
+                return entry[1]
+        return self.inner.version(character_name, save_directory)
+
+    @staticmethod
+    def unsaved_version():
+        """Version of a dirty entry: a new token per cache write, never reused"""
+        return ("unsaved", _revision_tokens.getrandbits(62))
+
+    def is_current(self, key, entry):
+        try:
+            version = self.inner.version(key[1], key[0])
+        except CharacterNotFoundError:
+            return False
+        return version is None or version == entry[1]
+
+    def write_entry(self, key, entry):
+        """Write one dirty entry to the inner backend (caller holds the lock)"""
+        self.inner.save(entry[0], key[0])
+        entry[1] = self.inner.version(key[1], key[0])
+        entry[2] = False
+        self.stats['writes'] += 1
+
+    def evict(self):
+        while len(self.entries) > self.capacity:
+            key, entry = self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+            if entry[2]:
+                try:
+                    self.write_entry(key, entry)
+                except Exception:
+                    # Keep the only copy of the change; retry on the next flush
+                    self.entries[key] = entry
+                    self.entries.move_to_end(key, last=False)
+                    raise
+
+    def flush(self):
+        """Write every dirty character; returns how many were written"""
+        with self.lock:
+            dirty = [(key, entry) for key, entry in self.entries.items() if entry[2]]
+            for key, entry in dirty:
+                self.write_entry(key, entry)
+        self.inner.flush()
+        return len(dirty)
+
+    def close(self):
+        self.flush()
+        self.inner.close()
+
+
+def copy_character(character):
+    """Copy a character deeply enough that list fields are not shared"""
+    return {key: value[:] if isinstance(value, list) else value for key, value in character.items()}
+
+
+def create_backend(spec):
+    """
+    Build a backend from a short description, e.g. for a command line flag
+
+    "directory[:zlib|lzma]" (or "dir..."), "memory", or
+    "sqlite[:path/to/file.db][:zlib|lzma]"
+
+    Raises: ValueError for anything else
+    """
+    kind, _, argument = spec.partition(":")
+    if kind in ("directory", "dir"):
+        return DirectoryBackend(argument or None)
+    if kind == "memory" and not argument:
+        return MemoryBackend()
+    if kind == "sqlite":
+        database, _, compression = argument.rpartition(":")
+        if compression not in COMPRESSION_CODECS:
+            database, compression = argument, None
+        if database:
+            return SqliteBackend(database, compression)
+        return SqliteBackend(compression=compression)
+    raise ValueError(f"Unknown storage backend: {spec}")
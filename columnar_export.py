@@ -0,0 +1,359 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Columnar Export Module
+
+Writes the save corpus and the quest/item catalogs as column files for
+offline analysis. With numpy installed, np.load() then brings back millions
+of rows in milliseconds instead of re-running game_data's parsers and
+load_character.
+
+The catalogs are read with game_data.load_quests/load_items and the saves
+with roster_analytics.scan_characters (decode_save + parse_character in a
+process pool), so the exports always agree with what the game itself reads.
+
+Every string that repeats (quest and item IDs, classes, item types, effect
+stats) is dictionary-encoded: tables hold integer codes, and the
+dictionaries table maps each code back to its string (code = position).
+Codes are shared across tables, so characters.inventory codes join straight
+onto items.item.
+
+List fields (a character's inventory and quests, an item's effects) are
+ragged columns. Their elements are dictionary codes, except effect_values
+which holds the plain numbers:
+
+    npz - <column>_codes (or _values) holds every list concatenated and
+          <column>_offsets[row]:<column>_offsets[row + 1] slices one row's list
+    csv - a long table <table>_<column>.csv with one (row, code) or
+          (row, value) line per element
+
+A table that fails part way is removed rather than left half written.
+
+Formats:
+    npz - characters.npz, quests.npz, items.npz, dictionaries.npz; columns
+          are gathered in compact typed arrays (not Python dictionaries)
+          and written when each table is complete
+    csv - the same tables as .csv files, written row by row as the data
+          streams in (used automatically when numpy is not installed)
+
+Usage: python columnar_export.py --output exports [--data-dir data] [--format csv]
+"""
+
+import csv
+import os
+from array import array
+import game_data
+from inventory_system import parse_effect_string
+from roster_analytics import scan_characters
+
+CHARACTER_COLUMNS = (
+    ("name", "str"), ("class", "int"), ("level", "int"), ("health", "int"),
+    ("max_health", "int"), ("strength", "int"), ("magic", "int"),
+    ("experience", "int"), ("gold", "int"),
+)
+# (list column, element): "code" elements are dictionary codes, "value" plain numbers
+CHARACTER_LISTS = (("inventory", "code"), ("active_quests", "code"), ("completed_quests", "code"))
+
+QUEST_COLUMNS = (
+    ("quest", "int"), ("title", "str"), ("description", "str"), ("reward_xp", "int"),
+    ("reward_gold", "int"), ("required_level", "int"), ("prerequisite", "int"),
+)
+
+ITEM_COLUMNS = (
+    ("item", "int"), ("name", "str"), ("type", "int"), ("cost", "int"), ("description", "str"),
+)
+ITEM_LISTS = (("effect_stats", "code"), ("effect_values", "value"))
+
+# prerequisite code of a quest without one
+NO_PREREQUISITE = -1
+
+# ============================================================================
+# DICTIONARY ENCODING
+# ============================================================================
+
+class Dictionary:
+    """Gives each distinct string a dense integer code, in first-seen order"""
+
+    def __init__(self, values=()):
+        self.codes = {}
+        self.values = []
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+# ============================================================================
+# TABLE WRITERS
+# ============================================================================
+
+class TableWriter:
+    """
+    Base for the table writers: used as a context manager, a table left by
+    an exception is closed and its files removed
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        return False
+
+    def abort(self):
+        """Close without finishing and remove the table's files"""
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class CsvTableWriter(TableWriter):
+    """Streams one table to <name>.csv plus a long <name>_<list>.csv per list column"""
+
+    def __init__(self, directory, name, columns, list_columns=()):
+        self.handles = []
+        self.paths = []
+        self.rows = 0
+        try:
+            self.main = self.open(directory, f"{name}.csv", [column for column, _ in columns])
+            self.lists = {column: self.open(directory, f"{name}_{column}.csv", ["row", element])
+                          for column, element in list_columns}
+        except BaseException:
+            self.abort()
+            raise
+
+    def open(self, directory, filename, header):
+        path = os.path.join(directory, filename)
+        handle = open(path, "w", newline="", encoding="utf-8")
+        self.handles.append(handle)
+        self.paths.append(path)
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        return writer
+
+    def add(self, values, lists=None):
+        self.main.writerow(values)
+        for column, codes in (lists or {}).items():
+            self.lists[column].writerows((self.rows, code) for code in codes)
+        self.rows += 1
+
+    def close(self):
+        for handle in self.handles:
+            handle.close()
+        return self.paths
+
+    def abort(self):
+        for handle in self.handles:
+            handle.close()
+        super().abort()
+
+
+class NpzTableWriter(TableWriter):
+    """Gathers one table in typed arrays and writes it as <name>.npz on close"""
+
+    def __init__(self, directory, name, columns, list_columns=(), numpy=None):
+        self.numpy = numpy
+        self.path = os.path.join(directory, f"{name}.npz")
+        self.paths = [self.path]
+        self.rows = 0
+        self.columns = [(column, array("q") if kind == "int" else []) for column, kind in columns]
+        # {list column: (element, elements, offsets)}
+        self.lists = {column: (element, array("q"), array("q", [0])) for column, element in list_columns}
+
+    def add(self, values, lists=None):
+        for (_, data), value in zip(self.columns, values):
+            data.append(value)
+        for column, codes in (lists or {}).items():
+            _, flat, offsets = self.lists[column]
+            flat.extend(codes)
+            offsets.append(len(flat))
+        self.rows += 1
+
+    def close(self):
+        np = self.numpy
+        arrays = {}
+        for column, data in self.columns:
+            arrays[column] = np.frombuffer(data, dtype=np.int64) if isinstance(data, array) else np.array(data, dtype=str)
+        for column, (element, flat, offsets) in self.lists.items():
+            arrays[f"{column}_{element}s"] = np.frombuffer(flat, dtype=np.int64)
+            arrays[f"{column}_offsets"] = np.frombuffer(offsets, dtype=np.int64)
+        np.savez(self.path, **arrays)
+        return [self.path]
+
+
+def load_numpy():
+    """Return the numpy module, or None if it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def choose_format(export_format="auto"):
+    """
+    Resolve "auto" to "npz" (numpy installed) or "csv"
+
+    Raises: ValueError for an unknown format, ImportError for npz without numpy
+    """
+    if export_format not in ("auto", "npz", "csv"):
+        raise ValueError(f"Unknown export format: {export_format}")
+    if export_format == "csv":
+        return "csv"
+    if load_numpy() is None:
+        if export_format == "npz":
+            raise ImportError("numpy is required for the npz export format")
+        return "csv"
+    return "npz"
+
+# ============================================================================
+# EXPORTERS
+# ============================================================================
+
+class ColumnarExporter:
+    """
+    Writes tables in one format with dictionaries shared between them
+
+    open_table() returns a writer with add(values, lists) and close(), to be
+    used in a with block; close() writes the dictionaries and returns every
+    file written.
+    """
+
+    def __init__(self, output_dir, export_format="auto"):
+        self.output_dir = output_dir
+        self.format = choose_format(export_format)
+        self.numpy = load_numpy() if self.format == "npz" else None
+        os.makedirs(output_dir, exist_ok=True)
+        self.dictionaries = {
+            'quests': Dictionary(),
+            'items': Dictionary(),
+            'classes': Dictionary(),
+            'item_types': Dictionary(),
+            'effect_stats': Dictionary(),
+        }
+        self.files = []
+
+    def open_table(self, name, columns, list_columns=()):
+        if self.format == "npz":
+            return NpzTableWriter(self.output_dir, name, columns, list_columns, self.numpy)
+        return CsvTableWriter(self.output_dir, name, columns, list_columns)
+
+    def close_table(self, table):
+        self.files.extend(table.close())
+        return table.rows
+
+    def export_quests(self, quests):
+        """Write the quests table from a load_quests() dictionary; returns the row count"""
+        codes = self.dictionaries['quests']
+        with self.open_table("quests", QUEST_COLUMNS) as table:
+            for quest_id, quest in quests.items():
+                prerequisite = quest.get('prerequisite', "NONE")
+                table.add((
+                    codes.encode(quest_id), quest.get('title', ""), quest.get('description', ""),
+                    quest.get('reward_xp', 0), quest.get('reward_gold', 0), quest.get('required_level', 1),
+                    NO_PREREQUISITE if prerequisite == "NONE" else codes.encode(prerequisite),
+                ))
+            return self.close_table(table)
+
+    def export_items(self, items):
+        """Write the items table from a load_items() dictionary; returns the row count"""
+        codes = self.dictionaries['items']
+        types = self.dictionaries['item_types']
+        stats = self.dictionaries['effect_stats']
+        with self.open_table("items", ITEM_COLUMNS, ITEM_LISTS) as table:
+            for item_id, item in items.items():
+                effects = parse_effect_string(item.get('effect', ""))
+                table.add(
+                    (codes.encode(item_id), item.get('name', ""), types.encode(item.get('type', "")),
+                     item.get('cost', 0), item.get('description', "")),
+                    {'effect_stats': [stats.encode(stat) for stat in effects],
+                     'effect_values': list(effects.values())}
+                )
+            return self.close_table(table)
+
+    def export_characters(self, characters):
+        """Write the characters table from any iterable of characters; returns the row count"""
+        quests = self.dictionaries['quests']
+        items = self.dictionaries['items']
+        classes = self.dictionaries['classes']
+        with self.open_table("characters", CHARACTER_COLUMNS, CHARACTER_LISTS) as table:
+            for character in characters:
+                table.add(
+                    (character['name'], classes.encode(character.get('class', "")),
+                     *(character.get(column, 0) for column, _ in CHARACTER_COLUMNS[2:])),
+                    {'inventory': [items.encode(item_id) for item_id in character.get('inventory', [])],
+                     'active_quests': [quests.encode(quest_id) for quest_id in character.get('active_quests', [])],
+                     'completed_quests': [quests.encode(quest_id)
+                                          for quest_id in character.get('completed_quests', [])]}
+                )
+            return self.close_table(table)
+
+    def close(self):
+        """Write the dictionaries; returns every file this exporter wrote"""
+        if self.format == "npz":
+            path = os.path.join(self.output_dir, "dictionaries.npz")
+            self.numpy.savez(path, **{name: self.numpy.array(dictionary.values, dtype=str)
+                                      for name, dictionary in self.dictionaries.items()})
+            self.files.append(path)
+        else:
+            for name, dictionary in self.dictionaries.items():
+                with CsvTableWriter(self.output_dir, f"dictionary_{name}",
+                                    (("code", "int"), ("value", "str"))) as table:
+                    for code, value in enumerate(dictionary.values):
+                        table.add((code, value))
+                    self.files.extend(table.close())
+        return self.files
+
+
+def export_all(output_dir, data_dir="data", save_directory=None, export_format="auto", workers=None):
+    """
+    Export the quest and item catalogs of data_dir and every save in
+    save_directory (default: data_dir/save_games)
+
+    Catalogs go first, so catalog IDs get codes in catalog order.
+
+    Returns: {'format', 'quests', 'items', 'characters' (row counts), 'files'}
+    """
+    if save_directory is None:
+        save_directory = os.path.join(data_dir, "save_games")
+
+    exporter = ColumnarExporter(output_dir, export_format)
+    summary = {'format': exporter.format}
+    summary['quests'] = exporter.export_quests(game_data.load_quests(os.path.join(data_dir, "quests.txt")))
+    summary['items'] = exporter.export_items(game_data.load_items(os.path.join(data_dir, "items.txt")))
+    summary['characters'] = exporter.export_characters(scan_characters(save_directory, workers))
+    summary['files'] = exporter.close()
+    return summary
+
+
+def cli(argv=None):
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export Quest Chronicles data to columnar files")
+    parser.add_argument("--output", required=True, help="directory to write the exported tables to")
+    parser.add_argument("--data-dir", default="data", help="directory holding quests.txt and items.txt")
+    parser.add_argument("--save-dir", help="save files to export (default: DATA_DIR/save_games)")
+    parser.add_argument("--format", choices=["auto", "npz", "csv"], default="auto",
+                        help="npz needs numpy; auto picks npz when numpy is installed, else csv")
+    parser.add_argument("--workers", type=int, help="save parser processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    summary = export_all(args.output, args.data_dir, args.save_dir, args.format, args.workers)
+    print(f"Exported {summary['quests']} quests, {summary['items']} items and "
+          f"{summary['characters']} characters as {summary['format']}:")
+    for path in summary['files']:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    cli()
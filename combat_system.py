@@ -17,6 +17,15 @@ from custom_exceptions import (
     CharacterDeadError,
     AbilityOnCooldownError
 )
+import game_io
+from battle_log import (
+    ACTOR_PLAYER,
+    ACTOR_ENEMY,
+    ACTION_ATTACK,
+    ACTION_ABILITY,
+    ACTION_ESCAPE,
+    ACTION_ESCAPE_FAILED
+)
 
 # ============================================================================
 # ENEMY DEFINITIONS
@@ -103,8 +112,12 @@ class SimpleBattle:
     Manages combat between character and enemy
     """
     
-    def __init__(self, character, enemy):
-        """Initialize battle with character and enemy"""
+    def __init__(self, character, enemy, event_log=None):
+        """
+        Initialize battle with character and enemy
+
+        event_log: optional battle_log.BattleEventLog that records every turn
+        """
         # TODO: Implement initialization
         # Store character and enemy
         # Set combat_active flag
@@ -113,6 +126,8 @@ class SimpleBattle:
         self.enemy = enemy
         self.combat_active = True
         self.turn_counter = 0
+        self.cooldowns = CooldownScheduler()
+        self.event_log = event_log
     
     def start_battle(self):
         """
@@ -130,6 +145,7 @@ class SimpleBattle:
         if self.character['health'] <= 0:
             raise CharacterDeadError("Character is dead and cannot fight.")
         while self.combat_active:
+            self.turn_counter += 1
             display_combat_stats(self.character, self.enemy)
 
             # Player chooses an action
@@ -168,26 +184,42 @@ class SimpleBattle:
         # Execute chosen action
         if self.combat_active == False:
             raise CombatNotActiveError("Cannot take turn, combat is not active.")
-        print("\nYour turn! Choose an action:")
-        print("1. Basic Attack")
-        print("2. Special Ability")
-        print("3. Try to Run")
-        choice = input("Enter the number of your choice: ")
+        game_io.write("\nYour turn! Choose an action:")
+        game_io.write("1. Basic Attack")
+        wait = self.cooldowns.turns_remaining(self.character['name'], self.turn_counter)
+        if wait:
+            game_io.write(f"2. Special Ability (ready in {wait} turn(s))")
+        else:
+            game_io.write("2. Special Ability")
+        game_io.write("3. Try to Run")
+        choice = game_io.read("Enter the number of your choice: ")
         if choice == '1':
             damage = self.calculate_damage(self.character, self.enemy)
             self.apply_damage(self.enemy, damage)
+            if self.event_log is not None:
+                self.event_log.record(self.turn_counter, ACTOR_PLAYER, ACTION_ATTACK, damage, self.enemy['health'])
             display_battle_log(f"You attack the {self.enemy['name']} for {damage} damage!")
         elif choice == '2':
-            result = use_special_ability(self.character, self.enemy)
-            display_battle_log(result)
+            enemy_health = self.enemy['health']
+            try:
+                result = use_special_ability(self.character, self.enemy, self.cooldowns, self.turn_counter)
+                if self.event_log is not None:
+                    self.event_log.record(self.turn_counter, ACTOR_PLAYER, ACTION_ABILITY,
+                                          enemy_health - self.enemy['health'], self.enemy['health'])
+                display_battle_log(result)
+            except AbilityOnCooldownError as e:
+                display_battle_log(str(e))
         elif choice == '3':
             escaped = self.attempt_escape()
+            if self.event_log is not None:
+                action = ACTION_ESCAPE if escaped else ACTION_ESCAPE_FAILED
+                self.event_log.record(self.turn_counter, ACTOR_PLAYER, action, 0, self.character['health'])
             if escaped:
                 display_battle_log("You successfully escaped the battle!")
             else:
                 display_battle_log("Escape failed! The battle continues.")
         else:
-            print("Invalid choice. Please select a valid action.")
+            game_io.write("Invalid choice. Please select a valid action.")
     
     def enemy_turn(self):
         """
@@ -205,6 +237,8 @@ class SimpleBattle:
             raise CombatNotActiveError("Cannot take turn, combat is not active.")
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
+        if self.event_log is not None:
+            self.event_log.record(self.turn_counter, ACTOR_ENEMY, ACTION_ATTACK, damage, self.character['health'])
         display_battle_log(f"The {self.enemy['name']} attacks you for {damage} damage!")
 
     
@@ -218,8 +252,7 @@ class SimpleBattle:
         Returns: Integer damage amount
         """
         # TODO: Implement damage calculation
-        base_damage = attacker['strength'] - (defender['strength'] // 4)
-        return max(base_damage, 1) 
+        return calculate_damage(attacker, defender)
     
     def apply_damage(self, target, damage):
         """
@@ -266,7 +299,55 @@ class SimpleBattle:
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+class Ability:
+    """
+    A class special ability
+
+    effect is called as effect(character, enemy); cooldown is how many of
+    the following turns the ability stays unavailable after use.
+    """
+
+    def __init__(self, name, message, cooldown, effect):
+        self.name = name
+        self.message = message
+        self.cooldown = cooldown
+        self.effect = effect
+
+    def use(self, character, enemy):
+        """Apply the ability and return the battle log message"""
+        self.effect(character, enemy)
+        return self.message.format(name=character['name'])
+
+
+class CooldownScheduler:
+    """
+    Per-battle cooldown tracking keyed by turn number
+
+    Stores the first turn each user may act again, so checking and
+    triggering a cooldown are single dictionary operations.
+    """
+
+    def __init__(self):
+        self.ready_turn = {}
+
+    def turns_remaining(self, user, turn):
+        """Return how many turns until user's ability is ready (0 if ready)"""
+        return max(self.ready_turn.get(user, 0) - turn, 0)
+
+    def is_ready(self, user, turn):
+        """Return True if user's ability can be used on this turn"""
+        return turn >= self.ready_turn.get(user, 0)
+
+    def trigger(self, user, turn, cooldown):
+        """Start a cooldown for user after using an ability on this turn"""
+        self.ready_turn[user] = turn + cooldown + 1
+
+    def reset(self):
+        """Clear all cooldowns"""
+        self.ready_turn.clear()
+
+
+def use_special_ability(character, enemy, cooldowns=None, turn=0):
     """
     Use character's class-specific special ability
     
@@ -275,30 +356,26 @@ def use_special_ability(character, enemy):
     - Mage: Fireball (2x magic damage)
     - Rogue: Critical Strike (3x strength damage, 50% chance)
     - Cleric: Heal (restore 30 health)
+
+    Abilities are looked up in CLASS_ABILITIES. When a CooldownScheduler
+    is passed, the ability is checked and put on cooldown for this turn.
     
     Returns: String describing what happened
     Raises: AbilityOnCooldownError if ability was used recently
     """
-    # TODO: Implement special abilities
-    # Check character class
-    # Execute appropriate ability
-    # Track cooldowns (optional advanced feature)
-    char_class = character.get('class')
-    if char_class == "Warrior":
-        warrior_power_strike(character, enemy)
-        return f"{character['name']} uses Power Strike!"
-    elif char_class == "Mage":
-        mage_fireball(character, enemy)
-        return f"{character['name']} casts Fireball!"
-    elif char_class == "Rogue":
-        rogue_critical_strike(character, enemy)
-        return f"{character['name']} attempts a Critical Strike!"
-    elif char_class == "Cleric":
-        cleric_heal(character)
-        return f"{character['name']} casts Heal!"
-    else:
+    ability = CLASS_ABILITIES.get(character.get('class'))
+    if ability is None:
         return "No special ability available."
 
+    if cooldowns is not None:
+        user = character['name']
+        if not cooldowns.is_ready(user, turn):
+            wait = cooldowns.turns_remaining(user, turn)
+            raise AbilityOnCooldownError(f"{ability.name} is on cooldown for {wait} more turn(s).")
+        cooldowns.trigger(user, turn, ability.cooldown)
+
+    return ability.use(character, enemy)
+
 def warrior_power_strike(character, enemy):
     """Warrior special ability"""
     # TODO: Implement power strike
@@ -344,6 +421,14 @@ def cleric_heal(character):
         character['health'] += heal_amount
     return heal_amount
 
+# Dispatch table of class abilities: class name -> Ability
+CLASS_ABILITIES = {
+    "Warrior": Ability("Power Strike", "{name} uses Power Strike!", 2, warrior_power_strike),
+    "Mage": Ability("Fireball", "{name} casts Fireball!", 2, mage_fireball),
+    "Rogue": Ability("Critical Strike", "{name} attempts a Critical Strike!", 1, rogue_critical_strike),
+    "Cleric": Ability("Heal", "{name} casts Heal!", 3, lambda character, enemy: cleric_heal(character)),
+}
+
 # ============================================================================
 # COMBAT UTILITIES
 # ============================================================================
@@ -369,6 +454,59 @@ def get_victory_rewards(enemy):
         'gold': enemy['gold_reward']
     }
 
+def calculate_damage(attacker, defender):
+    """
+    Basic attack damage shared by SimpleBattle and the prediction helpers
+
+    Damage formula: attacker['strength'] - (defender['strength'] // 4)
+    Minimum damage: 1
+    """
+    base_damage = attacker['strength'] - (defender['strength'] // 4)
+    return max(base_damage, 1)
+
+def predict_outcome(character, enemy):
+    """
+    Predict a basic-attack-only fight without simulating it
+
+    The player always strikes first and both sides deal a fixed amount of
+    damage every turn, so the number of hits each side needs is just a
+    ceiling division of health by damage.
+
+    Returns: Dictionary with:
+            {'winner': 'player'|'enemy', 'turns': int,
+             'character_health': int, 'enemy_health': int}
+            where turns counts player+enemy exchanges (the last one may be
+            cut short when the enemy dies)
+    Raises: CharacterDeadError if character is already dead
+    """
+    if character['health'] <= 0:
+        raise CharacterDeadError("Character is dead and cannot fight.")
+
+    player_damage = calculate_damage(character, enemy)
+    enemy_damage = calculate_damage(enemy, character)
+
+    # Hits needed = ceil(health / damage), written with integer math
+    hits_to_kill_enemy = -(-enemy['health'] // player_damage)
+    hits_to_kill_player = -(-character['health'] // enemy_damage)
+
+    # Player attacks first, so a tie goes to the player
+    if enemy['health'] <= 0 or hits_to_kill_enemy <= hits_to_kill_player:
+        turns = max(hits_to_kill_enemy, 0)
+        return {
+            'winner': 'player',
+            'turns': turns,
+            'character_health': character['health'] - max(turns - 1, 0) * enemy_damage,
+            'enemy_health': 0
+        }
+
+    turns = hits_to_kill_player
+    return {
+        'winner': 'enemy',
+        'turns': turns,
+        'character_health': 0,
+        'enemy_health': enemy['health'] - turns * player_damage
+    }
+
 def display_combat_stats(character, enemy):
     """
     Display current combat status
@@ -376,8 +514,8 @@ def display_combat_stats(character, enemy):
     Shows both character and enemy health/stats
     """
     # TODO: Implement status display
-    print(f"\n{character['name']}: HP={character['health']}/{character['max_health']}")
-    print(f"{enemy['name']}: HP={enemy['health']}/{enemy['max_health']}")
+    game_io.write(f"\n{character['name']}: HP={character['health']}/{character['max_health']}")
+    game_io.write(f"{enemy['name']}: HP={enemy['health']}/{enemy['max_health']}")
     pass
 
 def display_battle_log(message):
@@ -385,7 +523,7 @@ def display_battle_log(message):
     Display a formatted battle message
     """
     # TODO: Implement battle log display
-    print(f">>> {message}")
+    game_io.write(f">>> {message}")
     pass
 
 # ============================================================================
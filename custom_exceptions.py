@@ -133,3 +133,7 @@ class QuestNotAcceptedError(QuestError):
     """Raised when trying to abandon or complete a quest that is not active"""
     pass
 
+# Session Exceptions
+class SessionClosedError(GameError):
+    """Raised when a session's input ends (player disconnected or script finished)"""
+    pass
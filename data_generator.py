@@ -0,0 +1,274 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Data Generator Module
+
+Builds large, realistic game data for benchmarks and load tests:
+
+    quests.txt  - N quests in the block format game_data.load_quests reads,
+                  with prerequisite chains that always point to an earlier
+                  quest of equal or lower level
+    items.txt   - N items of every type, in the format load_items reads
+    save_games/ - M characters written with character_manager.save_character,
+                  whose completed and active quests respect the chains
+
+Everything is derived from one seed, so the same arguments always produce
+the same files.
+
+Usage: python data_generator.py --quests 10000 --items 5000 --saves 1000 --data-dir big_data
+"""
+
+import os
+import random
+import character_manager
+from inventory_system import MAX_INVENTORY_SIZE
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+MAX_LEVEL = 50
+
+# Chance that a new quest starts a fresh chain instead of following one
+CHAIN_START_CHANCE = 0.2
+
+QUEST_VERBS = ["Defeat", "Rescue", "Escort", "Recover", "Explore", "Defend", "Hunt", "Deliver"]
+QUEST_TARGETS = ["Goblins", "the Merchant", "the Lost Relic", "the Old Mine", "the Village",
+                 "the Orc Warband", "the Dragon's Hoard", "the Sunken Temple"]
+
+ITEM_KINDS = [
+    ("consumable", "health", ["Potion", "Elixir", "Tonic"]),
+    ("weapon", "strength", ["Sword", "Axe", "Staff", "Dagger"]),
+    ("armor", "max_health", ["Shield", "Helm", "Plate", "Cloak"]),
+]
+ITEM_MATERIALS = ["Wooden", "Iron", "Steel", "Silver", "Mithril", "Dragonbone"]
+
+NAME_SYLLABLES = ["ar", "bel", "cor", "dra", "el", "fen", "gor", "hal", "is", "jor",
+                  "kal", "lor", "mir", "nor", "or", "pel", "quin", "ros", "sil", "tor"]
+
+# ============================================================================
+# CATALOG GENERATION
+# ============================================================================
+
+def generate_quests(count, seed=0):
+    """
+    Generate `count` quests with valid prerequisite chains
+
+    Returns: {quest_id: quest_dict} shaped like game_data.load_quests output
+    """
+    rng = random.Random(seed)
+    quests = {}
+    quest_ids = []
+
+    for i in range(count):
+        quest_id = f"quest_{i}"
+        if not quest_ids or rng.random() < CHAIN_START_CHANCE:
+            prerequisite = "NONE"
+            required_level = rng.randint(1, 5)
+        else:
+            prerequisite = rng.choice(quest_ids)
+            required_level = min(quests[prerequisite]['required_level'] + rng.randint(0, 2), MAX_LEVEL)
+
+        title = f"{rng.choice(QUEST_VERBS)} {rng.choice(QUEST_TARGETS)}"
+        quests[quest_id] = {
+            'quest_id': quest_id,
+            'title': f"{title} {i}",
+            'description': f"{title} to earn the gratitude of the realm.",
+            'reward_xp': required_level * rng.randint(20, 60),
+            'reward_gold': required_level * rng.randint(10, 40),
+            'required_level': required_level,
+            'prerequisite': prerequisite
+        }
+        quest_ids.append(quest_id)
+
+    return quests
+
+
+def generate_items(count, seed=0):
+    """
+    Generate `count` items, cycling through consumables, weapons and armor
+
+    Returns: {item_id: item_dict} shaped like game_data.load_items output
+    """
+    rng = random.Random(seed)
+    items = {}
+
+    for i in range(count):
+        item_type, stat, nouns = ITEM_KINDS[i % len(ITEM_KINDS)]
+        tier = rng.randint(1, len(ITEM_MATERIALS))
+        name = f"{ITEM_MATERIALS[tier - 1]} {rng.choice(nouns)}"
+        power = tier * rng.randint(3, 10)
+        item_id = f"item_{i}"
+        items[item_id] = {
+            'item_id': item_id,
+            'name': name,
+            'type': item_type,
+            'effect': f"{stat}:{power}",
+            'cost': power * rng.randint(5, 15),
+            'description': f"A {name.lower()} that improves {stat.replace('_', ' ')} by {power}"
+        }
+
+    return items
+
+
+def format_quest_block(quest):
+    """Return one quest as a quests.txt block"""
+    return (
+        f"QUEST_ID: {quest['quest_id']}\n"
+        f"TITLE: {quest['title']}\n"
+        f"DESCRIPTION: {quest['description']}\n"
+        f"REWARD_XP: {quest['reward_xp']}\n"
+        f"REWARD_GOLD: {quest['reward_gold']}\n"
+        f"REQUIRED_LEVEL: {quest['required_level']}\n"
+        f"PREREQUISITE: {quest['prerequisite']}\n"
+    )
+
+
+def format_item_block(item):
+    """Return one item as an items.txt block"""
+    return (
+        f"ITEM_ID: {item['item_id']}\n"
+        f"NAME: {item['name']}\n"
+        f"TYPE: {item['type']}\n"
+        f"EFFECT: {item['effect']}\n"
+        f"COST: {item['cost']}\n"
+        f"DESCRIPTION: {item['description']}\n"
+    )
+
+
+def write_blocks(blocks, filename):
+    """Write blocks separated by blank lines, streaming them to disk"""
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filename, "w") as f:
+        for i, block in enumerate(blocks):
+            if i:
+                f.write("\n")
+            f.write(block)
+    return True
+
+
+def write_quests_file(quests, filename="data/quests.txt"):
+    return write_blocks((format_quest_block(q) for q in quests.values()), filename)
+
+
+def write_items_file(items, filename="data/items.txt"):
+    return write_blocks((format_item_block(i) for i in items.values()), filename)
+
+# ============================================================================
+# CHARACTER GENERATION
+# ============================================================================
+
+def generate_name(rng, index):
+    """Return a unique, letters-only character name"""
+    name = "".join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+    # Encode the index in letters so names stay unique and never parse as numbers
+    suffix = ""
+    index += 1
+    while index:
+        index, digit = divmod(index - 1, 26)
+        suffix = chr(ord("a") + digit) + suffix
+    return f"{name}{suffix.capitalize()}"
+
+
+def generate_characters(count, quests, items, seed=0):
+    """
+    Yield `count` characters with histories consistent with the catalogs
+
+    Completed quests are only ever taken once their prerequisite is done and
+    the character's level allows it; active quests are ones still available.
+    """
+    rng = random.Random(seed)
+    quest_list = list(quests.values())
+    item_ids = list(items)
+
+    for index in range(count):
+        character = character_manager.create_character(generate_name(rng, index), rng.choice(CLASSES))
+        level = rng.randint(1, MAX_LEVEL)
+        character['level'] = level
+        character['max_health'] += (level - 1) * 10
+        character['strength'] += (level - 1) * 2
+        character['magic'] += (level - 1) * 2
+        character['health'] = rng.randint(1, character['max_health'])
+        character['experience'] = rng.randint(0, level * 100 - 1)
+        character['gold'] = rng.randint(0, level * 500)
+
+        if item_ids:
+            character['inventory'] = [rng.choice(item_ids) for _ in range(rng.randint(0, MAX_INVENTORY_SIZE))]
+
+        # Quests are in prerequisite order, so one pass keeps every chain valid
+        completed = set()
+        completion_rate = rng.random()
+        for quest in quest_list:
+            prerequisite_done = quest['prerequisite'] == "NONE" or quest['prerequisite'] in completed
+            if quest['required_level'] > level or not prerequisite_done:
+                continue
+            if rng.random() < completion_rate:
+                completed.add(quest['quest_id'])
+                character['completed_quests'].append(quest['quest_id'])
+            elif len(character['active_quests']) < 5 and rng.random() < 0.1:
+                character['active_quests'].append(quest['quest_id'])
+
+        yield character
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+
+def generate_corpus(data_dir="data", quests=100, items=100, saves=0, seed=0):
+    """
+    Write quests.txt, items.txt and `saves` save files under data_dir
+
+    Returns: {'quests_file', 'items_file', 'save_directory', 'quests', 'items', 'saves'}
+    """
+    quest_data = generate_quests(quests, seed)
+    item_data = generate_items(items, seed + 1)
+
+    quests_file = os.path.join(data_dir, "quests.txt")
+    items_file = os.path.join(data_dir, "items.txt")
+    save_directory = os.path.join(data_dir, "save_games")
+    write_quests_file(quest_data, quests_file)
+    write_items_file(item_data, items_file)
+
+    written = 0
+    for character in generate_characters(saves, quest_data, item_data, seed + 2):
+        if character_manager.save_character(character, save_directory):
+            written += 1
+
+    return {
+        'quests_file': quests_file,
+        'items_file': items_file,
+        'save_directory': save_directory,
+        'quests': len(quest_data),
+        'items': len(item_data),
+        'saves': written
+    }
+
+
+def cli(argv=None):
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate large Quest Chronicles data sets")
+    parser.add_argument("--quests", type=int, default=1000, help="number of quests to generate")
+    parser.add_argument("--items", type=int, default=1000, help="number of items to generate")
+    parser.add_argument("--saves", type=int, default=0, help="number of save files to generate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (same seed, same files)")
+    parser.add_argument("--data-dir", default="data", help="where to write quests.txt, items.txt and save_games/")
+    parser.add_argument("--force", action="store_true", help="overwrite existing quests.txt/items.txt")
+    args = parser.parse_args(argv)
+
+    for filename in ("quests.txt", "items.txt"):
+        path = os.path.join(args.data_dir, filename)
+        if os.path.exists(path) and not args.force:
+            parser.error(f"{path} already exists (use --force to overwrite it)")
+
+    summary = generate_corpus(args.data_dir, args.quests, args.items, args.saves, args.seed)
+    print(f"Wrote {summary['quests']} quests to {summary['quests_file']}")
+    print(f"Wrote {summary['items']} items to {summary['items_file']}")
+    print(f"Wrote {summary['saves']} saves to {summary['save_directory']}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,270 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game I/O Module
+
+All game text goes through write() and all player input through read(), so
+the same menus can talk to the console, a socket, a scripted transcript or
+nothing at all.
+
+A GameIO pairs an output sink with an input source. Sinks buffer text and
+only flush when their buffer fills, when input is requested (so the prompt
+is visible) or when flush() is called, instead of one write per line.
+
+The active GameIO is stored in a context variable: each thread and each
+asyncio task can bind its own, and anything unbound uses the console.
+"""
+
+import atexit
+import contextvars
+import sys
+import time
+from custom_exceptions import SessionClosedError
+
+DEFAULT_BUFFER_SIZE = 8192
+
+# ============================================================================
+# OUTPUT SINKS
+# ============================================================================
+
+class OutputSink:
+    """Base class for places game text can go"""
+
+    def write(self, text):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class BufferedSink(OutputSink):
+    """
+    Sink that collects text and hands it to emit() in large chunks
+
+    Subclasses implement emit(text) to actually deliver the data.
+    """
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            text = "".join(self.buffer)
+            self.buffer.clear()
+            self.buffered = 0
+            self.emit(text)
+
+    def emit(self, text):
+        raise NotImplementedError
+
+
+class StreamSink(BufferedSink):
+    """Buffered sink for a text stream such as sys.stdout or an open file"""
+
+    def __init__(self, stream=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self.stream = stream
+
+    def emit(self, text):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        stream.flush()
+
+
+class CallbackSink(BufferedSink):
+    """Buffered sink that passes encoded chunks to send(data), e.g. a socket"""
+
+    def __init__(self, send, encoding="utf-8", buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self.send = send
+        self.encoding = encoding
+
+    def emit(self, text):
+        self.send(text.encode(self.encoding))
+
+
+class CaptureSink(OutputSink):
+    """Sink that keeps everything in memory (for tests and scripted runs)"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+class NullSink(OutputSink):
+    """Sink that throws all output away (for benchmarks)"""
+
+    def write(self, text):
+        pass
+
+# ============================================================================
+# INPUT SOURCES
+# ============================================================================
+
+class InputSource:
+    """
+    Base class for where player answers come from
+
+    read_line() returns one line without its newline and raises
+    SessionClosedError when no more input will ever arrive.
+    """
+
+    def read_line(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class StdinSource(InputSource):
+    """Read answers from the keyboard"""
+
+    def read_line(self):
+        try:
+            return input()
+        except EOFError:
+            raise SessionClosedError("Standard input closed.")
+
+
+class ScriptSource(InputSource):
+    """Play back answers from a list of lines or a transcript file"""
+
+    def __init__(self, lines):
+        self.lines = iter(lines)
+
+    @classmethod
+    def from_file(cls, filename):
+        with open(filename, "r") as f:
+            return cls(f.read().splitlines())
+
+    def read_line(self):
+        try:
+            return next(self.lines).rstrip("\r\n")
+        except StopIteration:
+            raise SessionClosedError("Input script ended.")
+
+
+class QueueSource(InputSource):
+    """Block on a queue fed by another thread (e.g. a connection handler)"""
+
+    def __init__(self):
+        # Only the server needs queue (and the threading it pulls in)
+        import queue
+        self.lines = queue.Queue()
+        self.closed = False
+
+    def feed(self, line):
+        self.lines.put(line)
+
+    def read_line(self):
+        if self.closed and self.lines.empty():
+            raise SessionClosedError("Player disconnected.")
+        line = self.lines.get()
+        if line is None:
+            raise SessionClosedError("Player disconnected.")
+        return line
+
+    def close(self):
+        self.closed = True
+        self.lines.put(None)
+
+# ============================================================================
+# GAME I/O
+# ============================================================================
+
+class GameIO:
+    """An output sink and input source used together by one session"""
+
+    def __init__(self, sink, source):
+        self.sink = sink
+        self.source = source
+
+    def write(self, text):
+        self.sink.write(text)
+
+    def read(self, prompt=""):
+        if prompt:
+            self.sink.write(prompt)
+        # Make sure the player can see the question before we wait for them
+        self.sink.flush()
+        return self.source.read_line()
+
+    def flush(self):
+        self.sink.flush()
+
+    def close(self):
+        self.sink.close()
+        self.source.close()
+
+
+class TimedIO(GameIO):
+    """
+    GameIO that measures how long the game takes to handle each answer
+
+    The clock for an answer starts when read() returns it and stops when
+    the game asks for the next one. timings holds (prompt, answer, seconds).
+    """
+
+    def __init__(self, sink, source):
+        super().__init__(sink, source)
+        self.timings = []
+        self.pending = None
+        self.started = 0.0
+
+    def read(self, prompt=""):
+        self.finish()
+        line = super().read(prompt)
+        self.pending = (prompt.strip(), line)
+        self.started = time.perf_counter()
+        return line
+
+    def finish(self):
+        """Close the timing of the last answer (call when the game ends)"""
+        if self.pending is not None:
+            self.timings.append((self.pending[0], self.pending[1], time.perf_counter() - self.started))
+            self.pending = None
+
+
+CONSOLE = GameIO(StreamSink(), StdinSource())
+atexit.register(CONSOLE.flush)
+
+_current_io = contextvars.ContextVar("game_io", default=CONSOLE)
+
+def get_io():
+    """Return the GameIO for the current thread or task"""
+    return _current_io.get()
+
+def bind_io(io):
+    """Use `io` for the rest of the current thread or task"""
+    _current_io.set(io)
+
+# ============================================================================
+# GAME-FACING FUNCTIONS
+# ============================================================================
+
+def write(*values, sep=" ", end="\n"):
+    """Drop-in replacement for print() that goes to the current GameIO"""
+    get_io().write(sep.join(str(value) for value in values) + end)
+
+def read(prompt=""):
+    """Drop-in replacement for input() that reads from the current GameIO"""
+    return get_io().read(prompt)
+
+def flush():
+    """Push any buffered output of the current GameIO out now"""
+    get_io().flush()
@@ -0,0 +1,162 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Server Module
+
+Hosts many players in one process over a plain TCP line protocol: the
+server sends game text as-is and every line the client sends answers the
+next prompt. Try it with: nc localhost 8763
+
+asyncio handles all sockets. Each connected player gets a GameSession and
+a worker thread that runs the normal main.py menus with that session; the
+thread's game_io is bound to the player and it sleeps on a queue while the
+player is idle. One read-only GameCatalog is loaded once and shared.
+
+An idle session is a thread parked on a queue with a small stack, about
+30 KiB of RSS each (python load_test.py --idle-sessions 8000 holds 8000 of
+them in ~235 MiB), so one process hosts thousands of idle players. The
+number of players is still capped (max_sessions, 8000 by default) to stay
+under the usual thread and file descriptor limits; connections beyond the
+cap are told the server is full and closed.
+"""
+
+import argparse
+import asyncio
+import threading
+
+import game_io
+import main
+from custom_exceptions import SessionClosedError
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8763
+
+# Session threads mostly wait in QueueSource.read(); they do not need a full-size stack
+SESSION_STACK_SIZE = 512 * 1024
+# Stacks are committed lazily: an idle session costs ~30 KiB of RSS, not 512 KiB
+DEFAULT_MAX_SESSIONS = 8000
+SERVER_FULL_MESSAGE = "The server is full. Please try again later.\n"
+
+# ============================================================================
+# SOCKET I/O
+# ============================================================================
+
+class SocketIO(game_io.GameIO):
+    """
+    GameIO for one network player
+
+    Output is buffered and handed to the event loop in chunks; input blocks
+    the session thread until the connection handler feeds a line (or the
+    connection closes).
+    """
+
+    def __init__(self, loop, writer):
+        sink = game_io.CallbackSink(lambda data: loop.call_soon_threadsafe(writer.write, data))
+        super().__init__(sink, game_io.QueueSource())
+        self.loop = loop
+        self.writer = writer
+        self.closed = False
+
+    def feed(self, line):
+        """Hand a line received from the client to the session thread"""
+        self.source.feed(line)
+
+    def close(self):
+        """Wake the session thread so it can see the player is gone"""
+        self.closed = True
+        self.source.close()
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+def run_session(io, catalog):
+    """Play one full game for a network player (runs in a session thread)"""
+    game_io.bind_io(io)
+    session = main.GameSession(catalog)
+    try:
+        main.display_welcome()
+        main.run_main_menu(session)
+    except SessionClosedError:
+        pass
+    finally:
+        if not io.closed:
+            io.flush()
+            io.closed = True
+            io.loop.call_soon_threadsafe(io.writer.close)
+
+
+class GameServer:
+    """asyncio TCP server that runs one game session per connection, up to max_sessions"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_sessions=DEFAULT_MAX_SESSIONS):
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.catalog = main.GameCatalog()
+        self.active_sessions = 0
+        self.server = None
+
+    def load_catalogs(self):
+        """Load quests and items once for every session to share"""
+        self.catalog = main.GameCatalog.load()
+
+    async def handle_client(self, reader, writer):
+        """Feed one connection's lines to its session thread"""
+        if self.active_sessions >= self.max_sessions:
+            writer.write(SERVER_FULL_MESSAGE.encode())
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+            return
+
+        io = SocketIO(asyncio.get_running_loop(), writer)
+        thread = threading.Thread(
+            target=run_session, args=(io, self.catalog), daemon=True
+        )
+        self.active_sessions += 1
+        thread.start()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                io.feed(line.decode(errors="replace").rstrip("\r\n"))
+        except ConnectionError:
+            pass
+        finally:
+            io.close()
+            self.active_sessions -= 1
+            writer.close()
+
+    async def start(self):
+        """Load the catalogs and start listening; returns the asyncio server"""
+        self.load_catalogs()
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        return self.server
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Quest Chronicles multi-player server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS,
+                        help="players hosted at once (each holds a thread); more are turned away")
+    args = parser.parse_args()
+
+    threading.stack_size(SESSION_STACK_SIZE)
+    print(f"Quest Chronicles server listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(GameServer(args.host, args.port, args.max_sessions).serve_forever())
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main_cli()
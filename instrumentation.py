@@ -0,0 +1,215 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Instrumentation Module
+
+Opt-in call counters and latency histograms for the game's hot paths.
+
+Nothing is wrapped until enable() is called: it swaps each entry point in
+INSTRUMENTED_FUNCTIONS for a timing wrapper on its module (or class), and
+disable() puts the originals back. While disabled the game runs the
+original functions, so there is no overhead at all.
+
+Callers that look functions up on the module at call time (module.func(...),
+as main.py does) are measured; names copied earlier with
+`from module import func` keep pointing at the unwrapped function.
+"""
+
+import bisect
+import functools
+import importlib
+import os
+import threading
+import time
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+# (module, attribute path) of every measured entry point
+INSTRUMENTED_FUNCTIONS = [
+    ("game_data", "load_quests"),
+    ("game_data", "load_items"),
+    ("character_manager", "save_character"),
+    ("character_manager", "load_character"),
+    ("quest_handler", "accept_quest"),
+    ("quest_handler", "complete_quest"),
+    ("inventory_system", "purchase_item"),
+    ("inventory_system", "use_item"),
+    ("combat_system", "SimpleBattle.player_turn"),
+    ("combat_system", "SimpleBattle.enemy_turn"),
+]
+
+# Histogram bucket upper bounds in seconds (a final +Inf bucket is implied)
+LATENCY_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001,
+    0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0
+)
+
+METRIC_PREFIX = "quest_chronicles"
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class FunctionMetrics:
+    """Call count, error count and latency histogram for one function"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        # One slot per bucket plus the +Inf overflow slot (not cumulative)
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds, failed):
+        self.calls += 1
+        self.total_seconds += seconds
+        if failed:
+            self.errors += 1
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+
+_metrics = {}
+_lock = threading.Lock()
+_originals = {}
+
+def _record(name, seconds, failed):
+    with _lock:
+        metrics = _metrics.get(name)
+        if metrics is None:
+            metrics = _metrics[name] = FunctionMetrics()
+        metrics.observe(seconds, failed)
+
+
+def _wrap(name, func):
+    """Return a version of func that records its latency under `name`"""
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            _record(name, time.perf_counter() - started, failed)
+    timed.__wrapped_for_metrics__ = func
+    return timed
+
+
+def _resolve(module_name, path):
+    """Return (owner object, attribute name) for 'func' or 'Class.method'"""
+    owner = importlib.import_module(module_name)
+    parts = path.split(".")
+    for part in parts[:-1]:
+        owner = getattr(owner, part)
+    return owner, parts[-1]
+
+# ============================================================================
+# ENABLE / DISABLE
+# ============================================================================
+
+def enable():
+    """Start measuring every function in INSTRUMENTED_FUNCTIONS"""
+    for module_name, path in INSTRUMENTED_FUNCTIONS:
+        name = f"{module_name}.{path}"
+        if name in _originals:
+            continue
+        owner, attribute = _resolve(module_name, path)
+        original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+        _originals[name] = (owner, attribute, original)
+        setattr(owner, attribute, _wrap(name, original))
+
+
+def disable():
+    """Stop measuring and restore the original functions (metrics are kept)"""
+    for owner, attribute, original in _originals.values():
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def reset():
+    """Forget all recorded metrics"""
+    with _lock:
+        _metrics.clear()
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def snapshot():
+    """
+    Return a copy of all metrics recorded so far
+
+    Returns: {function_name: {'calls': int, 'errors': int,
+              'total_seconds': float, 'mean_seconds': float,
+              'buckets': [(upper_bound, cumulative_count), ...]}}
+              where the last upper bound is float('inf')
+    """
+    with _lock:
+        result = {}
+        for name, metrics in _metrics.items():
+            cumulative = 0
+            buckets = []
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), metrics.bucket_counts):
+                cumulative += count
+                buckets.append((bound, cumulative))
+            result[name] = {
+                'calls': metrics.calls,
+                'errors': metrics.errors,
+                'total_seconds': metrics.total_seconds,
+                'mean_seconds': metrics.total_seconds / metrics.calls if metrics.calls else 0.0,
+                'buckets': buckets
+            }
+        return result
+
+
+def prometheus_text():
+    """Return all metrics in the Prometheus text exposition format"""
+    data = snapshot()
+    calls = f"{METRIC_PREFIX}_calls_total"
+    errors = f"{METRIC_PREFIX}_errors_total"
+    latency = f"{METRIC_PREFIX}_latency_seconds"
+
+    lines = [
+        f"# HELP {calls} Calls to instrumented game functions.",
+        f"# TYPE {calls} counter",
+    ]
+    for name, metrics in sorted(data.items()):
+        lines.append(f'{calls}{{function="{name}"}} {metrics["calls"]}')
+
+    lines += [
+        f"# HELP {errors} Instrumented calls that raised an exception.",
+        f"# TYPE {errors} counter",
+    ]
+    for name, metrics in sorted(data.items()):
+        lines.append(f'{errors}{{function="{name}"}} {metrics["errors"]}')
+
+    lines += [
+        f"# HELP {latency} Latency of instrumented game functions.",
+        f"# TYPE {latency} histogram",
+    ]
+    for name, metrics in sorted(data.items()):
+        for bound, count in metrics['buckets']:
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{latency}_bucket{{function="{name}",le="{le}"}} {count}')
+        lines.append(f'{latency}_sum{{function="{name}"}} {metrics["total_seconds"]:.9f}')
+        lines.append(f'{latency}_count{{function="{name}"}} {metrics["calls"]}')
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(filename):
+    """Write prometheus_text() to a file (atomically, for scrapers)"""
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_name = f"{filename}.tmp"
+    with open(temp_name, "w") as f:
+        f.write(prometheus_text())
+    os.replace(temp_name, filename)
+    return True
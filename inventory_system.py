@@ -10,6 +10,8 @@ from custom_exceptions import (
     InvalidItemTypeError
 )
 from collections import Counter
+import game_io
+from character_manager import mark_dirty
 
 MAX_INVENTORY_SIZE = 20
 
@@ -21,12 +23,14 @@ def add_item_to_inventory(character, item_id):
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full.")
     character['inventory'].append(item_id)
+    mark_dirty(character, 'inventory')
     return True
 
 def remove_item_from_inventory(character, item_id):
     if item_id not in character['inventory']:
         raise ItemNotFoundError(f"Item '{item_id}' not found in inventory.")
     character['inventory'].remove(item_id)
+    mark_dirty(character, 'inventory')
     return True
 
 def has_item(character, item_id):
@@ -41,6 +45,7 @@ def get_inventory_space_remaining(character):
 def clear_inventory(character):
     removed_items = character['inventory'][:]
     character['inventory'].clear()
+    mark_dirty(character, 'inventory')
     return removed_items
 
 # -------------------------
@@ -128,6 +133,7 @@ def purchase_item(character, item_id, item_data):
         raise InventoryFullError("Inventory is full.")
     character['gold'] -= item_data['cost']
     character['inventory'].append(item_id)
+    mark_dirty(character, 'inventory')
     return True
 
 def sell_item(character, item_id, item_data):
@@ -135,6 +141,7 @@ def sell_item(character, item_id, item_data):
         raise ItemNotFoundError(f"Item '{item_id}' not found in inventory.")
     sell_price = item_data['cost'] // 2
     character['inventory'].remove(item_id)
+    mark_dirty(character, 'inventory')
     character['gold'] += sell_price
     return sell_price
 
@@ -162,8 +169,8 @@ def apply_stat_effect(character, stat, value):
 
 def display_inventory(character, item_data_dict):
     inventory_count = Counter(character['inventory'])
-    print("Inventory:")
+    game_io.write("Inventory:")
     for item_id, count in inventory_count.items():
         item_name = item_data_dict.get(item_id, {}).get('name', item_id)
         item_type = item_data_dict.get(item_id, {}).get('type', 'Unknown')
-        print(f"- {item_name} (Type: {item_type}) x{count}")
+        game_io.write(f"- {item_name} (Type: {item_type}) x{count}")
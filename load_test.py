@@ -0,0 +1,435 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Load Test Module
+
+Simulates K concurrent players in one process to find out how many the game
+logic can sustain.
+
+Each simulated client owns one character and repeatedly picks an action
+from ACTION_MIX (quest accept/complete, shop buy/sell, explore battles and
+saves), calling the same module functions the menus in main.py use against
+a shared quest/item catalog. Every action is timed; rule violations the game
+reports with a GameError (a full inventory, no quest to complete, ...) count
+as "rejected", anything else as an error.
+
+The report gives overall throughput, p50/p99 latency per action and the
+process's resident memory (RSS) over time. tracemalloc would slow every
+allocation and skew those timings, so it is opt-in (--trace-memory): the
+timed run is repeated in a second, untimed pass under tracemalloc to see
+how much memory Python objects hold.
+
+--idle-sessions N instead connects N players to an in-process game_server
+and leaves them idle at the main menu, reporting the RSS each one costs.
+
+Usage: python load_test.py --clients 50 --actions 500 [--data-dir big_data] [--trace-memory]
+       python load_test.py --idle-sessions 5000
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import battle_engine
+import game_data
+from custom_exceptions import GameError
+
+# Relative weight of each action in a client's script
+ACTION_MIX = {
+    'accept_quest': 3,
+    'complete_quest': 2,
+    'buy': 2,
+    'sell': 2,
+    'explore': 4,
+    'save': 1,
+}
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+DEFAULT_MEMORY_INTERVAL = 0.1
+
+# ============================================================================
+# SIMULATED PLAYER
+# ============================================================================
+
+class SimulatedPlayer:
+    """One client: a character plus a seeded script of weighted actions"""
+
+    def __init__(self, index, quests, items, save_directory, seed=0):
+        self.rng = random.Random(seed * 100003 + index)
+        self.character = character_manager.create_character(
+            f"LoadTester{index}", CLASSES[index % len(CLASSES)]
+        )
+        self.quests = quests
+        self.items = items
+        self.item_ids = list(items)
+        self.save_directory = save_directory
+        self.actions = list(ACTION_MIX)
+        self.weights = [ACTION_MIX[action] for action in self.actions]
+        # {action: [seconds, ...]} and {action: count}
+        self.latencies = {action: [] for action in self.actions}
+        self.rejected = {action: 0 for action in self.actions}
+        self.errors = {action: 0 for action in self.actions}
+
+    def step(self):
+        """Pick and time one action"""
+        action = self.rng.choices(self.actions, self.weights)[0]
+        handler = getattr(self, f"do_{action}")
+        started = time.perf_counter()
+        try:
+            handler()
+        except GameError:
+            self.rejected[action] += 1
+        except Exception:
+            self.errors[action] += 1
+        self.latencies[action].append(time.perf_counter() - started)
+
+    def do_accept_quest(self):
+        available = quest_handler.get_available_quests(self.character, self.quests)
+        if available:
+            quest_handler.accept_quest(self.character, self.rng.choice(available)['quest_id'], self.quests)
+
+    def do_complete_quest(self):
+        active = self.character['active_quests']
+        if active:
+            quest_handler.complete_quest(self.character, self.rng.choice(active), self.quests, self.items)
+
+    def do_buy(self):
+        if self.item_ids:
+            item_id = self.rng.choice(self.item_ids)
+            inventory_system.purchase_item(self.character, item_id, self.items[item_id])
+
+    def do_sell(self):
+        inventory = self.character['inventory']
+        if inventory:
+            item_id = self.rng.choice(inventory)
+            inventory_system.sell_item(self.character, item_id, self.items[item_id])
+
+    def do_explore(self):
+        if character_manager.is_character_dead(self.character):
+            character_manager.revive_character(self.character)
+        enemy = combat_system.get_random_enemy_for_level(self.character['level'])
+        outcome = battle_engine.resolve_duel(self.character, enemy)
+        if outcome['winner'] == 'player':
+            character_manager.gain_experience(self.character, enemy['xp_reward'])
+            character_manager.add_gold(self.character, enemy['gold_reward'])
+
+    def do_save(self):
+        if not character_manager.save_character(self.character, self.save_directory):
+            raise IOError(f"Could not save {self.character['name']}")
+
+    def run(self, actions=None, duration=None, start=None):
+        """Run `actions` steps, or for `duration` seconds, after `start` releases"""
+        if start is not None:
+            start.wait()
+        deadline = time.perf_counter() + duration if duration else None
+        done = 0
+        while (actions is None or done < actions) and (deadline is None or time.perf_counter() < deadline):
+            self.step()
+            done += 1
+
+# ============================================================================
+# MEMORY MONITOR
+# ============================================================================
+
+def current_rss():
+    """Resident set size of this process in bytes (peak RSS where /proc is missing)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KiB on Linux but in bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def traced_memory():
+    """Bytes tracemalloc currently sees allocated"""
+    return tracemalloc.get_traced_memory()[0]
+
+
+class MemoryMonitor:
+    """Samples a memory reading (RSS by default) every `interval` seconds"""
+
+    def __init__(self, interval=DEFAULT_MEMORY_INTERVAL, measure=current_rss):
+        self.interval = interval
+        self.measure = measure
+        self.samples = []
+        self.stopped = threading.Event()
+        self.started = 0.0
+        self.thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.sample()
+        self.thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        self.thread.start()
+
+    def sample(self):
+        self.samples.append((time.perf_counter() - self.started, self.measure()))
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.sample()
+
+# ============================================================================
+# LOAD TEST
+# ============================================================================
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_players(clients, actions, duration, quests, items, save_directory, seed, monitor):
+    """Run one pass of `clients` players with a memory monitor; returns (players, seconds)"""
+    players = [SimulatedPlayer(i, quests, items, save_directory, seed) for i in range(clients)]
+    start = threading.Barrier(clients + 1)
+    threads = [
+        threading.Thread(target=player.run, name=f"load-client-{i}",
+                         args=(None if duration else actions, duration, start))
+        for i, player in enumerate(players)
+    ]
+    for thread in threads:
+        thread.start()
+
+    monitor.start()
+    began = time.perf_counter()
+    start.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    monitor.stop()
+    return players, elapsed
+
+
+def memory_summary(samples, peak):
+    return {
+        'start_bytes': samples[0][1],
+        'end_bytes': samples[-1][1],
+        'peak_bytes': peak,
+        'growth_bytes': samples[-1][1] - samples[0][1],
+        'samples': samples
+    }
+
+
+def run_load_test(clients=10, actions=200, duration=None, data_dir="data",
+                  save_directory=None, seed=0, memory_interval=DEFAULT_MEMORY_INTERVAL,
+                  trace_memory=False):
+    """
+    Run `clients` simulated players at once and measure them
+
+    Each client performs `actions` actions, or keeps going for `duration`
+    seconds if that is given instead. Saves go to save_directory, or to a
+    temporary directory that is removed afterwards. Memory is sampled as
+    RSS; with trace_memory the same workload runs a second time under
+    tracemalloc (after the timed run, so it cannot skew the timings).
+
+    Returns: Dictionary report:
+            {'clients': int, 'actions': int, 'seconds': float,
+             'throughput': float (actions per second),
+             'per_action': {action: {'count', 'rejected', 'errors',
+                                     'p50_ms', 'p99_ms', 'max_ms'}},
+             'memory': {'start_bytes', 'end_bytes', 'peak_bytes',
+                        'growth_bytes', 'samples': [(seconds, bytes), ...]},
+             'traced_memory': same keys, or None without trace_memory}
+    """
+    quests = game_data.load_quests(os.path.join(data_dir, "quests.txt"))
+    items = game_data.load_items(os.path.join(data_dir, "items.txt"))
+
+    temporary = save_directory is None
+    if temporary:
+        save_directory = tempfile.mkdtemp(prefix="qc_load_test_")
+
+    traced = None
+    try:
+        monitor = MemoryMonitor(memory_interval)
+        players, elapsed = run_players(clients, actions, duration, quests, items,
+                                       save_directory, seed, monitor)
+        memory = memory_summary(monitor.samples, max(size for _, size in monitor.samples))
+
+        if trace_memory:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            try:
+                monitor = MemoryMonitor(memory_interval, traced_memory)
+                run_players(clients, actions, duration, quests, items, save_directory, seed, monitor)
+                traced = memory_summary(monitor.samples, tracemalloc.get_traced_memory()[1])
+            finally:
+                if not was_tracing:
+                    tracemalloc.stop()
+    finally:
+        if temporary:
+            shutil.rmtree(save_directory, ignore_errors=True)
+
+    per_action = {}
+    total = 0
+    for action in ACTION_MIX:
+        latencies = sorted(t for player in players for t in player.latencies[action])
+        total += len(latencies)
+        per_action[action] = {
+            'count': len(latencies),
+            'rejected': sum(player.rejected[action] for player in players),
+            'errors': sum(player.errors[action] for player in players),
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'max_ms': (latencies[-1] if latencies else 0.0) * 1000
+        }
+
+    return {
+        'clients': clients,
+        'actions': total,
+        'seconds': elapsed,
+        'throughput': total / elapsed if elapsed > 0 else 0.0,
+        'per_action': per_action,
+        'memory': memory,
+        'traced_memory': traced
+    }
+
+
+# ============================================================================
+# IDLE SESSIONS
+# ============================================================================
+
+def run_idle_sessions(sessions=1000, batch=200, memory_interval=DEFAULT_MEMORY_INTERVAL):
+    """
+    Connect `sessions` players to a GameServer in this process and leave
+    them all idle at the main menu prompt
+
+    Players connect `batch` at a time. The client ends of the connections
+    live in this process too, so the RSS per session is an upper bound.
+
+    Returns: {'sessions': int, 'connect_seconds': float, 'threads': int,
+              'per_session_bytes': float, 'memory': same keys as run_load_test's}
+    """
+    import asyncio
+    import game_server
+
+    prompt = b"Select an option (1-3): "
+
+    async def connect(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readuntil(prompt)
+        return writer
+
+    async def run(monitor):
+        server = game_server.GameServer(port=0, max_sessions=sessions)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+        writers = []
+        try:
+            monitor.start()
+            began = time.perf_counter()
+            while len(writers) < sessions:
+                count = min(batch, sessions - len(writers))
+                writers += await asyncio.gather(*(connect(port) for _ in range(count)))
+            elapsed = time.perf_counter() - began
+            idle = (server.active_sessions, threading.active_count())
+            await asyncio.sleep(memory_interval * 2)
+            monitor.stop()
+        finally:
+            for writer in writers:
+                writer.close()
+            while server.active_sessions:
+                await asyncio.sleep(0.01)
+            listener.close()
+            await listener.wait_closed()
+        return elapsed, idle
+
+    previous_stack_size = threading.stack_size(game_server.SESSION_STACK_SIZE)
+    try:
+        monitor = MemoryMonitor(memory_interval)
+        elapsed, (connected, threads) = asyncio.run(run(monitor))
+    finally:
+        threading.stack_size(previous_stack_size)
+
+    memory = memory_summary(monitor.samples, max(size for _, size in monitor.samples))
+    return {
+        'sessions': connected,
+        'connect_seconds': elapsed,
+        'threads': threads,
+        'per_session_bytes': memory['growth_bytes'] / sessions if sessions else 0.0,
+        'memory': memory
+    }
+
+
+def display_idle_report(report):
+    """Print an idle sessions report"""
+    print(f"\n{report['sessions']} idle sessions ({report['threads']} threads) "
+          f"connected in {report['connect_seconds']:.2f} s")
+    print(f"RSS per session: {report['per_session_bytes'] / 1024:.1f} KiB")
+    display_memory("RSS", report['memory'])
+
+
+def display_report(report):
+    """Print a load test report"""
+    print(f"\n{report['clients']} clients ran {report['actions']} actions in {report['seconds']:.2f} s")
+    print(f"Throughput: {report['throughput']:.0f} actions/s")
+
+    print(f"\n{'action':<16} {'count':>8} {'rejected':>9} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for action, stats in report['per_action'].items():
+        print(f"{action:<16} {stats['count']:>8} {stats['rejected']:>9} {stats['errors']:>7} "
+              f"{stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+
+    display_memory("RSS", report['memory'])
+    if report['traced_memory'] is not None:
+        display_memory("tracemalloc, separate pass", report['traced_memory'])
+
+
+def display_memory(label, memory):
+    print(f"\nMemory ({label}): start {memory['start_bytes'] / 1024:.0f} KiB, "
+          f"end {memory['end_bytes'] / 1024:.0f} KiB, peak {memory['peak_bytes'] / 1024:.0f} KiB, "
+          f"growth {memory['growth_bytes'] / 1024:+.0f} KiB")
+    samples = memory['samples']
+    step = max(len(samples) // 10, 1)
+    for seconds, size in samples[::step]:
+        print(f"  {seconds:>7.2f} s  {size / 1024:>9.0f} KiB")
+
+
+def cli(argv=None):
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quest Chronicles load test")
+    parser.add_argument("--clients", type=int, default=10, help="number of concurrent simulated players")
+    parser.add_argument("--actions", type=int, default=200, help="actions per client")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead of a fixed action count")
+    parser.add_argument("--data-dir", default="data", help="directory holding quests.txt and items.txt")
+    parser.add_argument("--save-dir", help="keep save files here (default: a temporary directory)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the action scripts")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also measure Python allocations with tracemalloc in a second, untimed pass")
+    parser.add_argument("--idle-sessions", type=int, metavar="N",
+                        help="instead, hold N idle players on an in-process game server and report their memory")
+    args = parser.parse_args(argv)
+
+    if args.idle_sessions is not None:
+        display_idle_report(run_idle_sessions(args.idle_sessions))
+        return
+
+    report = run_load_test(args.clients, args.actions, args.duration, args.data_dir,
+                           args.save_dir, args.seed, trace_memory=args.trace_memory)
+    display_report(report)
+
+
+if __name__ == "__main__":
+    cli()
@@ -12,22 +12,154 @@ It provided suggestions for fixing errors and clarifying logic issues.
 AI also served as a reference for correct Python syntax and best practices, such as using x.split() instead of split(x), proper exception handling, and other standard coding patterns. AI was used only as guidance and troubleshooting support.
 """
 
-# Import all our custom modules
-import character_manager
-import inventory_system
-import quest_handler
-import combat_system
-import game_data
+import importlib
+import random
+import sys
+import threading
+from types import MappingProxyType, ModuleType
+
+import game_io
 from custom_exceptions import *
 
+# ============================================================================
+# LAZY IMPORTS
+# ============================================================================
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is imported the first time one of its names is used
+
+    The import goes through importlib.import_module, which holds the
+    module's import lock, so a session thread that arrives while another
+    thread is still running the module's code waits for it instead of
+    seeing a half-initialized module.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._module = None
+
+    def __getattr__(self, attribute):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self.__name__)
+        return getattr(module, attribute)
+
+
+def lazy_import(name):
+    """
+    Return a module whose code only runs the first time one of its names is used
+
+    Keeps startup down to what the welcome screen needs; each subsystem is
+    imported once, on first use, instead of inside every menu call.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+# Import all our custom modules
+character_manager = lazy_import("character_manager")
+inventory_system = lazy_import("inventory_system")
+quest_handler = lazy_import("quest_handler")
+combat_system = lazy_import("combat_system")
+game_data = lazy_import("game_data")
+autosave = lazy_import("autosave")
+
 # ============================================================================ 
 # GAME STATE
 # ============================================================================
 
-current_character = None
-all_quests = {}
-all_items = {}
-game_running = False
+class GameCatalog:
+    """
+    Quest and item data loaded once and shared by every session
+
+    The mappings are read-only views, so one catalog can safely be handed to
+    any number of sessions.
+    """
+
+    def __init__(self, quests=None, items=None):
+        self.quests = MappingProxyType(dict(quests or {}))
+        self.items = MappingProxyType(dict(items or {}))
+
+    @classmethod
+    def load(cls):
+        """Load quests and items from the data files (empty if missing)"""
+        try:
+            quests = game_data.load_quests()
+        except Exception:
+            quests = {}
+
+        try:
+            items = game_data.load_items()
+        except Exception:
+            items = {}
+
+        return cls(quests, items)
+
+    @classmethod
+    def load_in_background(cls):
+        """Start loading the data files in a thread; returns a BackgroundCatalog"""
+        return BackgroundCatalog(cls.load)
+
+
+class BackgroundCatalog:
+    """
+    Stand-in for a GameCatalog that is still being loaded
+
+    The welcome screen and main menu can be shown while the data files are
+    read; the first access to quests or items waits for the load to finish.
+    """
+
+    def __init__(self, load):
+        self.catalog = None
+        self.thread = threading.Thread(target=self._run, args=(load,), daemon=True)
+        self.thread.start()
+
+    def _run(self, load):
+        self.catalog = load()
+
+    def result(self):
+        """Wait for the load and return the real GameCatalog"""
+        self.thread.join()
+        return self.catalog
+
+    @property
+    def quests(self):
+        return self.result().quests
+
+    @property
+    def items(self):
+        return self.result().items
+
+
+class GameSession:
+    """
+    State for one player: their character, the loop flag and the shared catalog
+
+    Every menu function takes the session it acts on, so sessions can run
+    side by side in threads or tasks.
+    """
+
+    def __init__(self, catalog=None):
+        self.current_character = None
+        self.catalog = catalog if catalog is not None else GameCatalog()
+        self.game_running = False
+
+    @property
+    def all_quests(self):
+        return self.catalog.quests
+
+    @property
+    def all_items(self):
+        return self.catalog.items
+
+
+# Session used when a menu function is called without one (the console player)
+_console_session = GameSession()
+
+def get_session(session=None):
+    """Return `session`, or the console session if none was given"""
+    return session if session is not None else _console_session
 
 # ============================================================================ 
 # MAIN MENU
@@ -36,32 +168,32 @@ game_running = False
 def main_menu():
     """Display the main menu and return the user's selection."""
     while True:
-        print("\nMain Menu:")
-        print("1. New Game")
-        print("2. Load Game")
-        print("3. Exit")
-        choice = input("Select an option (1-3): ").strip()
+        game_io.write("\nMain Menu:")
+        game_io.write("1. New Game")
+        game_io.write("2. Load Game")
+        game_io.write("3. Exit")
+        choice = game_io.read("Select an option (1-3): ").strip()
 
         # Validate menu choice
         if choice in ['1','2','3']:
             return int(choice)
-        print("Invalid choice. Please select 1-3.")
+        game_io.write("Invalid choice. Please select 1-3.")
 
-def new_game():
+def new_game(session=None):
     """Create a new character and start the game."""
-    global current_character
+    session = get_session(session)
 
     while True:
         # Get character name
-        name = input("Enter your character's name: ").strip()
+        name = game_io.read("Enter your character's name: ").strip()
         if not name:
-            print("Name cannot be empty.")
+            game_io.write("Name cannot be empty.")
             continue
 
         # Choose class
-        print("Select your character's class:")
-        print("1. Warrior\n2. Mage\n3. Rogue")
-        class_choice = input("Enter class number (1-3): ").strip()
+        game_io.write("Select your character's class:")
+        game_io.write("1. Warrior\n2. Mage\n3. Rogue")
+        class_choice = game_io.read("Enter class number (1-3): ").strip()
 
         class_map = {'1': 'Warrior', '2': 'Mage', '3': 'Rogue'}
 
@@ -70,27 +202,31 @@ def new_game():
             character_class = class_map[class_choice]
             try:
                 # Create and save the character
-                current_character = character_manager.create_character(name, character_class)
-                character_manager.save_character(current_character)
+                session.current_character = character_manager.create_character(name, character_class)
+                character_manager.save_character(session.current_character)
 
-                print(f"Character '{name}' the {character_class} created successfully!")
-                game_loop()
+                game_io.write(f"Character '{name}' the {character_class} created successfully!")
+                game_loop(session)
                 return
 
             except InvalidCharacterClassError as e:
-                print(f"Error: {e}")
+                game_io.write(f"Error: {e}")
+
+            except SessionClosedError:
+                # Input ended or the player disconnected: unwind to main()
+                raise
 
             except Exception as e:
-                print(f"Unexpected error creating character: {e}")
+                game_io.write(f"Unexpected error creating character: {e}")
                 return
 
         else:
-            print("Invalid class choice. Please select 1-3.")
+            game_io.write("Invalid class choice. Please select 1-3.")
 
 
-def load_game():
+def load_game(session=None):
     """Load a saved character and start playing."""
-    global current_character
+    session = get_session(session)
 
     try:
         saved_characters = character_manager.list_saved_characters()
@@ -99,276 +235,280 @@ def load_game():
 
     # No characters saved
     if not saved_characters:
-        print("No saved characters found.")
+        game_io.write("No saved characters found.")
         return
 
-    print("\nSaved Characters:")
+    game_io.write("\nSaved Characters:")
     for idx, char_name in enumerate(saved_characters, start=1):
-        print(f"{idx}. {char_name}")
+        game_io.write(f"{idx}. {char_name}")
 
     # Select character to load
     while True:
-        choice = input(f"Select a character to load (1-{len(saved_characters)}): ").strip()
+        choice = game_io.read(f"Select a character to load (1-{len(saved_characters)}): ").strip()
 
         if choice.isdigit() and 1 <= int(choice) <= len(saved_characters):
             selected_name = saved_characters[int(choice) - 1]
             try:
-                current_character = character_manager.load_character(selected_name)
-                print(f"Character '{selected_name}' loaded successfully!")
-                game_loop()
+                # A matching checksum means the save is exactly what the game wrote
+                session.current_character = character_manager.load_character(selected_name, trust_checksum=True)
+                game_io.write(f"Character '{selected_name}' loaded successfully!")
+                game_loop(session)
                 return
 
-            except (CharacterNotFoundError, SaveFileCorruptedError) as e:
-                print(f"Error: {e}")
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+                game_io.write(f"Error: {e}")
+
+            except SessionClosedError:
+                # Input ended or the player disconnected: unwind to main()
+                raise
 
             except Exception as e:
-                print(f"Unexpected error loading character: {e}")
+                game_io.write(f"Unexpected error loading character: {e}")
                 return
 
         else:
-            print(f"Invalid choice. Please select 1-{len(saved_characters)}.")
+            game_io.write(f"Invalid choice. Please select 1-{len(saved_characters)}.")
 
 
 # ============================================================================
 # GAME LOOP
 # ============================================================================
 
-def game_loop():
-    """Main gameplay loop that handles all in-game actions."""
-    global game_running
-    game_running = True
-
-    while game_running:
-        choice = game_menu()
+def game_loop(session=None):
+    """Main gameplay loop that handles all in-game actions (autosaved in the background)."""
+    session = get_session(session)
+    session.game_running = True
+    scheduler = autosave.get_scheduler()
 
-        if choice == 1:
-            view_character_stats()
-        elif choice == 2:
-            view_inventory()
-        elif choice == 3:
-            quest_menu()
-        elif choice == 4:
-            explore()
-        elif choice == 5:
-            shop()
-        elif choice == 6:
-            save_game()
-            print("Exiting to main menu...")
-            break
+    try:
+        while session.game_running:
+            choice = game_menu()
+
+            if choice == 1:
+                view_character_stats(session)
+            elif choice == 2:
+                view_inventory(session)
+            elif choice == 3:
+                quest_menu(session)
+            elif choice == 4:
+                explore(session)
+            elif choice == 5:
+                shop(session)
+            elif choice == 6:
+                save_game(session)
+                game_io.write("Exiting to main menu...")
+                break
+
+            scheduler.action_done(session.current_character)
+    finally:
+        # Leaving (or disconnecting): make sure the latest state is on disk
+        if session.current_character is not None:
+            scheduler.flush(session.current_character)
 
 
 def game_menu():
     """Display game menu and return user option."""
     while True:
-        print("\nGame Menu:")
-        print("1. View Character Stats\n2. View Inventory\n3. Quest Menu")
-        print("4. Explore (Find Battles)\n5. Shop\n6. Save and Quit")
+        game_io.write("\nGame Menu:")
+        game_io.write("1. View Character Stats\n2. View Inventory\n3. Quest Menu")
+        game_io.write("4. Explore (Find Battles)\n5. Shop\n6. Save and Quit")
 
-        choice = input("Select an option (1-6): ").strip()
+        choice = game_io.read("Select an option (1-6): ").strip()
 
         # Validate input
         if choice in ['1', '2', '3', '4', '5', '6']:
             return int(choice)
 
-        print("Invalid choice. Please select 1-6.")
+        game_io.write("Invalid choice. Please select 1-6.")
 
 
 # ============================================================================
 # GAME ACTIONS
 # ============================================================================
 
-def view_character_stats():
+def view_character_stats(session=None):
     """Display the current character's stats."""
-    global current_character
-    if not current_character:
-        print("No character loaded.")
+    session = get_session(session)
+    if not session.current_character:
+        game_io.write("No character loaded.")
         return
 
     # Get character info safely
-    name = current_character.get('name', 'Unknown')
-    clazz = current_character.get('class', 'Unknown')
-    level = current_character.get('level', 'Unknown')
-    health = current_character.get('health', 0)
-    max_health = current_character.get('max_health', 0)
-    gold = current_character.get('gold', 0)
-    stats = current_character.get('stats', {})
-
-    print(f"\nCharacter Stats for {name}:")
-    print(f"Class: {clazz}\nLevel: {level}\nHealth: {health}/{max_health}\nGold: {gold}")
-
-    print("Stats:")
+    name = session.current_character.get('name', 'Unknown')
+    clazz = session.current_character.get('class', 'Unknown')
+    level = session.current_character.get('level', 'Unknown')
+    health = session.current_character.get('health', 0)
+    max_health = session.current_character.get('max_health', 0)
+    gold = session.current_character.get('gold', 0)
+    stats = session.current_character.get('stats', {})
+
+    game_io.write(f"\nCharacter Stats for {name}:")
+    game_io.write(f"Class: {clazz}\nLevel: {level}\nHealth: {health}/{max_health}\nGold: {gold}")
+
+    game_io.write("Stats:")
     for stat, value in stats.items():
-        print(f"  {stat.capitalize()}: {value}")
+        game_io.write(f"  {stat.capitalize()}: {value}")
 
-    print("Active Quests:")
+    game_io.write("Active Quests:")
 
     try:
-        active_quests = quest_handler.get_active_quests(current_character, all_quests)
+        active_quests = quest_handler.get_active_quests(session.current_character, session.all_quests)
     except Exception:
         active_quests = []
 
     # Display active quests
     if active_quests:
-        for quest_id in active_quests:
-            quest = all_quests.get(quest_id, {})
-            print(f"  - {quest.get('title', quest_id)}: {quest.get('description', '')}")
+        for quest in active_quests:
+            game_io.write(f"  - {quest.get('title', quest.get('quest_id'))} (ID: {quest.get('quest_id')}): {quest.get('description', '')}")
     else:
-        print("  None")
+        game_io.write("  None")
 
 
-def view_inventory():
+def view_inventory(session=None):
     """Display inventory and allow item usage/equipping."""
-    global current_character, all_items
+    session = get_session(session)
 
-    if not current_character:
-        print("No character loaded.")
+    if not session.current_character:
+        game_io.write("No character loaded.")
         return
 
-    from inventory_system import use_item, equip_weapon, equip_armor, display_inventory
-
     while True:
-        print("\nInventory:")
-        display_inventory(current_character, all_items)
+        game_io.write("\nInventory:")
+        inventory_system.display_inventory(session.current_character, session.all_items)
 
         # Inventory actions
-        action = input("\nActions: Use (u), Equip Weapon (w), Equip Armor (a), Back (b): ").lower()
+        action = game_io.read("\nActions: Use (u), Equip Weapon (w), Equip Armor (a), Back (b): ").lower()
 
         if action == 'u':
-            item_id = input("Enter item ID to use: ").strip()
-            if item_id in all_items:
+            item_id = game_io.read("Enter item ID to use: ").strip()
+            if item_id in session.all_items:
                 try:
-                    print(use_item(current_character, item_id, all_items[item_id]))
+                    game_io.write(inventory_system.use_item(session.current_character, item_id, session.all_items[item_id]))
                 except Exception as e:
-                    print(f"Cannot use item: {e}")
+                    game_io.write(f"Cannot use item: {e}")
             else:
-                print("Invalid item ID.")
+                game_io.write("Invalid item ID.")
 
         elif action == 'w':
-            item_id = input("Enter weapon ID to equip: ").strip()
-            if item_id in all_items:
+            item_id = game_io.read("Enter weapon ID to equip: ").strip()
+            if item_id in session.all_items:
                 try:
-                    equip_weapon(current_character, item_id, all_items)
-                    print(f"Equipped weapon: {all_items[item_id]['name']}")
+                    inventory_system.equip_weapon(session.current_character, item_id, session.all_items[item_id])
+                    game_io.write(f"Equipped weapon: {session.all_items[item_id]['name']}")
                 except Exception as e:
-                    print(f"Cannot equip weapon: {e}")
+                    game_io.write(f"Cannot equip weapon: {e}")
             else:
-                print("Invalid item ID.")
+                game_io.write("Invalid item ID.")
 
         elif action == 'a':
-            item_id = input("Enter armor ID to equip: ").strip()
-            if item_id in all_items:
+            item_id = game_io.read("Enter armor ID to equip: ").strip()
+            if item_id in session.all_items:
                 try:
-                    equip_armor(current_character, item_id, all_items)
-                    print(f"Equipped armor: {all_items[item_id]['name']}")
+                    inventory_system.equip_armor(session.current_character, item_id, session.all_items[item_id])
+                    game_io.write(f"Equipped armor: {session.all_items[item_id]['name']}")
                 except Exception as e:
-                    print(f"Cannot equip armor: {e}")
+                    game_io.write(f"Cannot equip armor: {e}")
             else:
-                print("Invalid item ID.")
+                game_io.write("Invalid item ID.")
 
         elif action == 'b':
             break  # Exit inventory
 
         else:
-            print("Invalid action. Enter u, w, a, or b.")
+            game_io.write("Invalid action. Enter u, w, a, or b.")
 
 
-def quest_menu():
+def quest_menu(session=None):
     """Menu for viewing and managing quests."""
-    global current_character, all_quests
-    from quest_handler import QuestNotFoundError, QuestAlreadyAcceptedError, QuestNotAcceptedError
+    session = get_session(session)
 
     while True:
-        print("\nQuest Menu:")
-        print("1. View Active Quests\n2. View Available Quests\n3. View Completed Quests")
-        print("4. Accept Quest\n5. Abandon Quest\n6. Complete Quest (Testing)\n7. Back")
+        game_io.write("\nQuest Menu:")
+        game_io.write("1. View Active Quests\n2. View Available Quests\n3. View Completed Quests")
+        game_io.write("4. Accept Quest\n5. Abandon Quest\n6. Complete Quest (Testing)\n7. Back")
 
-        choice = input("Select an option (1-7): ").strip()
+        choice = game_io.read("Select an option (1-7): ").strip()
 
         if choice == '1':
             try:
-                active_quests = quest_handler.get_active_quests(current_character, all_quests)
+                active_quests = quest_handler.get_active_quests(session.current_character, session.all_quests)
             except Exception:
                 active_quests = []
 
-            print("\nActive Quests:")
+            game_io.write("\nActive Quests:")
             if active_quests:
-                for qid in active_quests:
-                    quest = all_quests.get(qid, {})
-                    print(f"  - {quest.get('title', qid)}: {quest.get('description', '')}")
+                for quest in active_quests:
+                    game_io.write(f"  - {quest.get('title', quest.get('quest_id'))} (ID: {quest.get('quest_id')}): {quest.get('description', '')}")
             else:
-                print("  None")
+                game_io.write("  None")
 
         elif choice == '2':
             try:
-                available_quests = quest_handler.get_available_quests(current_character, all_quests)
+                available_quests = quest_handler.get_available_quests(session.current_character, session.all_quests)
             except Exception:
                 available_quests = []
 
-            print("\nAvailable Quests:")
+            game_io.write("\nAvailable Quests:")
             if available_quests:
-                for qid in available_quests:
-                    quest = all_quests.get(qid, {})
-                    print(f"  - {quest.get('title', qid)}: {quest.get('description', '')}")
+                for quest in available_quests:
+                    game_io.write(f"  - {quest.get('title', quest.get('quest_id'))} (ID: {quest.get('quest_id')}): {quest.get('description', '')}")
             else:
-                print("  None")
+                game_io.write("  None")
 
         elif choice == '3':
             try:
-                completed_quests = quest_handler.get_completed_quests(current_character, all_quests)
+                completed_quests = quest_handler.get_completed_quests(session.current_character, session.all_quests)
             except Exception:
                 completed_quests = []
 
-            print("\nCompleted Quests:")
+            game_io.write("\nCompleted Quests:")
             if completed_quests:
-                for qid in completed_quests:
-                    quest = all_quests.get(qid, {})
-                    print(f"  - {quest.get('title', qid)}: {quest.get('description', '')}")
+                for quest in completed_quests:
+                    game_io.write(f"  - {quest.get('title', quest.get('quest_id'))} (ID: {quest.get('quest_id')}): {quest.get('description', '')}")
             else:
-                print("  None")
+                game_io.write("  None")
 
         elif choice == '4':
-            quest_id = input("Enter Quest ID to accept: ").strip()
+            quest_id = game_io.read("Enter Quest ID to accept: ").strip()
             try:
-                quest_handler.accept_quest(current_character, quest_id, all_quests)
-                print(f"Quest '{quest_id}' accepted!")
-            except (QuestNotFoundError, QuestAlreadyAcceptedError) as e:
-                print(f"Error: {e}")
+                quest_handler.accept_quest(session.current_character, quest_id, session.all_quests)
+                game_io.write(f"Quest '{quest_id}' accepted!")
+            except (QuestError, InsufficientLevelError) as e:
+                game_io.write(f"Error: {e}")
 
         elif choice == '5':
-            quest_id = input("Enter Quest ID to abandon: ").strip()
+            quest_id = game_io.read("Enter Quest ID to abandon: ").strip()
             try:
-                quest_handler.abandon_quest(current_character, quest_id)
-                print(f"Quest '{quest_id}' abandoned.")
-            except QuestNotAcceptedError as e:
-                print(f"Error: {e}")
+                quest_handler.abandon_quest(session.current_character, quest_id)
+                game_io.write(f"Quest '{quest_id}' abandoned.")
+            except QuestError as e:
+                game_io.write(f"Error: {e}")
 
         elif choice == '6':
-            quest_id = input("Enter Quest ID to complete (testing): ").strip()
+            quest_id = game_io.read("Enter Quest ID to complete (testing): ").strip()
             try:
-                quest_handler.complete_quest(current_character, quest_id, all_quests)
-                print(f"Quest '{quest_id}' completed!")
-            except QuestNotAcceptedError as e:
-                print(f"Error: {e}")
+                quest_handler.complete_quest(session.current_character, quest_id, session.all_quests)
+                game_io.write(f"Quest '{quest_id}' completed!")
+            except QuestError as e:
+                game_io.write(f"Error: {e}")
 
         elif choice == '7':
             break  # Exit quest menu
 
         else:
-            print("Invalid choice. Please select 1-7.")
+            game_io.write("Invalid choice. Please select 1-7.")
 
 
-def explore():
+def explore(session=None):
     """Trigger a battle with a random enemy."""
-    global current_character
-    import random
-    from combat_system import SimpleBattle, CharacterDeadError
+    session = get_session(session)
 
-    if not current_character:
-        print("No character loaded.")
+    if not session.current_character:
+        game_io.write("No character loaded.")
         return
 
     # Enemy level is equal or slightly higher than player level
-    level = current_character.get('level', 1)
+    level = session.current_character.get('level', 1)
     enemy_level = random.choice([level, level + 1])
 
     # Generate enemy
@@ -379,9 +519,9 @@ def explore():
         enemy = combat_system.create_enemy("goblin")
         enemy['level'] = enemy_level
 
-    print(f"\nA wild {enemy.get('name', 'Enemy')} (Level {enemy.get('level', '?')}) appears!")
+    game_io.write(f"\nA wild {enemy.get('name', 'Enemy')} (Level {enemy.get('level', '?')}) appears!")
 
-    battle = SimpleBattle(current_character, enemy)
+    battle = combat_system.SimpleBattle(session.current_character, enemy)
 
     try:
         result = battle.start_battle()
@@ -393,165 +533,281 @@ def explore():
 
             # Give rewards
             try:
-                character_manager.gain_experience(current_character, xp)
+                character_manager.gain_experience(session.current_character, xp)
             except Exception:
-                current_character['experience'] = current_character.get('experience', 0) + xp
+                session.current_character['experience'] = session.current_character.get('experience', 0) + xp
 
-            current_character['gold'] = current_character.get('gold', 0) + gold
-            print(f"You defeated the {enemy.get('name')}! Gained {xp} XP and {gold} gold.")
+            session.current_character['gold'] = session.current_character.get('gold', 0) + gold
+            game_io.write(f"You defeated the {enemy.get('name')}! Gained {xp} XP and {gold} gold.")
 
         else:
-            handle_character_death()
+            handle_character_death(session)
 
     except CharacterDeadError:
-        handle_character_death()
+        handle_character_death(session)
 
 
-def shop():
+def shop(session=None):
     """Shop where players can buy and sell items."""
-    global current_character, all_items
-    from inventory_system import purchase_item, sell_item
-    from inventory_system import InsufficientResourcesError, ItemNotFoundError, InventoryFullError
+    session = get_session(session)
 
     while True:
-        print("\nShop Menu:\n1. Buy Item\n2. Sell Item\n3. Back")
+        game_io.write("\nShop Menu:\n1. Buy Item\n2. Sell Item\n3. Back")
 
-        choice = input("Select an option (1-3): ").strip()
+        choice = game_io.read("Select an option (1-3): ").strip()
 
         if choice == '1':
-            print("\nItems for Sale:")
-            for item_id, item in all_items.items():
-                print(f"  - {item.get('name')} (ID: {item_id}) - Cost: {item.get('cost', 0)} gold")
+            game_io.write("\nItems for Sale:")
+            for item_id, item in session.all_items.items():
+                game_io.write(f"  - {item.get('name')} (ID: {item_id}) - Cost: {item.get('cost', 0)} gold")
 
-            item_id = input("Enter Item ID to buy: ").strip()
+            item_id = game_io.read("Enter Item ID to buy: ").strip()
 
-            if item_id in all_items:
+            if item_id in session.all_items:
                 try:
-                    purchase_item(current_character, item_id, all_items[item_id])
-                    print(f"Purchased '{all_items[item_id]['name']}'!")
+                    inventory_system.purchase_item(session.current_character, item_id, session.all_items[item_id])
+                    game_io.write(f"Purchased '{session.all_items[item_id]['name']}'!")
                 except (InsufficientResourcesError, InventoryFullError) as e:
-                    print(f"Error: {e}")
+                    game_io.write(f"Error: {e}")
             else:
-                print("Invalid Item ID.")
+                game_io.write("Invalid Item ID.")
 
         elif choice == '2':
-            inventory = current_character.get('inventory', [])
+            inventory = session.current_character.get('inventory', [])
 
             if inventory:
-                print("\nYour Inventory:")
+                game_io.write("\nYour Inventory:")
                 for item_id in inventory:
-                    print(f"  - {all_items.get(item_id, {'name': 'Unknown'})['name']} (ID: {item_id})")
+                    game_io.write(f"  - {session.all_items.get(item_id, {'name': 'Unknown'})['name']} (ID: {item_id})")
 
-                item_id = input("Enter Item ID to sell: ").strip()
+                item_id = game_io.read("Enter Item ID to sell: ").strip()
 
-                if item_id in all_items:
+                if item_id in session.all_items:
                     try:
-                        gold = sell_item(current_character, item_id, all_items[item_id])
-                        print(f"Sold '{all_items[item_id]['name']}' for {gold} gold!")
+                        gold = inventory_system.sell_item(session.current_character, item_id, session.all_items[item_id])
+                        game_io.write(f"Sold '{session.all_items[item_id]['name']}' for {gold} gold!")
                     except ItemNotFoundError as e:
-                        print(f"Error: {e}")
+                        game_io.write(f"Error: {e}")
 
                 else:
-                    print("Invalid Item ID.")
+                    game_io.write("Invalid Item ID.")
             else:
-                print("Inventory is empty.")
+                game_io.write("Inventory is empty.")
 
         elif choice == '3':
             break  # Exit shop
 
         else:
-            print("Invalid choice. Enter 1-3.")
+            game_io.write("Invalid choice. Enter 1-3.")
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def save_game():
+def save_game(session=None):
     """Save the current character to a file."""
-    global current_character
+    session = get_session(session)
 
     try:
-        character_manager.save_character(current_character)
-        print("Game saved successfully!")
+        # Goes through the autosaver so an older queued checkpoint can't land after it
+        if not autosave.get_scheduler().flush(session.current_character):
+            raise IOError("the save could not be written")
+        game_io.write("Game saved successfully!")
     except Exception as e:
-        print(f"Error saving game: {e}")
-
+        game_io.write(f"Error saving game: {e}")
 
-def load_game_data():
-    """Load quests and items from files."""
-    global all_quests, all_items
 
-    try:
-        all_quests = game_data.load_quests()
-    except Exception:
-        all_quests = {}
-
-    try:
-        all_items = game_data.load_items()
-    except Exception:
-        all_items = {}
+def load_game_data(session=None, background=False):
+    """Load quests and items from files (in a background thread if asked)."""
+    session = get_session(session)
+    if background:
+        session.catalog = GameCatalog.load_in_background()
+    else:
+        session.catalog = GameCatalog.load()
 
 
-def handle_character_death():
+def handle_character_death(session=None):
     """Handle player death and revival options."""
-    global current_character, game_running
+    session = get_session(session)
 
-    if not current_character:
+    if not session.current_character:
         return
 
-    print(f"\n{current_character.get('name', 'Your character')} has fallen in battle!")
+    game_io.write(f"\n{session.current_character.get('name', 'Your character')} has fallen in battle!")
 
     while True:
-        choice = input("Revive (R) or Quit (Q)? ").strip().upper()
+        choice = game_io.read("Revive (R) or Quit (Q)? ").strip().upper()
 
         if choice == 'R':
             try:
-                character_manager.revive_character(current_character)
-                print(f"{current_character.get('name')} has been revived!")
+                character_manager.revive_character(session.current_character)
+                game_io.write(f"{session.current_character.get('name')} has been revived!")
                 return
             except Exception:
                 # Fallback revival system
                 cost = 10
-                if current_character.get('gold', 0) >= cost:
-                    current_character['gold'] -= cost
-                    current_character['health'] = current_character.get('max_health', 100)
-                    print("You paid the revive fee and were revived.")
+                if session.current_character.get('gold', 0) >= cost:
+                    session.current_character['gold'] -= cost
+                    session.current_character['health'] = session.current_character.get('max_health', 100)
+                    game_io.write("You paid the revive fee and were revived.")
                     return
                 else:
-                    print("Not enough gold to revive!")
+                    game_io.write("Not enough gold to revive!")
 
         elif choice == 'Q':
-            game_running = False
-            print("Thanks for playing Quest Chronicles!")
+            session.game_running = False
+            game_io.write("Thanks for playing Quest Chronicles!")
             return
 
 
 def display_welcome():
     """Display the title screen."""
-    print("=" * 50)
-    print("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
-    print("=" * 50)
-    print("\nWelcome to Quest Chronicles!\nBuild your character, complete quests, and become a legend!\n")
+    game_io.write("=" * 50)
+    game_io.write("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
+    game_io.write("=" * 50)
+    game_io.write("\nWelcome to Quest Chronicles!\nBuild your character, complete quests, and become a legend!\n")
 
 
-def main():
+def main(session=None):
     """Entry point of the game."""
-    display_welcome()
-    load_game_data()
+    session = get_session(session)
+    try:
+        load_game_data(session, background=True)
+        display_welcome()
+        run_main_menu(session)
+    except SessionClosedError:
+        pass
+    finally:
+        game_io.flush()
+
 
-    # Main menu handling
+def run_main_menu(session=None):
+    """Main menu loop for a session, until the player exits."""
     while True:
         choice = main_menu()
 
         if choice == 1:
-            new_game()
+            new_game(session)
         elif choice == 2:
-            load_game()
+            load_game(session)
         elif choice == 3:
-            print("Thanks for playing Quest Chronicles!")
+            game_io.write("Thanks for playing Quest Chronicles!")
             break
 
 
+# ============================================================================
+# SCRIPTED REPLAY
+# ============================================================================
+
+def run_script(script_file, output_file=None):
+    """
+    Play a whole game non-interactively from a transcript of answers
+
+    Each line of script_file answers one prompt. Game output is discarded,
+    or written to output_file if given.
+
+    Returns: The TimedIO used, whose timings list holds (prompt, answer, seconds)
+    Raises: FileNotFoundError if the script does not exist
+    """
+    source = game_io.ScriptSource.from_file(script_file)
+    output = open(output_file, "w") if output_file else None
+    sink = game_io.StreamSink(output) if output else game_io.NullSink()
+    io = game_io.TimedIO(sink, source)
+
+    console = game_io.get_io()
+    game_io.bind_io(io)
+    try:
+        main(GameSession())
+    finally:
+        io.finish()
+        game_io.bind_io(console)
+        if output:
+            output.close()
+    return io
+
+
+def display_script_timings(timings, top=10):
+    """Print a per-command timing report for a scripted run."""
+    total = sum(seconds for _, _, seconds in timings)
+    game_io.write(f"\nScripted run: {len(timings)} commands in {total * 1000:.2f} ms")
+    if total > 0:
+        game_io.write(f"Throughput: {len(timings) / total:.0f} commands/s")
+
+    # Group by the prompt (which menu) and the answer given
+    by_command = {}
+    for prompt, answer, seconds in timings:
+        entry = by_command.setdefault((prompt, answer), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    game_io.write(f"\n{'count':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9}  command")
+    ranked = sorted(by_command.items(), key=lambda pair: pair[1][1], reverse=True)
+    for (prompt, answer), (count, seconds, slowest) in ranked[:top]:
+        game_io.write(f"{count:>6} {seconds * 1000:>10.3f} {seconds / count * 1000:>9.3f} "
+                      f"{slowest * 1000:>9.3f}  {prompt} {answer}")
+
+
+def cli(argv=None):
+    """Command line entry point: interactive by default, or --script replay, optionally with --metrics, --profile, --storage and --cache."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quest Chronicles")
+    parser.add_argument("--script", help="answer prompts from this transcript file instead of the keyboard")
+    parser.add_argument("--output", help="with --script, write game output to this file instead of discarding it")
+    parser.add_argument("--top", type=int, default=10, help="how many rows to list in the timing and profile reports")
+    parser.add_argument("--metrics", help="record hot-path metrics and write them to this file (Prometheus text format) on exit")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="profile the session and write PREFIX.pstats and PREFIX.collapsed (flamegraph stacks)")
+    parser.add_argument("--storage", default="directory",
+                        help="where characters are saved: directory[:zlib|lzma] (default: uncompressed directory), memory or sqlite[:FILE][:zlib|lzma]")
+    parser.add_argument("--cache", type=int, metavar="SIZE",
+                        help="keep up to SIZE characters in an LRU cache and write saves back lazily")
+    parser.add_argument("--autosave-seconds", type=float,
+                        help="autosave changed characters at least this often (default 30)")
+    parser.add_argument("--autosave-actions", type=int,
+                        help="autosave changed characters after this many actions (default 10)")
+    args = parser.parse_args(argv)
+
+    if args.storage != "directory":
+        import character_storage
+        try:
+            character_manager.set_storage_backend(character_storage.create_backend(args.storage))
+        except ValueError as e:
+            parser.error(str(e))
+    if args.cache:
+        character_manager.enable_character_cache(args.cache)
+    if args.autosave_seconds or args.autosave_actions:
+        autosave.configure(args.autosave_seconds or autosave.DEFAULT_INTERVAL,
+                           args.autosave_actions or autosave.DEFAULT_EVERY_ACTIONS)
+
+    if args.metrics:
+        import instrumentation
+        instrumentation.enable()
+    try:
+        if args.profile:
+            import profiling
+            _, rows = profiling.profile_call(run_cli, args, output_prefix=args.profile, top=args.top)
+            profiling.display_profile_summary(rows, args.profile)
+        else:
+            run_cli(args)
+    finally:
+        if args.metrics:
+            instrumentation.disable()
+            instrumentation.write_prometheus(args.metrics)
+
+
+def run_cli(args):
+    """Run the game the way the parsed command line asks."""
+    if not args.script:
+        main()
+        return
+
+    io = run_script(args.script, args.output)
+    display_script_timings(io.timings, args.top)
+    game_io.flush()
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,160 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Profiling Module
+
+Runs a game session or simulation under cProfile and a sampling profiler
+at the same time, so real player flows can be profiled without editing code.
+
+profile_call() writes two files next to each other:
+    <prefix>.pstats     - cProfile statistics (open with pstats or snakeviz)
+    <prefix>.collapsed  - "frame;frame;frame count" lines from the sampler,
+                          ready for flamegraph.pl or speedscope
+
+and returns the top-N game functions by cumulative time.
+
+The sampler reads the profiled thread's stack from sys._current_frames()
+every `interval` seconds. It measures wall-clock time, so time spent
+waiting at a prompt shows up under the input functions.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import game_io
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_INTERVAL = 0.001
+DEFAULT_TOP = 15
+
+# ============================================================================
+# SAMPLING PROFILER
+# ============================================================================
+
+def frame_label(frame):
+    """Return 'module:function' for a stack frame (Class.method where known)"""
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    Background thread that periodically records one thread's call stack
+
+    samples maps a collapsed stack ("outer;...;inner") to how many times
+    it was seen.
+    """
+
+    def __init__(self, thread_id=None, interval=DEFAULT_INTERVAL):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    def collapsed_lines(self):
+        """Return the samples as flamegraph collapsed-stack lines"""
+        return [f"{stack} {count}" for stack, count in sorted(self.samples.items())]
+
+    def write_collapsed(self, filename):
+        with open(filename, "w") as f:
+            for line in self.collapsed_lines():
+                f.write(line + "\n")
+        return True
+
+# ============================================================================
+# REPORTS
+# ============================================================================
+
+def game_function_stats(stats, top=DEFAULT_TOP):
+    """
+    Return the slowest game functions from a pstats.Stats object
+
+    Only functions defined in this project (other than the profiler
+    itself) are listed, ranked by cumulative time.
+
+    Returns: List of {'function', 'calls', 'total_seconds', 'cumulative_seconds'}
+    """
+    rows = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+        path = os.path.abspath(filename)
+        if not path.startswith(PROJECT_DIR + os.sep) or path == os.path.abspath(__file__):
+            continue
+        module = os.path.splitext(os.path.relpath(path, PROJECT_DIR))[0].replace(os.sep, ".")
+        rows.append({
+            'function': f"{module}:{name}",
+            'calls': calls,
+            'total_seconds': total,
+            'cumulative_seconds': cumulative
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:top]
+
+
+def display_profile_summary(rows, output_prefix):
+    """Print the top game functions and where the profile files went"""
+    game_io.write(f"\nProfile written to {output_prefix}.pstats and {output_prefix}.collapsed")
+    game_io.write(f"\n{'calls':>8} {'own ms':>10} {'cumulative ms':>14}  function")
+    for row in rows:
+        game_io.write(f"{row['calls']:>8} {row['total_seconds'] * 1000:>10.3f} "
+                      f"{row['cumulative_seconds'] * 1000:>14.3f}  {row['function']}")
+    game_io.flush()
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def profile_call(func, *args, output_prefix="profile", top=DEFAULT_TOP,
+                 interval=DEFAULT_INTERVAL, **kwargs):
+    """
+    Call func(*args, **kwargs) under cProfile and the sampling profiler
+
+    Writes <output_prefix>.pstats and <output_prefix>.collapsed even if func
+    raises.
+
+    Returns: (func's return value, list of the top game function rows)
+    """
+    directory = os.path.dirname(output_prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    sampler = SamplingProfiler(interval=interval)
+    sampler.start()
+    profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        sampler.stop()
+        profiler.dump_stats(f"{output_prefix}.pstats")
+        sampler.write_collapsed(f"{output_prefix}.collapsed")
+
+    rows = game_function_stats(pstats.Stats(profiler), top)
+    return result, rows
@@ -19,6 +19,8 @@ from custom_exceptions import (
     InsufficientLevelError
 )
 from inventory_system import add_item_to_inventory, InventoryFullError
+from character_manager import mark_dirty
+import game_io
 
 # -------------------------
 # QUEST MANAGEMENT
@@ -49,6 +51,7 @@ def accept_quest(character, quest_id, quest_data_dict):
 
     # Add quest to active list
     character['active_quests'].append(quest_id)
+    mark_dirty(character, 'active_quests')
     return True
 
 def complete_quest(character, quest_id, quest_data_dict, item_data_dict=None):
@@ -64,6 +67,7 @@ def complete_quest(character, quest_id, quest_data_dict, item_data_dict=None):
     # Move quest from active to completed
     character['active_quests'].remove(quest_id)
     character['completed_quests'].append(quest_id)
+    mark_dirty(character, 'active_quests', 'completed_quests')
 
     # Reward XP and gold
     character['experience'] += quest['reward_xp']
@@ -77,7 +81,7 @@ def complete_quest(character, quest_id, quest_data_dict, item_data_dict=None):
                 add_item_to_inventory(character, item_id)
                 rewarded_items.append(item_id)
             except InventoryFullError:
-                print(f"Inventory full! Cannot add '{item_id}'")
+                game_io.write(f"Inventory full! Cannot add '{item_id}'")
 
     return {
         'reward_xp': quest['reward_xp'],
@@ -89,6 +93,7 @@ def abandon_quest(character, quest_id):
     if quest_id not in character['active_quests']:
         raise QuestNotActiveError(f"Quest '{quest_id}' not active")
     character['active_quests'].remove(quest_id)
+    mark_dirty(character, 'active_quests')
     return True
 
 # -------------------------
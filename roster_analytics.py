@@ -0,0 +1,297 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Roster Analytics Module
+
+Answers questions about a whole save directory (class distribution, gold
+inflation, quest completion funnels) without loading characters one at a
+time through load_character.
+
+scan_saves() walks the directory with os.scandir and hands the save files
+to a process pool in chunks. Each worker reads and parses its chunk with the
+same decode_save/parse_character functions the directory backend uses,
+then validate_character_data, so saves load_character would reject are
+reported as errors rather than counted. Parsed characters come back lazily,
+in directory order, with only a few chunks in flight at once, so a scan of
+millions of saves never holds more than a few hundred characters in memory.
+
+RosterStats aggregates the stream in one pass. Its memory grows with the
+number of distinct classes, levels, quests and items, never with the number
+of characters.
+
+Usage: python roster_analytics.py [--save-dir data/save_games] [--workers 4]
+"""
+
+import math
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from character_storage import SAVE_SUFFIX, decode_save, parse_character
+from character_manager import validate_character_data
+
+DEFAULT_SCAN_CHUNK_SIZE = 256
+# Corrupted saves remembered by name in a report (the rest are only counted)
+MAX_ERROR_EXAMPLES = 20
+
+# ============================================================================
+# SCANNER
+# ============================================================================
+
+def iter_save_files(save_directory):
+    """Yield (character name, path) for every save file, without listing them all first"""
+    try:
+        entries = os.scandir(save_directory)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.endswith(SAVE_SUFFIX) and entry.is_file():
+                yield entry.name[:-len(SAVE_SUFFIX)], entry.path
+
+
+def parse_save_files(files):
+    """
+    Read, parse and validate a chunk of (name, path) pairs (runs in a worker process)
+
+    Returns: list of (name, character or None, error message or None)
+    """
+    results = []
+    for name, path in files:
+        try:
+            with open(path, "rb") as f:
+                text, _ = decode_save(f.read(), name)
+            character = parse_character(text, name)
+            validate_character_data(character)
+            results.append((name, character, None))
+        except Exception as e:
+            results.append((name, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def scan_saves(save_directory="data/save_games", workers=None, chunk_size=DEFAULT_SCAN_CHUNK_SIZE):
+    """
+    Lazily yield (name, character, error) for every save in save_directory
+
+    character is None and error describes the problem for saves that cannot
+    be read. workers=None uses one process per CPU; 0 or 1 parses in this
+    process. At most 2 * workers chunks are parsed ahead of the consumer.
+    """
+    chunks = _chunks(iter_save_files(save_directory), chunk_size)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for chunk in chunks:
+            yield from parse_save_files(chunk)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    in_flight = deque()
+    try:
+        for chunk in chunks:
+            in_flight.append(executor.submit(parse_save_files, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:
+        # Also reached when the consumer stops early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def scan_characters(save_directory="data/save_games", workers=None, chunk_size=DEFAULT_SCAN_CHUNK_SIZE):
+    """Lazily yield every readable character in save_directory"""
+    for _, character, error in scan_saves(save_directory, workers, chunk_size):
+        if error is None:
+            yield character
+
+# ============================================================================
+# AGGREGATION
+# ============================================================================
+
+def bucket_for(value):
+    """Power-of-two bucket label for a non-negative count: '0', '1', '2-3', '4-7', ..."""
+    if value <= 0:
+        return "0"
+    low = 1 << (value.bit_length() - 1)
+    high = 2 * low - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+class RosterStats:
+    """
+    One-pass roster statistics with memory bounded by the catalog size
+
+    add(character) folds in one character; add_error(name, error) counts an
+    unreadable save; report() returns the summary dictionary.
+    """
+
+    def __init__(self):
+        self.characters = 0
+        self.errors = 0
+        self.error_examples = []
+        self.classes = Counter()
+        self.levels = Counter()
+        # Gold: running mean/variance (Welford) plus power-of-two histogram
+        self.gold_mean = 0.0
+        self.gold_m2 = 0.0
+        self.gold_min = None
+        self.gold_max = None
+        self.gold_buckets = Counter()
+        # {level: total gold}, for gold per level (inflation)
+        self.gold_by_level = Counter()
+        # Quest funnel: characters with each quest active / completed
+        self.quests_active = Counter()
+        self.quests_completed = Counter()
+        self.completed_buckets = Counter()
+        self.items = Counter()
+
+    def add(self, character):
+        self.characters += 1
+        level = character.get('level', 0)
+        gold = character.get('gold', 0)
+        self.classes[character.get('class')] += 1
+        self.levels[level] += 1
+
+        delta = gold - self.gold_mean
+        self.gold_mean += delta / self.characters
+        self.gold_m2 += delta * (gold - self.gold_mean)
+        self.gold_min = gold if self.gold_min is None else min(self.gold_min, gold)
+        self.gold_max = gold if self.gold_max is None else max(self.gold_max, gold)
+        self.gold_buckets[bucket_for(gold)] += 1
+        self.gold_by_level[level] += gold
+
+        completed = character.get('completed_quests', [])
+        self.quests_active.update(character.get('active_quests', []))
+        self.quests_completed.update(completed)
+        self.completed_buckets[bucket_for(len(completed))] += 1
+        self.items.update(character.get('inventory', []))
+
+    def add_error(self, name, error):
+        self.errors += 1
+        if len(self.error_examples) < MAX_ERROR_EXAMPLES:
+            self.error_examples.append((name, error))
+
+    def report(self, top=10):
+        """
+        Returns: {'characters', 'errors', 'error_examples',
+                  'classes': {class: count}, 'levels': {level: count},
+                  'gold': {'mean', 'stddev', 'min', 'max', 'histogram'},
+                  'gold_per_level': {level: average gold},
+                  'quests_completed_histogram': {bucket: characters},
+                  'quest_funnel': {quest_id: {'active', 'completed', 'completion_rate'}},
+                  'top_items': [(item_id, copies), ...] (`top` most held)}
+        """
+        count = self.characters
+        funnel = {}
+        for quest_id in self.quests_active.keys() | self.quests_completed.keys():
+            active = self.quests_active[quest_id]
+            completed = self.quests_completed[quest_id]
+            funnel[quest_id] = {
+                'active': active,
+                'completed': completed,
+                'completion_rate': completed / (active + completed)
+            }
+
+        return {
+            'characters': count,
+            'errors': self.errors,
+            'error_examples': list(self.error_examples),
+            'classes': dict(self.classes.most_common()),
+            'levels': dict(sorted(self.levels.items())),
+            'gold': {
+                'mean': self.gold_mean,
+                'stddev': math.sqrt(self.gold_m2 / count) if count else 0.0,
+                'min': self.gold_min,
+                'max': self.gold_max,
+                'histogram': dict(sorted(self.gold_buckets.items(), key=lambda item: int(item[0].split("-")[0])))
+            },
+            'gold_per_level': {level: self.gold_by_level[level] / self.levels[level]
+                               for level in sorted(self.levels)},
+            'quests_completed_histogram': dict(sorted(self.completed_buckets.items(),
+                                                      key=lambda item: int(item[0].split("-")[0]))),
+            'quest_funnel': dict(sorted(funnel.items())),
+            'top_items': self.items.most_common(top)
+        }
+
+
+def analyze_roster(save_directory="data/save_games", workers=None, chunk_size=DEFAULT_SCAN_CHUNK_SIZE,
+                   where=None, top=10):
+    """
+    Scan a save directory once and return RosterStats.report()
+
+    where, if given, is a predicate choosing which characters to count
+    (unreadable saves are counted as errors either way).
+    """
+    stats = RosterStats()
+    for name, character, error in scan_saves(save_directory, workers, chunk_size):
+        if error is not None:
+            stats.add_error(name, error)
+        elif where is None or where(character):
+            stats.add(character)
+    return stats.report(top)
+
+
+def display_report(report, funnel_rows=10):
+    """Print a roster report"""
+    print(f"\n{report['characters']} characters, {report['errors']} unreadable saves")
+    for name, error in report['error_examples']:
+        print(f"  ! {name}: {error}")
+
+    print("\nClasses:")
+    for character_class, count in report['classes'].items():
+        print(f"  {character_class:<10} {count:>8}")
+
+    gold = report['gold']
+    print(f"\nGold: mean {gold['mean']:.1f}, stddev {gold['stddev']:.1f}, min {gold['min']}, max {gold['max']}")
+    print(f"{'level':>7} {'characters':>11} {'avg gold':>10}")
+    for level, average in report['gold_per_level'].items():
+        print(f"{level:>7} {report['levels'][level]:>11} {average:>10.1f}")
+
+    print("\nCompleted quests per character:")
+    for bucket, count in report['quests_completed_histogram'].items():
+        print(f"  {bucket:>9} {count:>8}")
+
+    print(f"\n{'quest':<24} {'active':>8} {'completed':>10} {'rate':>6}")
+    busiest = sorted(report['quest_funnel'].items(),
+                     key=lambda item: item[1]['active'] + item[1]['completed'], reverse=True)
+    for quest_id, stage in busiest[:funnel_rows]:
+        print(f"{quest_id:<24} {stage['active']:>8} {stage['completed']:>10} {stage['completion_rate']:>6.0%}")
+
+    print("\nMost held items:")
+    for item_id, copies in report['top_items']:
+        print(f"  {item_id:<24} {copies:>8}")
+
+
+def cli(argv=None):
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quest Chronicles roster statistics")
+    parser.add_argument("--save-dir", default="data/save_games", help="directory of save files to scan")
+    parser.add_argument("--workers", type=int, help="parser processes (default: one per CPU, 1 = no pool)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_SCAN_CHUNK_SIZE, help="saves per worker task")
+    parser.add_argument("--class", dest="character_class", help="only count characters of this class")
+    parser.add_argument("--top", type=int, default=10, help="rows in the quest funnel and item tables")
+    args = parser.parse_args(argv)
+
+    where = None
+    if args.character_class:
+        where = lambda character: character.get('class') == args.character_class
+
+    report = analyze_roster(args.save_dir, args.workers, args.chunk_size, where, args.top)
+    display_report(report, args.top)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,202 @@
+"""
+Test Benchmarks
+Times every subsystem's hot path at several data sizes (needs pytest-benchmark)
+
+The baseline holds absolute timings from one machine, so the suite only runs
+when asked for (QC_BENCHMARK=1); a plain `pytest` run skips it:
+
+    QC_BENCHMARK=1 python -m pytest tests/test_benchmarks.py
+
+Each benchmark's mean time is compared with tests/benchmark_baseline.json and
+fails if it is more than QC_BENCHMARK_TOLERANCE (default 2.0) times slower.
+Benchmarks missing from the baseline are only reported. After an intended
+speed change, or on a new machine, re-record the baseline with:
+
+    QC_BENCHMARK_UPDATE=1 python -m pytest tests/test_benchmarks.py
+"""
+
+import pytest
+import sys
+import os
+import json
+
+UPDATE_BASELINE = os.environ.get("QC_BENCHMARK_UPDATE") == "1"
+if os.environ.get("QC_BENCHMARK") != "1" and not UPDATE_BASELINE:
+    pytest.skip("benchmarks are opt-in: set QC_BENCHMARK=1", allow_module_level=True)
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import battle_engine
+import game_data
+import data_generator
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+TOLERANCE = float(os.environ.get("QC_BENCHMARK_TOLERANCE", 2.0))
+
+CATALOG_SIZES = [100, 1000, 10000]
+HISTORY_SIZES = [10, 100, 1000]
+HORDE_SIZES = [10, 100, 1000]
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def make_veteran(name, history):
+    """A character with `history` completed quests and a full inventory"""
+    character = character_manager.create_character(name, "Warrior")
+    character['level'] = 10
+    character['completed_quests'] = [f"quest_{i}" for i in range(history)]
+    character['inventory'] = [f"item_{i % 50}" for i in range(inventory_system.MAX_INVENTORY_SIZE)]
+    return character
+
+
+@pytest.fixture(scope="module")
+def data_files(tmp_path_factory):
+    """{size: (quests file, items file)} for every catalog size"""
+    directory = tmp_path_factory.mktemp("benchmark_data")
+    files = {}
+    for size in CATALOG_SIZES:
+        quests_file = str(directory / f"quests_{size}.txt")
+        items_file = str(directory / f"items_{size}.txt")
+        data_generator.write_quests_file(data_generator.generate_quests(size), quests_file)
+        data_generator.write_items_file(data_generator.generate_items(size), items_file)
+        files[size] = (quests_file, items_file)
+    return files
+
+# ============================================================================
+# BASELINE
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def baseline():
+    """Stored mean seconds per benchmark; rewritten at the end in update mode"""
+    stored = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r") as f:
+            stored = json.load(f)
+    yield stored
+    if UPDATE_BASELINE:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(dict(sorted(stored.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture
+def timed(benchmark, baseline, request):
+    """Run benchmark(func, *args) and check its mean against the baseline"""
+    def run(func, *args):
+        result = benchmark(func, *args)
+        mean = benchmark.stats.stats.mean
+        name = request.node.name
+        if UPDATE_BASELINE:
+            baseline[name] = mean
+        elif name in baseline:
+            limit = baseline[name] * TOLERANCE
+            assert mean <= limit, (
+                f"{name} regressed: mean {mean * 1e6:.1f} us > {limit * 1e6:.1f} us "
+                f"({TOLERANCE}x baseline {baseline[name] * 1e6:.1f} us)"
+            )
+        return result
+    return run
+
+# ============================================================================
+# GAME DATA BENCHMARKS
+# ============================================================================
+
+@pytest.mark.parametrize("size", CATALOG_SIZES)
+def test_load_quests(timed, data_files, size):
+    quests = timed(game_data.load_quests, data_files[size][0])
+    assert len(quests) == size
+
+
+@pytest.mark.parametrize("size", CATALOG_SIZES)
+def test_load_items(timed, data_files, size):
+    items = timed(game_data.load_items, data_files[size][1])
+    assert len(items) == size
+
+# ============================================================================
+# SAVE / LOAD BENCHMARKS
+# ============================================================================
+
+@pytest.mark.parametrize("history", HISTORY_SIZES)
+def test_save_load_round_trip(timed, tmp_path, history):
+    character = make_veteran("BenchHero", history)
+    save_directory = str(tmp_path)
+
+    def round_trip():
+        # force: the character is clean after the first round, and an
+        # unchanged save would otherwise be skipped and only the load timed
+        assert character_manager.save_character(character, save_directory, force=True)
+        return character_manager.load_character("BenchHero", save_directory)
+
+    loaded = timed(round_trip)
+    assert loaded['completed_quests'] == character['completed_quests']
+
+# ============================================================================
+# QUEST BENCHMARKS
+# ============================================================================
+
+@pytest.mark.parametrize("size", CATALOG_SIZES)
+def test_get_available_quests(timed, data_files, size):
+    quests = game_data.load_quests(data_files[size][0])
+    character = make_veteran("QuestHero", size // 2)
+
+    available = timed(quest_handler.get_available_quests, character, quests)
+    assert available
+
+# ============================================================================
+# INVENTORY BENCHMARKS
+# ============================================================================
+
+def test_inventory_operations(timed):
+    character = make_veteran("BagHero", 0)
+    character['gold'] = 10 ** 12
+    items = {
+        'item_0': {'type': 'consumable', 'effect': 'health:5', 'cost': 10},
+        'item_1': {'type': 'weapon', 'effect': 'strength:3', 'cost': 50},
+    }
+
+    def shop_cycle():
+        inventory_system.sell_item(character, 'item_0', items['item_0'])
+        inventory_system.purchase_item(character, 'item_0', items['item_0'])
+        inventory_system.count_item(character, 'item_1')
+        inventory_system.has_item(character, 'item_49')
+        inventory_system.remove_item_from_inventory(character, 'item_1')
+        inventory_system.add_item_to_inventory(character, 'item_1')
+        return inventory_system.get_inventory_space_remaining(character)
+
+    assert timed(shop_cycle) == 0
+
+# ============================================================================
+# BATTLE BENCHMARKS
+# ============================================================================
+
+def test_predict_outcome(timed):
+    character = character_manager.create_character("Duelist", "Rogue")
+    enemy = combat_system.create_enemy("orc")
+
+    result = timed(combat_system.predict_outcome, character, enemy)
+    assert result['winner'] in ('player', 'enemy')
+
+
+@pytest.mark.parametrize("horde_size", HORDE_SIZES)
+def test_party_battle(timed, horde_size):
+    def battle():
+        party = [make_veteran(f"Hero{i}", 0) for i in range(4)]
+        for hero in party:
+            hero['strength'] += 40
+            hero['max_health'] = hero['health'] = 5000
+        horde = [combat_system.create_enemy("goblin") for _ in range(horde_size)]
+        return battle_engine.PartyBattle(party, horde).run()
+
+    assert timed(battle)['turns'] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
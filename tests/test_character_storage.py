@@ -0,0 +1,635 @@
+"""
+Test Character Storage
+Tests the storage backends behind character_manager's save/load functions
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import character_storage
+import inventory_system
+import quest_handler
+from custom_exceptions import CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+
+BACKENDS = ["directory", "directory:zlib", "memory", "sqlite", "sqlite:lzma"]
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, tmp_path):
+    """Each storage backend in turn, installed as character_manager's backend"""
+    if request.param.startswith("sqlite"):
+        compression = request.param.partition(":")[2] or None
+        storage = character_storage.SqliteBackend(str(tmp_path / "characters.db"), compression, min_bytes=0)
+    elif request.param == "directory:zlib":
+        storage = character_storage.DirectoryBackend("zlib", min_bytes=0)
+    else:
+        storage = character_storage.create_backend(request.param)
+    previous = character_manager.set_storage_backend(storage)
+    yield storage
+    character_manager.set_storage_backend(previous)
+    storage.close()
+
+
+def make_hero(name="StoredHero"):
+    character = character_manager.create_character(name, "Cleric")
+    character['inventory'] = ['health_potion', 'iron_sword']
+    character['completed_quests'] = ['first_steps']
+    character['gold'] = 321
+    return character
+
+# ============================================================================
+# BACKEND TESTS
+# ============================================================================
+
+def test_round_trip_through_public_functions(backend, tmp_path):
+    """Test that save/list/load/delete behave the same on every backend"""
+    save_directory = str(tmp_path / "saves")
+    hero = make_hero()
+
+    assert character_manager.save_character(hero, save_directory) is True
+    assert character_manager.list_saved_characters(save_directory) == ["StoredHero"]
+    assert character_manager.load_character("StoredHero", save_directory) == hero
+
+    hero['gold'] = 5
+    character_manager.save_character(hero, save_directory)
+    assert character_manager.load_character("StoredHero", save_directory)['gold'] == 5
+
+    assert character_manager.delete_character("StoredHero", save_directory) is True
+    assert character_manager.list_saved_characters(save_directory) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("StoredHero", save_directory)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("StoredHero", save_directory)
+
+def test_save_directories_are_separate_rosters(backend, tmp_path):
+    """Test that each save_directory namespace only sees its own characters"""
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    character_manager.save_character(make_hero("Alpha"), first)
+    character_manager.save_character(make_hero("Beta"), second)
+
+    assert character_manager.list_saved_characters(first) == ["Alpha"]
+    assert character_manager.list_saved_characters(second) == ["Beta"]
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Beta", first)
+
+def test_loaded_character_is_a_copy(backend, tmp_path):
+    """Test that changing a character after saving does not change the save"""
+    save_directory = str(tmp_path / "saves")
+    hero = make_hero()
+    character_manager.save_character(hero, save_directory)
+
+    hero['inventory'].append('steel_sword')
+
+    assert character_manager.load_character("StoredHero", save_directory)['inventory'] == ['health_potion', 'iron_sword']
+
+def test_parse_character_rejects_malformed_text():
+    """Test that unreadable save text raises SaveFileCorruptedError"""
+    with pytest.raises(SaveFileCorruptedError):
+        character_storage.parse_character("name: Broken\nthis line has no separator\n", "Broken")
+
+def test_create_backend_rejects_unknown_spec():
+    """Test that an unknown backend description raises ValueError"""
+    with pytest.raises(ValueError):
+        character_storage.create_backend("floppy")
+
+def test_create_backend_selects_sqlite_compression(tmp_path, monkeypatch):
+    """Test that sqlite specs take an optional file and an optional codec"""
+    monkeypatch.chdir(tmp_path)
+    database = str(tmp_path / "packed.db")
+    for spec, path, compression in [(f"sqlite:{database}:lzma", database, "lzma"),
+                                     (f"sqlite:{database}", database, None),
+                                     ("sqlite:zlib", "data/characters.db", "zlib")]:
+        storage = character_storage.create_backend(spec)
+        assert (storage.database, storage.compression) == (path, compression)
+        storage.close()
+
+def test_compressed_saves_are_smaller_and_load_anywhere(tmp_path):
+    """Test that big saves shrink and any directory backend reads either format"""
+    save_directory = str(tmp_path / "saves")
+    veteran = make_hero("Veteran")
+    veteran['completed_quests'] = [f"quest_{i:05d}" for i in range(2000)]
+    veteran['inventory'] = [f"item_{i % 40:03d}" for i in range(500)]
+    path = os.path.join(save_directory, "Veteran_save.txt")
+
+    character_storage.DirectoryBackend().save(veteran, save_directory)
+    plain_size = os.path.getsize(path)
+    for codec in character_storage.COMPRESSION_CODECS:
+        character_storage.DirectoryBackend(codec).save(veteran, save_directory)
+        with open(path, "rb") as f:
+            assert f.read().startswith(b"QCSAVE " + codec.encode() + b" ")
+        assert os.path.getsize(path) < plain_size / 5
+        assert character_storage.DirectoryBackend().load("Veteran", save_directory) == veteran
+
+    # Small saves stay readable text (after the header) even with compression on
+    character_storage.DirectoryBackend("zlib").save(make_hero("Rookie"), save_directory)
+    with open(os.path.join(save_directory, "Rookie_save.txt")) as f:
+        assert f.readline().startswith("QCSAVE plain ")
+        assert f.readline() == "name: Rookie\n"
+
+def test_damaged_compressed_save_is_corrupted(tmp_path):
+    """Test that a compressed save that will not decompress raises SaveFileCorruptedError"""
+    save_directory = str(tmp_path / "saves")
+    character_storage.DirectoryBackend("zlib", min_bytes=0).save(make_hero(), save_directory)
+    path = os.path.join(save_directory, "StoredHero_save.txt")
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_storage.DirectoryBackend().load("StoredHero", save_directory)
+    with pytest.raises(ValueError):
+        character_storage.create_backend("directory:bzip2")
+
+def rewrite_save(path, change):
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(change(data))
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:-10],                                         # truncated
+    lambda data: data.replace(b"gold: 321", b"gold: 999"),           # bit rot
+    lambda data: data + b"level: 99\n",                              # appended
+])
+def test_checksum_rejects_damaged_saves(damage, tmp_path):
+    """Test that a length or checksum mismatch raises SaveFileCorruptedError"""
+    save_directory = str(tmp_path / "saves")
+    character_storage.DirectoryBackend().save(make_hero(), save_directory)
+    rewrite_save(os.path.join(save_directory, "StoredHero_save.txt"), damage)
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_storage.DirectoryBackend().load("StoredHero", save_directory)
+
+def test_load_validation_skipped_only_for_checksummed_saves(tmp_path):
+    """Test that trust_checksum skips validate_character_data only when a checksum matched"""
+    save_directory = str(tmp_path / "saves")
+    previous = character_manager.set_storage_backend(character_storage.DirectoryBackend())
+    try:
+        hero = make_hero()
+        del hero['magic']
+        character_manager.save_character(hero, save_directory)
+        path = os.path.join(save_directory, "StoredHero_save.txt")
+
+        with pytest.raises(InvalidSaveDataError):
+            character_manager.load_character("StoredHero", save_directory)
+        assert 'magic' not in character_manager.load_character("StoredHero", save_directory, trust_checksum=True)
+
+        # A save written before checksums (no header) is always validated
+        rewrite_save(path, lambda data: data.partition(b"\n")[2])
+        with pytest.raises(InvalidSaveDataError):
+            character_manager.load_character("StoredHero", save_directory, trust_checksum=True)
+
+        character_manager.save_character(make_hero(), save_directory, force=True)
+        rewrite_save(path, lambda data: data.partition(b"\n")[2])
+        assert character_manager.load_character("StoredHero", save_directory)['gold'] == 321
+    finally:
+        character_manager.set_storage_backend(previous)
+
+# ============================================================================
+# SQLITE STORE TESTS
+# ============================================================================
+
+def make_roster(count):
+    classes = ["Warrior", "Mage", "Rogue", "Cleric"]
+    roster = []
+    for i in range(count):
+        character = character_manager.create_character(f"Member{i:03d}", classes[i % 4])
+        character['level'] = 1 + i % 20
+        character['gold'] = i * 10
+        roster.append(character)
+    return roster
+
+def test_sqlite_save_many_and_roster_queries(tmp_path):
+    """Test batched upserts and the indexed roster queries"""
+    store = character_storage.SqliteBackend(str(tmp_path / "roster.db"))
+    roster = make_roster(200)
+
+    assert store.save_many(roster, "realm") == 200
+    assert store.list_names("realm") == sorted(c['name'] for c in roster)
+
+    veterans = store.characters_above_level(15, "realm")
+    assert len(veterans) == sum(1 for c in roster if c['level'] > 15)
+    assert [c['level'] for c in veterans] == sorted((c['level'] for c in veterans), reverse=True)
+    assert all(c['class'] == "Mage" for c in store.characters_by_class("Mage", "realm"))
+    assert len(store.characters_by_class("Mage", "realm")) == 50
+    assert [c['gold'] for c in store.characters_with_gold(1950, "realm")] == [1990, 1980, 1970, 1960, 1950]
+
+    # Upserting again updates rows instead of duplicating them
+    roster[0]['level'] = 99
+    store.save_many(roster[:1], "realm")
+    assert store.characters_above_level(50, "realm")[0]['name'] == "Member000"
+    assert len(store.list_names("realm")) == 200
+    store.close()
+
+def test_sqlite_partial_save_keeps_indexed_columns_in_step(tmp_path):
+    """Test that a partial save rewrites every indexed column along with the save text"""
+    store = character_storage.SqliteBackend(str(tmp_path / "characters.db"))
+    hero = make_hero()
+    store.save(hero, "realm")
+    rival = dict(hero, level=6)
+    store.save(rival, "realm")
+
+    hero['gold'] += 1
+    store.save_fields(hero, {'gold'}, "realm")
+
+    assert store.characters_above_level(hero['level'], "realm") == []
+    assert store.load("StoredHero", "realm") == hero
+    store.close()
+
+def test_sqlite_uses_wal_and_indexes(tmp_path):
+    """Test that file databases run in WAL mode with the roster indexes"""
+    database = str(tmp_path / "wal.db")
+    store = character_storage.SqliteBackend(database)
+    store.save(make_hero(), "realm")
+
+    connection = sqlite3.connect(database)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[1] for row in connection.execute("PRAGMA index_list(characters)")}
+    assert {"characters_class", "characters_level", "characters_gold"} <= indexes
+    plan = " ".join(str(row) for row in connection.execute(
+        "EXPLAIN QUERY PLAN SELECT name FROM characters WHERE namespace = 'realm' AND level > 3"))
+    assert "characters_level" in plan
+    connection.close()
+    store.close()
+
+def test_sqlite_migrates_old_schema(tmp_path):
+    """Test that databases without the roster columns are upgraded in place"""
+    database = str(tmp_path / "old.db")
+    connection = sqlite3.connect(database)
+    connection.execute("CREATE TABLE characters (namespace TEXT NOT NULL, name TEXT NOT NULL,"
+                       " data TEXT NOT NULL, PRIMARY KEY (namespace, name))")
+    hero = make_hero("OldTimer")
+    hero['level'] = 7
+    connection.execute("INSERT INTO characters VALUES (?, ?, ?)",
+                       ("realm", "OldTimer", character_storage.serialize_character(hero)))
+    connection.commit()
+    connection.close()
+
+    store = character_storage.SqliteBackend(database)
+    assert [c['name'] for c in store.characters_above_level(5, "realm")] == ["OldTimer"]
+    assert store.load("OldTimer", "realm") == hero
+    store.close()
+
+def test_sqlite_import_from_directory_and_concurrent_saves(tmp_path):
+    """Test importing a save directory and saving from many threads at once"""
+    save_directory = str(tmp_path / "saves")
+    directory = character_storage.DirectoryBackend()
+    for character in make_roster(20):
+        directory.save(character, save_directory)
+
+    store = character_storage.SqliteBackend(str(tmp_path / "import.db"))
+    assert store.import_from(directory, save_directory) == 20
+    assert store.list_names(save_directory) == sorted(directory.list_names(save_directory))
+
+    def save_batch(start):
+        for character in make_roster(start + 25)[start:]:
+            store.save(character, "threads")
+
+    threads = [threading.Thread(target=save_batch, args=(i * 25,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.list_names("threads")) == 100
+    store.close()
+
+def test_sqlite_pool_never_exceeds_max_connections(tmp_path):
+    """Test that busy threads wait for a pooled connection instead of opening more"""
+    store = character_storage.SqliteBackend(str(tmp_path / "pool.db"), max_connections=2)
+    barrier = threading.Barrier(8)
+
+    def save_batch(start):
+        barrier.wait()
+        for character in make_roster(start + 20)[start:]:
+            store.save(character, "pool")
+            store.load(character['name'], "pool")
+
+    threads = [threading.Thread(target=save_batch, args=(i * 20,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.list_names("pool")) == 160
+    assert len(store.connections) <= 2
+    store.close()
+
+# ============================================================================
+# CACHE TESTS
+# ============================================================================
+
+def test_cache_sees_sqlite_writes_from_another_process(tmp_path):
+    """Test that cached SQLite entries are revalidated against the row's revision"""
+    database = str(tmp_path / "shared.db")
+    cache = character_storage.CachedBackend(character_storage.SqliteBackend(database), capacity=10)
+    other_process = character_storage.SqliteBackend(database)
+    hero = make_hero()
+    other_process.save(hero, "realm")
+
+    assert cache.load("StoredHero", "realm")['gold'] == 321
+    assert cache.load("StoredHero", "realm")['gold'] == 321
+    assert cache.stats['hits'] == 1
+
+    hero['gold'] = 7
+    other_process.save(hero, "realm")
+    assert cache.load("StoredHero", "realm")['gold'] == 7
+
+    # Deleting and re-creating the row gives it a new revision too
+    other_process.delete("StoredHero", "realm")
+    hero['gold'] = 8
+    other_process.save(hero, "realm")
+    assert cache.load("StoredHero", "realm")['gold'] == 8
+    assert cache.stats['misses'] == 3
+    cache.close()
+    other_process.close()
+
+def test_cache_serves_repeat_loads_and_writes_back_lazily(tmp_path):
+    """Test LRU hits, write-back on flush and skipped identical saves"""
+    save_directory = str(tmp_path / "saves")
+    disk = character_storage.DirectoryBackend()
+    cache = character_storage.CachedBackend(disk, capacity=10)
+    hero = make_hero()
+
+    cache.save(hero, save_directory)
+    assert disk.list_names(save_directory) == []
+    assert cache.list_names(save_directory) == ["StoredHero"]
+    assert cache.load("StoredHero", save_directory) == hero
+
+    assert cache.flush() == 1
+    assert disk.load("StoredHero", save_directory) == hero
+
+    # Unchanged saves never reach the disk; repeat loads never leave memory
+    cache.save(hero, save_directory)
+    for _ in range(5):
+        loaded = cache.load("StoredHero", save_directory)
+    loaded['inventory'].clear()
+    assert cache.load("StoredHero", save_directory)['inventory'] == hero['inventory']
+    assert cache.flush() == 0
+    assert cache.stats['skipped_writes'] == 1
+    assert cache.stats['writes'] == 1
+    assert cache.stats['misses'] == 0
+
+def test_cache_detects_changes_made_behind_its_back(tmp_path):
+    """Test that a save written by someone else invalidates the cached copy"""
+    save_directory = str(tmp_path / "saves")
+    disk = character_storage.DirectoryBackend()
+    cache = character_storage.CachedBackend(disk)
+    hero = make_hero()
+    disk.save(hero, save_directory)
+    assert cache.load("StoredHero", save_directory)['gold'] == 321
+
+    hero['gold'] = 123456
+    disk.save(hero, save_directory)
+
+    assert cache.load("StoredHero", save_directory)['gold'] == 123456
+    assert cache.stats['misses'] == 2
+
+def test_cache_rewrites_a_save_changed_behind_its_back(tmp_path):
+    """Test that an unchanged save still writes when the stored copy was replaced"""
+    save_directory = str(tmp_path / "saves")
+    disk = character_storage.DirectoryBackend()
+    cache = character_storage.CachedBackend(disk)
+    disk.save(make_hero(), save_directory)
+    hero = cache.load("StoredHero", save_directory)
+
+    other = make_hero()
+    other['gold'] = 123456
+    disk.save(other, save_directory)
+
+    assert cache.save(hero, save_directory) is True
+    cache.flush()
+    assert disk.load("StoredHero", save_directory)['gold'] == 321
+    assert cache.stats['skipped_writes'] == 0
+
+def test_cache_versions_of_unsaved_entries_never_repeat():
+    """Test that replaced dirty copies (whose addresses get reused) never share a version"""
+    inner = character_storage.MemoryBackend()
+    cache = character_storage.CachedBackend(inner)
+    versions = []
+    for gold in range(50):
+        hero = make_hero("Hero")
+        hero['gold'] = gold
+        cache.save(hero, "realm")
+        versions.append(cache.version("Hero", "realm"))
+    assert len(set(versions)) == 50
+
+    # A character whose dirty copy was replaced is written again
+    previous = character_manager.set_storage_backend(cache)
+    try:
+        first = make_hero("Hero")
+        assert character_manager.save_character(first, "realm")
+        for gold in (1, 2):
+            other = make_hero("Hero")
+            other['gold'] = gold
+            assert character_manager.save_character(other, "realm")
+
+        assert character_manager.save_character(first, "realm")
+        assert character_manager.load_character("Hero", "realm")['gold'] == first['gold']
+    finally:
+        character_manager.set_storage_backend(previous)
+
+def test_cache_writes_dirty_entries_on_eviction(tmp_path):
+    """Test that evicting a changed character writes it to the inner backend"""
+    inner = character_storage.MemoryBackend()
+    cache = character_storage.CachedBackend(inner, capacity=3)
+    roster = make_roster(5)
+    for character in roster:
+        cache.save(character, "realm")
+
+    assert len(cache.entries) == 3
+    assert cache.stats['evictions'] == 2
+    assert sorted(inner.list_names("realm")) == ["Member000", "Member001"]
+    assert sorted(cache.list_names("realm")) == [c['name'] for c in roster]
+
+    # A character that was never written can still be deleted
+    assert cache.delete("Member004", "realm") is True
+    with pytest.raises(CharacterNotFoundError):
+        cache.load("Member004", "realm")
+
+def test_character_manager_cache_flushes_through_public_functions(tmp_path):
+    """Test enable_character_cache with the public save/load functions"""
+    save_directory = str(tmp_path / "saves")
+    previous = character_manager.get_storage_backend()
+    try:
+        cache = character_manager.enable_character_cache(capacity=4)
+        assert character_manager.enable_character_cache() is cache
+        character_manager.save_character(make_hero(), save_directory)
+        assert not os.path.exists(os.path.join(save_directory, "StoredHero_save.txt"))
+        assert character_manager.flush_saves() == 1
+        assert os.path.exists(os.path.join(save_directory, "StoredHero_save.txt"))
+    finally:
+        character_manager.set_storage_backend(previous)
+
+# ============================================================================
+# DIRTY TRACKING TESTS
+# ============================================================================
+
+@pytest.fixture
+def memory_store():
+    store = character_storage.MemoryBackend()
+    previous = character_manager.set_storage_backend(store)
+    yield store
+    character_manager.set_storage_backend(previous)
+
+def test_unchanged_character_save_is_a_no_op(memory_store):
+    """Test that saving twice without changes only writes once (unless forced)"""
+    hero = make_hero()
+    assert character_manager.dirty_fields(hero) == set(hero)
+
+    assert character_manager.save_character(hero, "realm")
+    assert character_manager.dirty_fields(hero) == set()
+    assert character_manager.save_character(hero, "realm")
+    assert memory_store.saves == 1
+
+    # A different destination or force=True still writes
+    character_manager.save_character(hero, "other_realm")
+    character_manager.save_character(hero, "other_realm", force=True)
+    assert memory_store.saves == 3
+
+    loaded = character_manager.load_character("StoredHero", "realm")
+    assert character_manager.save_character(loaded, "realm")
+    assert memory_store.saves == 3
+
+def test_unchanged_save_rewrites_a_deleted_or_replaced_save(memory_store, tmp_path):
+    """Test that a clean character is written again when its stored copy is gone or changed"""
+    hero = make_hero("Gone")
+    character_manager.save_character(hero, "realm")
+    character_manager.delete_character("Gone", "realm")
+    assert character_manager.save_character(hero, "realm")
+    assert character_manager.list_saved_characters("realm") == ["Gone"]
+
+    # Someone else overwrote the save: our unchanged copy is written back
+    other = make_hero("Gone")
+    other['gold'] = 1
+    memory_store.save(other, "realm")
+    character_manager.save_character(hero, "realm")
+    assert character_manager.load_character("Gone", "realm")['gold'] == 321
+
+    # Through a cache, which only copies dirty fields on a partial update
+    cache = character_storage.CachedBackend(memory_store)
+    character_manager.set_storage_backend(cache)
+    try:
+        character_manager.save_character(hero, "realm")
+        cache.save(other, "realm")
+        assert character_manager.save_character(hero, "realm")
+        assert character_manager.load_character("Gone", "realm")['gold'] == 321
+    finally:
+        character_manager.set_storage_backend(memory_store)
+
+    # A new backend never inherits "already saved", whatever its id()
+    character_manager.set_storage_backend(character_storage.MemoryBackend())
+    try:
+        assert character_manager.save_character(hero, "realm")
+        assert character_manager.list_saved_characters("realm") == ["Gone"]
+    finally:
+        character_manager.set_storage_backend(memory_store)
+
+def test_game_mutations_mark_fields_dirty(memory_store):
+    """Test that the game's mutation functions mark what they change"""
+    quests = {'q1': {'quest_id': 'q1', 'required_level': 1, 'prerequisite': 'NONE',
+                     'reward_xp': 10, 'reward_gold': 5}}
+    hero = make_hero()
+    character_manager.save_character(hero, "realm")
+
+    checks = [
+        (lambda: character_manager.gain_experience(hero, 10), {'experience'}),
+        (lambda: character_manager.add_gold(hero, 5), {'gold'}),
+        (lambda: inventory_system.apply_stat_effect(hero, 'strength', 2), {'strength'}),
+        (lambda: quest_handler.accept_quest(hero, 'q1', quests), {'active_quests'}),
+        (lambda: quest_handler.complete_quest(hero, 'q1', quests),
+         {'active_quests', 'completed_quests', 'experience', 'gold'}),
+        (lambda: inventory_system.purchase_item(hero, 'elixir', {'cost': 1}), {'gold', 'inventory'}),
+        (lambda: inventory_system.sell_item(hero, 'elixir', {'cost': 1}), {'gold', 'inventory'}),
+    ]
+    for mutate, fields in checks:
+        mutate()
+        assert character_manager.dirty_fields(hero) == fields
+        character_manager.save_character(hero, "realm")
+
+    hero['health'] = 1
+    character_manager.heal_character(hero, 5)
+    assert character_manager.dirty_fields(hero) == {'health'}
+    character_manager.save_character(hero, "realm")
+    assert character_manager.load_character("StoredHero", "realm") == hero
+
+def test_partial_saves_reach_sqlite_and_cache(tmp_path):
+    """Test that changed-field saves keep SQLite columns and cached copies right"""
+    store = character_storage.SqliteBackend(str(tmp_path / "partial.db"))
+    cache = character_storage.CachedBackend(store)
+    for backend in (store, cache):
+        previous = character_manager.set_storage_backend(backend)
+        try:
+            character_manager.save_character(make_hero(), "realm")
+            hero = character_manager.load_character("StoredHero", "realm")
+            hero['gold'] = 9999
+            inventory_system.add_item_to_inventory(hero, 'torch')
+            assert character_manager.save_character(hero, "realm")
+            cache.flush()
+
+            assert [c['name'] for c in store.characters_with_gold(9999, "realm")] == ["StoredHero"]
+            assert character_manager.load_character("StoredHero", "realm") == hero
+        finally:
+            character_manager.set_storage_backend(previous)
+    store.close()
+
+# ============================================================================
+# BULK SAVE / LOAD TESTS
+# ============================================================================
+
+class PickyBackend(character_storage.MemoryBackend):
+    """Memory backend that refuses to save one particular character"""
+
+    def save(self, character, save_directory):
+        if character['name'] == "Member013":
+            raise IOError("quota exceeded")
+        return super().save(character, save_directory)
+
+def test_bulk_save_and_load_report_each_character():
+    """Test that bulk saves/loads keep going past failures and report each one"""
+    store = PickyBackend()
+    previous = character_manager.set_storage_backend(store)
+    try:
+        roster = make_roster(100)
+        results = character_manager.save_characters(roster, "realm", max_workers=4)
+
+        assert len(results) == 100
+        assert [name for name, result in results.items() if not result['ok']] == ["Member013"]
+        assert isinstance(results["Member013"]['error'], IOError)
+        assert len(store.list_names("realm")) == 99
+
+        names = [c['name'] for c in roster]
+        loaded = character_manager.load_characters(names, "realm", max_workers=4)
+        assert loaded["Member050"]['character'] == roster[50]
+        assert isinstance(loaded["Member013"]['error'], CharacterNotFoundError)
+        assert sum(result['ok'] for result in loaded.values()) == 99
+
+        # Characters saved successfully are clean now, so a second pass writes nothing
+        writes = store.saves
+        character_manager.save_characters(roster, "realm")
+        assert store.saves == writes
+    finally:
+        character_manager.set_storage_backend(previous)
+
+def test_bulk_save_batches_sqlite_and_isolates_bad_rows(tmp_path):
+    """Test batched SQLite bulk saves with a retry that isolates the bad character"""
+    store = character_storage.SqliteBackend(str(tmp_path / "bulk.db"))
+    previous = character_manager.set_storage_backend(store)
+    try:
+        roster = make_roster(120)
+        roster[7]['level'] = ["not", "a", "level"]
+        results = character_manager.save_characters(roster, "realm", batch_size=50)
+
+        assert [name for name, result in results.items() if not result['ok']] == ["Member007"]
+        assert len(store.list_names("realm")) == 119
+    finally:
+        character_manager.set_storage_backend(previous)
+        store.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,213 @@
+"""
+Test Combat Features
+Tests outcome prediction and the extended combat mechanics
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import battle_log
+import battle_engine
+import game_io
+from custom_exceptions import (
+    CharacterDeadError, AbilityOnCooldownError, CorruptedDataError,
+    InvalidTargetError, CombatNotActiveError
+)
+
+# ============================================================================
+# OUTCOME PREDICTION TESTS
+# ============================================================================
+
+def simulate_basic_attacks(character, enemy):
+    """Play out a basic-attack-only fight turn by turn"""
+    turns = 0
+    while True:
+        turns += 1
+        enemy['health'] = max(enemy['health'] - combat_system.calculate_damage(character, enemy), 0)
+        if enemy['health'] == 0:
+            return 'player', turns
+        character['health'] = max(character['health'] - combat_system.calculate_damage(enemy, character), 0)
+        if character['health'] == 0:
+            return 'enemy', turns
+
+@pytest.mark.parametrize("character_class", ["Warrior", "Mage", "Rogue", "Cleric"])
+@pytest.mark.parametrize("enemy_type", ["goblin", "orc", "dragon"])
+def test_predict_outcome_matches_simulation(character_class, enemy_type):
+    """Test that the closed-form prediction agrees with a real fight"""
+    char = character_manager.create_character("PredictTest", character_class)
+    enemy = combat_system.create_enemy(enemy_type)
+
+    prediction = combat_system.predict_outcome(char, enemy)
+    winner, turns = simulate_basic_attacks(char, enemy)
+
+    assert prediction['winner'] == winner
+    assert prediction['turns'] == turns
+    assert prediction['character_health'] == char['health']
+    assert prediction['enemy_health'] == enemy['health']
+
+def test_predict_outcome_dead_character():
+    """Test that a dead character cannot be predicted into a fight"""
+    char = character_manager.create_character("PredictDead", "Warrior")
+    char['health'] = 0
+
+    with pytest.raises(CharacterDeadError):
+        combat_system.predict_outcome(char, combat_system.create_enemy("goblin"))
+
+# ============================================================================
+# ABILITY COOLDOWN TESTS
+# ============================================================================
+
+def test_special_ability_cooldown():
+    """Test that abilities cannot be reused until their cooldown passes"""
+    char = character_manager.create_character("CooldownTest", "Warrior")
+    enemy = combat_system.create_enemy("dragon")
+    cooldowns = combat_system.CooldownScheduler()
+    cooldown = combat_system.CLASS_ABILITIES["Warrior"].cooldown
+
+    combat_system.use_special_ability(char, enemy, cooldowns, 1)
+    assert enemy['health'] == 200 - char['strength'] * 2
+
+    with pytest.raises(AbilityOnCooldownError):
+        combat_system.use_special_ability(char, enemy, cooldowns, 1 + cooldown)
+
+    result = combat_system.use_special_ability(char, enemy, cooldowns, 2 + cooldown)
+    assert "Power Strike" in result
+
+def test_special_ability_without_scheduler():
+    """Test that abilities without a scheduler behave as before"""
+    char = character_manager.create_character("NoCooldown", "Cleric")
+    char['health'] = 10
+    enemy = combat_system.create_enemy("goblin")
+
+    combat_system.use_special_ability(char, enemy)
+    combat_system.use_special_ability(char, enemy)
+    assert char['health'] == 70
+
+# ============================================================================
+# BATTLE LOG TESTS
+# ============================================================================
+
+def test_battle_event_log_replay_round_trip(tmp_path):
+    """Test that recorded battle turns survive a replay file round trip"""
+    char = character_manager.create_character("ReplayTest", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    log = battle_log.BattleEventLog(capacity=1)
+
+    console = game_io.get_io()
+    game_io.bind_io(game_io.GameIO(game_io.NullSink(), game_io.ScriptSource(["1"] * 10)))
+    try:
+        result = combat_system.SimpleBattle(char, enemy, event_log=log).start_battle()
+    finally:
+        game_io.bind_io(console)
+
+    assert result['winner'] == 'player'
+    events = list(log)
+    assert events[0][:3] == (1, battle_log.ACTOR_PLAYER, battle_log.ACTION_ATTACK)
+    assert events[-1][4] == 0  # Enemy ends at 0 HP
+
+    replay_file = tmp_path / "battle.qcr"
+    log.write_replay(str(replay_file))
+    assert list(battle_log.iter_replay(str(replay_file), chunk_events=2)) == events
+
+def test_truncated_replay_rejected(tmp_path):
+    """Test that a truncated replay file raises CorruptedDataError"""
+    log = battle_log.BattleEventLog()
+    log.record(1, battle_log.ACTOR_PLAYER, battle_log.ACTION_ATTACK, 13, 37)
+    replay_file = tmp_path / "battle.qcr"
+    replay_file.write_bytes(log.to_bytes()[:-4])
+
+    with pytest.raises(CorruptedDataError):
+        list(battle_log.iter_replay(str(replay_file)))
+
+# ============================================================================
+# PARTY BATTLE TESTS
+# ============================================================================
+
+def test_party_battle_matches_duel_prediction():
+    """Test that a 1v1 party battle plays out like the predicted duel"""
+    char = character_manager.create_character("DuelTest", "Rogue")
+    enemy = combat_system.create_enemy("orc")
+    prediction = combat_system.predict_outcome(char, enemy)
+
+    result = battle_engine.PartyBattle([char], [enemy]).run()
+
+    assert result['winner'] == prediction['winner']
+    assert char['health'] == prediction['character_health']
+    assert enemy['health'] == prediction['enemy_health']
+
+def test_party_battle_large_horde():
+    """Test a party against hundreds of enemies"""
+    party = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(4)]
+    for hero in party:
+        hero['health'] = hero['max_health'] = 10000
+        hero['strength'] = 100
+    horde = [combat_system.create_enemy("goblin") for _ in range(300)]
+
+    battle = battle_engine.PartyBattle(party, horde)
+    result = battle.run()
+
+    assert result['winner'] == 'player'
+    assert result['horde_alive'] == 0
+    assert result['xp_gained'] == 300 * 25
+    assert all(enemy['health'] == 0 for enemy in horde)
+    with pytest.raises(CombatNotActiveError):
+        battle.step()
+
+def test_party_battle_targets_weakest_and_respects_speed():
+    """Test that faster combatants act first and hit the weakest target"""
+    hero = character_manager.create_character("FastHero", "Warrior")
+    hero['speed'] = 20
+    weak = combat_system.create_enemy("goblin")
+    weak['health'] = 5
+    strong = combat_system.create_enemy("goblin")
+
+    battle = battle_engine.PartyBattle([hero], [strong, weak])
+    assert battle.step() == 0
+    assert weak['health'] == 0
+    assert strong['health'] == strong['max_health']
+
+def test_party_battle_needs_both_sides():
+    """Test that a battle without living enemies is rejected"""
+    char = character_manager.create_character("Lonely", "Mage")
+
+    with pytest.raises(InvalidTargetError):
+        battle_engine.PartyBattle([char], [])
+
+# ============================================================================
+# AUTO-RESOLVE TESTS
+# ============================================================================
+
+def test_auto_resolve_matches_fight_by_fight():
+    """Test that bulk auto-resolve ends where resolving one fight at a time would"""
+    bulk = character_manager.create_character("BulkTest", "Warrior")
+    single = character_manager.create_character("SingleTest", "Warrior")
+
+    summary = battle_engine.auto_resolve_encounters(bulk, 40)
+
+    for _ in range(summary['battles']):
+        enemy = combat_system.get_random_enemy_for_level(single['level'])
+        outcome = battle_engine.resolve_duel(single, enemy)
+        if outcome['winner'] == 'player':
+            character_manager.gain_experience(single, enemy['xp_reward'])
+            character_manager.add_gold(single, enemy['gold_reward'])
+
+    for field in ['level', 'experience', 'health', 'max_health', 'gold', 'strength']:
+        assert bulk[field] == single[field]
+    assert summary['wins'] + summary['losses'] == summary['battles']
+    assert summary['levels_gained'] == bulk['level'] - 1
+
+def test_auto_resolve_dead_character():
+    """Test that a dead character cannot auto-resolve encounters"""
+    char = character_manager.create_character("AutoDead", "Mage")
+    char['health'] = 0
+
+    with pytest.raises(CharacterDeadError):
+        battle_engine.auto_resolve_encounters(char, 5)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
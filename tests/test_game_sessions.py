@@ -0,0 +1,311 @@
+"""
+Test Game Sessions
+Tests that several players can be hosted side by side
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autosave
+import character_manager
+import character_storage
+import game_io
+import game_server
+import main
+from custom_exceptions import SessionClosedError
+
+# ============================================================================
+# SESSION STATE TESTS
+# ============================================================================
+
+def test_catalog_is_shared_and_read_only():
+    """Test that sessions share one catalog that cannot be modified"""
+    catalog = main.GameCatalog.load()
+    first = main.GameSession(catalog)
+    second = main.GameSession(catalog)
+
+    assert first.all_quests is second.all_quests
+    assert 'first_steps' in first.all_quests
+    with pytest.raises(TypeError):
+        first.all_items['free_sword'] = {}
+
+def test_sessions_run_side_by_side_in_threads():
+    """Test that two sessions in separate threads keep their own characters"""
+    catalog = main.GameCatalog.load()
+    sessions = {}
+
+    def play(name, quest_answers):
+        sink = game_io.CaptureSink()
+        game_io.bind_io(game_io.GameIO(sink, game_io.ScriptSource(quest_answers + ["7"])))
+        session = main.GameSession(catalog)
+        session.current_character = character_manager.create_character(name, "Warrior")
+        main.quest_menu(session)
+        sessions[name] = (session, sink.getvalue())
+
+    threads = [
+        threading.Thread(target=play, args=("ThreadA", ["4", "first_steps", "1"])),
+        threading.Thread(target=play, args=("ThreadB", ["2"])),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    session_a, output_a = sessions["ThreadA"]
+    session_b, output_b = sessions["ThreadB"]
+    assert session_a.current_character['active_quests'] == ['first_steps']
+    assert session_b.current_character['active_quests'] == []
+    assert "First Steps (ID: first_steps)" in output_a
+    assert "First Steps (ID: first_steps)" in output_b
+
+# ============================================================================
+# I/O LAYER TESTS
+# ============================================================================
+
+def test_buffered_sink_flushes_in_chunks_and_before_reads():
+    """Test that output is batched but always visible before a prompt"""
+    chunks = []
+    sink = game_io.CallbackSink(chunks.append, buffer_size=1024)
+    io = game_io.GameIO(sink, game_io.ScriptSource(["3"]))
+
+    for i in range(10):
+        io.write(f"line {i}\n")
+    assert chunks == []
+
+    assert io.read("Choice: ") == "3"
+    assert len(chunks) == 1
+    assert chunks[0].decode().endswith("line 9\nChoice: ")
+
+    with pytest.raises(SessionClosedError):
+        io.read()
+
+def test_main_menu_runs_against_null_sink():
+    """Test that a whole menu flow runs headless from scripted input"""
+    console = game_io.get_io()
+    game_io.bind_io(game_io.GameIO(game_io.NullSink(), game_io.ScriptSource(["9", "3"])))
+    try:
+        session = main.GameSession(main.GameCatalog.load())
+        main.run_main_menu(session)
+    finally:
+        game_io.bind_io(console)
+
+# ============================================================================
+# SCRIPTED REPLAY TESTS
+# ============================================================================
+
+def test_scripted_replay_times_every_command(tmp_path):
+    """Test that --script mode plays a transcript and times each answer"""
+    answers = ["1", "ScriptTest", "1", "1", "3", "4", "first_steps", "7",
+               "4", "1", "1", "1", "1", "6", "3"]
+    script = tmp_path / "transcript.txt"
+    script.write_text("\n".join(answers) + "\n")
+    output = tmp_path / "output.txt"
+
+    try:
+        io = main.run_script(str(script), str(output))
+        saved = character_manager.load_character("ScriptTest")
+    finally:
+        if "ScriptTest" in character_manager.list_saved_characters():
+            character_manager.delete_character("ScriptTest")
+
+    assert [answer for _, answer, _ in io.timings] == answers
+    assert all(seconds >= 0 for _, _, seconds in io.timings)
+    assert saved['active_quests'] == ['first_steps']
+    assert saved['experience'] == 25
+    assert "You defeated the Goblin!" in output.read_text()
+
+def test_script_ending_mid_game_leaves_quietly(tmp_path):
+    """Test that running out of input in the game unwinds without an error or menu"""
+    script = tmp_path / "transcript.txt"
+    script.write_text("1\nScriptEnd\n1\n1\n")
+    output = tmp_path / "output.txt"
+
+    try:
+        main.run_script(str(script), str(output))
+    finally:
+        if "ScriptEnd" in character_manager.list_saved_characters():
+            character_manager.delete_character("ScriptEnd")
+
+    text = output.read_text()
+    assert "Unexpected error" not in text
+    assert text.count("Main Menu:") == 1
+
+# ============================================================================
+# SERVER TESTS
+# ============================================================================
+
+async def play_over_socket(port, lines):
+    """Connect to the server, send all lines and return everything it sent back"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write("".join(line + "\n" for line in lines).encode())
+    await writer.drain()
+    output = await asyncio.wait_for(reader.read(), timeout=10)
+    writer.close()
+    return output.decode()
+
+def test_server_hosts_concurrent_sessions():
+    """Test that two network players get independent sessions"""
+    async def scenario():
+        server = game_server.GameServer(port=0)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            return await asyncio.gather(
+                play_over_socket(port, ["1", "ServerHeroA", "1", "1", "6", "3"]),
+                play_over_socket(port, ["1", "ServerHeroB", "2", "1", "6", "3"]),
+                play_over_socket(port, ["3"]),
+            )
+
+    try:
+        hero_a, hero_b, quitter = asyncio.run(scenario())
+    finally:
+        for name in ["ServerHeroA", "ServerHeroB"]:
+            if name in character_manager.list_saved_characters():
+                character_manager.delete_character(name)
+
+    assert "Character Stats for ServerHeroA" in hero_a
+    assert "Class: Warrior" in hero_a
+    assert "Character Stats for ServerHeroB" in hero_b
+    assert "Class: Mage" in hero_b
+    assert "QUEST CHRONICLES" in quitter
+    assert "Thanks for playing" in quitter
+
+def test_server_turns_players_away_when_full():
+    """Test that connections beyond max_sessions are refused instead of getting a thread"""
+    async def scenario():
+        server = game_server.GameServer(port=0, max_sessions=1)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await asyncio.wait_for(reader.readuntil(b"Select an option (1-3): "), timeout=10)
+            refused = await play_over_socket(port, [])
+            writer.write(b"3\n")
+            await writer.drain()
+            await asyncio.wait_for(reader.read(), timeout=10)
+            writer.close()
+            return refused, server.active_sessions
+
+    refused, active = asyncio.run(scenario())
+
+    assert refused == game_server.SERVER_FULL_MESSAGE
+    assert active == 0
+
+# ============================================================================
+# AUTOSAVE TESTS
+# ============================================================================
+
+class SlowMemoryBackend(character_storage.MemoryBackend):
+    """Memory backend whose saves take a while (or fail on demand)"""
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.fail = False
+        # Names whose saves always fail
+        self.failing = set()
+
+    def save(self, character, save_directory):
+        time.sleep(self.delay)
+        if self.fail or character['name'] in self.failing:
+            raise IOError("disk full")
+        return super().save(character, save_directory)
+
+@pytest.fixture
+def slow_store():
+    store = SlowMemoryBackend()
+    previous = character_manager.set_storage_backend(store)
+    yield store
+    character_manager.set_storage_backend(previous)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def test_autosave_after_k_actions_without_blocking(slow_store):
+    """Test that every K actions are saved by the worker, not the player thread"""
+    slow_store.delay = 0.2
+    scheduler = autosave.AutosaveScheduler(interval=60, every_actions=3, save_directory="realm")
+    hero = character_manager.create_character("Autosaver", "Rogue")
+    try:
+        started = time.perf_counter()
+        for _ in range(3):
+            character_manager.add_gold(hero, 10)
+            scheduler.action_done(hero)
+        assert time.perf_counter() - started < 0.1
+
+        wait_for(lambda: scheduler.stats['saves'] == 1)
+        assert character_manager.load_character("Autosaver", "realm")['gold'] == 130
+
+        # Unchanged actions take no checkpoints and write nothing
+        for _ in range(3):
+            scheduler.action_done(hero)
+        assert scheduler.stats['checkpoints'] == 3
+    finally:
+        scheduler.stop()
+    assert scheduler.stats['saves'] == 1
+
+def test_autosave_after_interval_and_on_flush(slow_store):
+    """Test time-based saves and that flush/stop write pending changes"""
+    scheduler = autosave.AutosaveScheduler(interval=0.05, every_actions=100, save_directory="realm")
+    hero = character_manager.create_character("Timekeeper", "Mage")
+    other = character_manager.create_character("Leaver", "Cleric")
+    try:
+        scheduler.action_done(hero)
+        wait_for(lambda: scheduler.stats['saves'] == 1)
+
+        character_manager.add_gold(other, 1)
+        assert scheduler.flush(other) is True
+        assert character_manager.load_character("Leaver", "realm")['gold'] == 101
+    finally:
+        character_manager.add_gold(hero, 5)
+        scheduler.action_done(hero)
+        scheduler.stop()
+    assert character_manager.load_character("Timekeeper", "realm")['gold'] == 105
+
+def test_autosave_failure_keeps_changes_dirty(slow_store):
+    """Test that a failed autosave leaves the changes to be saved again"""
+    slow_store.fail = True
+    scheduler = autosave.AutosaveScheduler(interval=60, every_actions=1, save_directory="realm")
+    hero = character_manager.create_character("Unlucky", "Warrior")
+    try:
+        assert scheduler.flush(hero) is False
+        assert 'gold' in character_manager.dirty_fields(hero)
+
+        slow_store.fail = False
+        assert scheduler.flush(hero) is True
+        assert character_manager.dirty_fields(hero) == set()
+        assert character_manager.load_character("Unlucky", "realm") == hero
+    finally:
+        scheduler.stop()
+
+def test_autosave_flush_ignores_other_characters_failures(slow_store):
+    """Test that flush reports its own characters' saves, not another session's failure"""
+    slow_store.delay = 0.05
+    slow_store.failing.add("Doomed")
+    scheduler = autosave.AutosaveScheduler(interval=60, every_actions=1, save_directory="realm")
+    doomed = character_manager.create_character("Doomed", "Warrior")
+    hero = character_manager.create_character("Bystander", "Mage")
+    try:
+        # The worker is still writing (and failing) Doomed while Bystander flushes
+        scheduler.action_done(doomed)
+        assert scheduler.flush(hero) is True
+        assert scheduler.stats['failures'] == 1
+        assert character_manager.load_character("Bystander", "realm") == hero
+
+        assert scheduler.flush(doomed) is False
+        slow_store.failing.clear()
+        assert scheduler.flush(doomed) is True
+    finally:
+        scheduler.stop()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,52 @@
+"""
+Test Startup Budget
+Measures `python -X importtime -c "import main"` so startup cannot quietly grow
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for main, in microseconds (override with
+# QC_STARTUP_BUDGET_US on slow machines)
+STARTUP_BUDGET_US = int(os.environ.get("QC_STARTUP_BUDGET_US", 150000))
+
+# Subsystems that must not be imported until the player actually uses them
+LAZY_SUBSYSTEMS = [
+    "character_manager", "inventory_system", "quest_handler",
+    "combat_system", "game_data", "battle_log"
+]
+
+def measure_import_main():
+    """Import main in a fresh interpreter and return {module: cumulative_us}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+def test_subsystems_are_not_imported_at_startup():
+    """Test that starting the game does not import every subsystem"""
+    timings = measure_import_main()
+
+    assert "main" in timings
+    for module in LAZY_SUBSYSTEMS:
+        assert module not in timings, f"{module} is imported eagerly by main"
+
+def test_startup_import_time_budget():
+    """Test that importing main stays within the startup budget (best of 3)"""
+    best = min(measure_import_main()["main"] for _ in range(3))
+
+    assert best <= STARTUP_BUDGET_US, f"import main took {best} us (budget {STARTUP_BUDGET_US} us)"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
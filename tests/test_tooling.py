@@ -0,0 +1,384 @@
+"""
+Test Tooling
+Tests the instrumentation, profiling and data generation helpers
+"""
+
+import pytest
+import sys
+import os
+import pstats
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import quest_handler
+import instrumentation
+import profiling
+import battle_engine
+import data_generator
+import game_data
+import load_test
+import character_storage
+import roster_analytics
+import columnar_export
+import csv
+from custom_exceptions import QuestNotFoundError
+
+# ============================================================================
+# INSTRUMENTATION TESTS
+# ============================================================================
+
+def test_instrumentation_counts_calls_and_errors(tmp_path):
+    """Test that enabled instrumentation records calls, errors and latency"""
+    original = quest_handler.accept_quest
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        assert quest_handler.accept_quest is not original
+        char = character_manager.create_character("MetricsTest", "Warrior")
+        quests = {'q': {'quest_id': 'q', 'required_level': 1, 'prerequisite': 'NONE'}}
+
+        quest_handler.accept_quest(char, 'q', quests)
+        with pytest.raises(QuestNotFoundError):
+            quest_handler.accept_quest(char, 'missing', quests)
+        inventory_system.purchase_item(char, 'health_potion', {'cost': 25})
+    finally:
+        instrumentation.disable()
+
+    assert quest_handler.accept_quest is original
+    data = instrumentation.snapshot()
+    assert data['quest_handler.accept_quest']['calls'] == 2
+    assert data['quest_handler.accept_quest']['errors'] == 1
+    assert data['quest_handler.accept_quest']['buckets'][-1] == (float('inf'), 2)
+    assert data['inventory_system.purchase_item']['calls'] == 1
+
+    metrics_file = tmp_path / "metrics.prom"
+    instrumentation.write_prometheus(str(metrics_file))
+    text = metrics_file.read_text()
+    assert 'quest_chronicles_calls_total{function="quest_handler.accept_quest"} 2' in text
+    assert 'quest_chronicles_latency_seconds_bucket{function="quest_handler.accept_quest",le="+Inf"} 2' in text
+
+def test_instrumentation_disabled_records_nothing():
+    """Test that nothing is recorded while instrumentation is off"""
+    instrumentation.reset()
+    char = character_manager.create_character("QuietTest", "Mage")
+    inventory_system.purchase_item(char, 'health_potion', {'cost': 25})
+
+    assert not instrumentation.is_enabled()
+    assert instrumentation.snapshot() == {}
+
+# ============================================================================
+# PROFILING TESTS
+# ============================================================================
+
+def test_profile_call_writes_pstats_and_collapsed_stacks(tmp_path):
+    """Test that profiling a simulation writes both files and ranks game functions"""
+    prefix = str(tmp_path / "sim")
+
+    (battle_result, summary), rows = profiling.profile_call(
+        battle_engine.run_simulation, 300, 20, output_prefix=prefix, top=5
+    )
+
+    assert battle_result['turns'] > 0
+    assert summary['battles'] >= 1
+    assert len(rows) == 5
+    assert rows[0]['cumulative_seconds'] >= rows[-1]['cumulative_seconds']
+    assert any(row['function'] == 'battle_engine:run_simulation' for row in rows)
+    assert all(not row['function'].startswith('profiling:') for row in rows)
+
+    stats = pstats.Stats(prefix + ".pstats")
+    assert stats.total_calls > 0
+    for line in open(prefix + ".collapsed"):
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.split(";")[0]
+
+def test_sampling_profiler_sees_busy_function():
+    """Test that the sampler records the stack of the profiled thread"""
+    def busy_loop():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+
+    sampler = profiling.SamplingProfiler(interval=0.001)
+    sampler.start()
+    busy_loop()
+    sampler.stop()
+
+    busy_stacks = [stack for stack in sampler.samples if "busy_loop" in stack.split(";")[-1]]
+    assert busy_stacks
+    assert sampler.collapsed_lines()[0].rsplit(" ", 1)[1].isdigit()
+
+# ============================================================================
+# DATA GENERATOR TESTS
+# ============================================================================
+
+def test_generated_corpus_loads_with_game_parsers(tmp_path):
+    """Test that generated files parse back exactly and chains are valid"""
+    summary = data_generator.generate_corpus(str(tmp_path), quests=300, items=120, saves=25, seed=7)
+
+    quests = game_data.load_quests(summary['quests_file'])
+    items = game_data.load_items(summary['items_file'])
+    assert quests == data_generator.generate_quests(300, 7)
+    assert items == data_generator.generate_items(120, 8)
+    assert quest_handler.validate_quest_prerequisites(quests)
+    for quest in quests.values():
+        if quest['prerequisite'] != "NONE":
+            assert quests[quest['prerequisite']]['required_level'] <= quest['required_level']
+
+    names = character_manager.list_saved_characters(summary['save_directory'])
+    assert summary['saves'] == len(names) == 25
+    for name in names:
+        character = character_manager.load_character(name, summary['save_directory'])
+        assert character_manager.validate_character_data(character)
+        assert set(character['inventory']) <= set(items)
+        for quest_id in character['completed_quests']:
+            prerequisite = quests[quest_id]['prerequisite']
+            assert prerequisite == "NONE" or prerequisite in character['completed_quests']
+            assert quests[quest_id]['required_level'] <= character['level']
+
+def test_generated_corpus_is_deterministic(tmp_path):
+    """Test that the same seed writes byte-identical files"""
+    first = data_generator.generate_corpus(str(tmp_path / "a"), quests=50, items=50, saves=5, seed=3)
+    second = data_generator.generate_corpus(str(tmp_path / "b"), quests=50, items=50, saves=5, seed=3)
+
+    for key in ('quests_file', 'items_file'):
+        assert open(first[key]).read() == open(second[key]).read()
+    assert sorted(os.listdir(first['save_directory'])) == sorted(os.listdir(second['save_directory']))
+
+# ============================================================================
+# LOAD TEST TESTS
+# ============================================================================
+
+def test_load_test_reports_every_action(tmp_path):
+    """Test that a small load test runs all clients and reports latencies"""
+    data_generator.generate_corpus(str(tmp_path / "data"), quests=100, items=60, seed=1)
+    save_directory = str(tmp_path / "saves")
+
+    report = load_test.run_load_test(clients=4, actions=150, data_dir=str(tmp_path / "data"),
+                                     save_directory=save_directory, memory_interval=0.01)
+
+    assert report['clients'] == 4
+    assert report['actions'] == 600
+    assert report['throughput'] > 0
+    assert sum(stats['count'] for stats in report['per_action'].values()) == 600
+    for action, stats in report['per_action'].items():
+        assert stats['errors'] == 0, action
+        assert stats['p50_ms'] <= stats['p99_ms'] <= stats['max_ms']
+    assert report['memory']['peak_bytes'] >= report['memory']['start_bytes']
+    assert len(report['memory']['samples']) >= 2
+    assert len(character_manager.list_saved_characters(save_directory)) == 4
+
+def test_load_test_traces_memory_only_in_a_separate_pass(tmp_path):
+    """Test that tracemalloc is opt-in and off while the timed pass runs"""
+    data_generator.generate_corpus(str(tmp_path / "data"), quests=50, items=30, seed=1)
+    tracing_during_saves = []
+    original = load_test.SimulatedPlayer.do_save
+
+    def do_save(player):
+        tracing_during_saves.append(load_test.tracemalloc.is_tracing())
+        original(player)
+
+    load_test.SimulatedPlayer.do_save = do_save
+    try:
+        plain = load_test.run_load_test(clients=2, actions=60, data_dir=str(tmp_path / "data"))
+        assert plain['traced_memory'] is None
+        assert not any(tracing_during_saves)
+        assert plain['memory']['start_bytes'] > 0
+
+        tracing_during_saves.clear()
+        traced = load_test.run_load_test(clients=2, actions=60, data_dir=str(tmp_path / "data"),
+                                         trace_memory=True)
+    finally:
+        load_test.SimulatedPlayer.do_save = original
+    assert traced['traced_memory']['peak_bytes'] > 0
+    # Half the saves happened in the timed pass (untraced), half in the traced one
+    assert tracing_during_saves.count(True) == tracing_during_saves.count(False) > 0
+
+class FailingBackend(character_storage.MemoryBackend):
+    """Memory backend whose saves always fail"""
+
+    def save(self, character, save_directory):
+        raise IOError("disk full")
+
+def test_failed_saves_count_as_errors(tmp_path):
+    """Test that a save_character returning False is reported as an error"""
+    player = load_test.SimulatedPlayer(0, {}, {}, str(tmp_path / "saves"))
+    player.rng.choices = lambda actions, weights: ["save"]
+    previous = character_manager.set_storage_backend(FailingBackend())
+    try:
+        for _ in range(3):
+            player.step()
+    finally:
+        character_manager.set_storage_backend(previous)
+    assert player.errors['save'] == 3
+
+def test_percentile_nearest_rank():
+    """Test the percentile helper used in load test reports"""
+    values = list(range(1, 101))
+    assert load_test.percentile(values, 0.50) == 50
+    assert load_test.percentile(values, 0.99) == 99
+    assert load_test.percentile([], 0.5) == 0.0
+
+def test_idle_sessions_report_memory_per_session():
+    """Test that the idle-session load test holds every player at the main menu"""
+    report = load_test.run_idle_sessions(sessions=20, batch=8, memory_interval=0.01)
+
+    assert report['sessions'] == 20
+    assert report['threads'] >= 20
+    assert report['memory']['samples']
+    assert report['per_session_bytes'] == report['memory']['growth_bytes'] / 20
+
+# ============================================================================
+# ROSTER ANALYTICS TESTS
+# ============================================================================
+
+def test_roster_report_matches_loading_every_character(tmp_path):
+    """Test that the pooled one-pass scan agrees with load_character on each save"""
+    summary = data_generator.generate_corpus(str(tmp_path), quests=80, items=40, saves=60, seed=5)
+    save_directory = summary['save_directory']
+    with open(os.path.join(save_directory, "Broken_save.txt"), "w") as f:
+        f.write("name: Broken\nno separator here\n")
+
+    report = roster_analytics.analyze_roster(save_directory, workers=2, chunk_size=7)
+
+    characters = [character_manager.load_character(name, save_directory)
+                  for name in character_manager.list_saved_characters(save_directory) if name != "Broken"]
+    assert report['characters'] == 60
+    assert report['errors'] == 1
+    assert report['error_examples'][0][0] == "Broken"
+    assert report['classes'] == {c: sum(1 for ch in characters if ch['class'] == c)
+                                 for c in report['classes']}
+    assert report['gold']['max'] == max(c['gold'] for c in characters)
+    assert report['gold']['mean'] == pytest.approx(sum(c['gold'] for c in characters) / 60)
+    quest_id, stage = next(iter(report['quest_funnel'].items()))
+    assert stage['completed'] == sum(quest_id in c['completed_quests'] for c in characters)
+    assert stage['active'] == sum(quest_id in c['active_quests'] for c in characters)
+    assert sum(report['quests_completed_histogram'].values()) == 60
+
+    in_process = roster_analytics.analyze_roster(save_directory, workers=1)
+    assert in_process == report
+
+    mages = roster_analytics.analyze_roster(save_directory, workers=1,
+                                            where=lambda c: c['class'] == "Mage")
+    assert mages['classes'] == {"Mage": report['classes'].get("Mage", 0)}
+
+def test_invalid_saves_are_reported_not_counted(tmp_path):
+    """Test that a save load_character would reject becomes an error entry"""
+    save_directory = str(tmp_path / "saves")
+    character_manager.save_character(character_manager.create_character("Honest", "Rogue"), save_directory)
+    hero = character_manager.create_character("Braggart", "Rogue")
+    hero['gold'] = "'lots'"
+    with open(os.path.join(save_directory, "Braggart_save.txt"), "w") as f:
+        f.write(character_storage.serialize_character(hero))
+
+    report = roster_analytics.analyze_roster(save_directory, workers=1)
+
+    assert report['characters'] == 1
+    assert report['errors'] == 1
+    name, error = report['error_examples'][0]
+    assert name == "Braggart" and "gold" in error
+    assert report['gold']['max'] == 100
+
+def test_scan_is_lazy_and_stops_early(tmp_path):
+    """Test that the scanner can be abandoned part way and handles a missing directory"""
+    summary = data_generator.generate_corpus(str(tmp_path), quests=20, items=20, saves=30, seed=2)
+    scan = roster_analytics.scan_characters(summary['save_directory'], workers=2, chunk_size=4)
+    first = next(scan)
+    assert character_manager.validate_character_data(first)
+    scan.close()
+
+    assert list(roster_analytics.scan_saves(str(tmp_path / "missing"))) == []
+    assert [roster_analytics.bucket_for(n) for n in (0, 1, 3, 4, 9)] == ["0", "1", "2-3", "4-7", "8-15"]
+
+# ============================================================================
+# COLUMNAR EXPORT TESTS
+# ============================================================================
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+def test_csv_export_round_trips_through_dictionaries(tmp_path):
+    """Test that CSV exports decode back to the catalogs and the saves"""
+    summary = data_generator.generate_corpus(str(tmp_path / "data"), quests=60, items=30, saves=20, seed=4)
+    output = str(tmp_path / "export")
+
+    result = columnar_export.export_all(output, str(tmp_path / "data"), export_format="csv", workers=1)
+
+    assert (result['format'], result['quests'], result['items'], result['characters']) == ("csv", 60, 30, 20)
+    assert all(os.path.exists(path) for path in result['files'])
+    quest_ids = [row['value'] for row in read_csv(os.path.join(output, "dictionary_quests.csv"))]
+    item_ids = [row['value'] for row in read_csv(os.path.join(output, "dictionary_items.csv"))]
+    classes = [row['value'] for row in read_csv(os.path.join(output, "dictionary_classes.csv"))]
+
+    # Catalog IDs are coded in catalog order
+    quests = game_data.load_quests(summary['quests_file'])
+    assert quest_ids[:60] == list(quests)
+    for row in read_csv(os.path.join(output, "quests.csv")):
+        quest = quests[quest_ids[int(row['quest'])]]
+        prerequisite = int(row['prerequisite'])
+        assert quest['prerequisite'] == ("NONE" if prerequisite == -1 else quest_ids[prerequisite])
+        assert int(row['reward_gold']) == quest['reward_gold']
+
+    rows = read_csv(os.path.join(output, "characters.csv"))
+    inventory = read_csv(os.path.join(output, "characters_inventory.csv"))
+    completed = read_csv(os.path.join(output, "characters_completed_quests.csv"))
+    for index, row in enumerate(rows):
+        character = character_manager.load_character(row['name'], summary['save_directory'])
+        assert classes[int(row['class'])] == character['class']
+        assert int(row['gold']) == character['gold']
+        assert [item_ids[int(r['code'])] for r in inventory if int(r['row']) == index] == character['inventory']
+        assert [quest_ids[int(r['code'])] for r in completed if int(r['row']) == index] == character['completed_quests']
+
+    items = game_data.load_items(summary['items_file'])
+    effect_values = read_csv(os.path.join(output, "items_effect_values.csv"))
+    assert list(effect_values[0]) == ["row", "value"]
+    for index, row in enumerate(read_csv(os.path.join(output, "items.csv"))):
+        effects = inventory_system.parse_effect_string(items[item_ids[int(row['item'])]]['effect'])
+        assert [int(r['value']) for r in effect_values if int(r['row']) == index] == list(effects.values())
+
+def test_failed_export_leaves_no_partial_table(tmp_path):
+    """Test that a table interrupted by an error is closed and removed"""
+    output = str(tmp_path / "export")
+    exporter = columnar_export.ColumnarExporter(output, "csv")
+
+    def characters():
+        yield character_manager.create_character("Exported", "Mage")
+        raise IOError("save directory went away")
+
+    with pytest.raises(IOError):
+        exporter.export_characters(characters())
+    assert os.listdir(output) == []
+
+def test_npz_export_uses_offsets_for_lists(tmp_path):
+    """Test the numpy export: integer columns plus codes/offsets for list fields"""
+    np = pytest.importorskip("numpy")
+    summary = data_generator.generate_corpus(str(tmp_path / "data"), quests=40, items=20, saves=10, seed=6)
+    output = str(tmp_path / "export")
+
+    result = columnar_export.export_all(output, str(tmp_path / "data"), export_format="npz", workers=1)
+
+    assert result['format'] == "npz"
+    characters = np.load(os.path.join(output, "characters.npz"))
+    dictionaries = np.load(os.path.join(output, "dictionaries.npz"))
+    offsets = characters['inventory_offsets']
+    assert len(characters['gold']) == len(offsets) - 1 == 10
+    for index, name in enumerate(characters['name']):
+        character = character_manager.load_character(str(name), summary['save_directory'])
+        codes = characters['inventory_codes'][offsets[index]:offsets[index + 1]]
+        assert [str(dictionaries['items'][code]) for code in codes] == character['inventory']
+        assert characters['level'][index] == character['level']
+
+def test_export_format_choice():
+    """Test format resolution and rejection of unknown formats"""
+    expected = "npz" if columnar_export.load_numpy() is not None else "csv"
+    assert columnar_export.choose_format("auto") == expected
+    assert columnar_export.choose_format("csv") == "csv"
+    with pytest.raises(ValueError):
+        columnar_export.choose_format("parquet")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])